@@ -0,0 +1,46 @@
+"""
+Benchmark of the time it takes to import casex.
+
+Each case is run in a fresh Python process, since imports are cached within a process. The headless case only uses
+the critical area model and the Annex F parameters, and should not import any plotting packages.
+
+Run from the root of the repository with
+
+    python benchmarks/import_time.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+cases = {
+    'headless': "from casex import CriticalAreaModels, AnnexFParms",
+    'tables': "from casex import AnnexFTables",
+    'obstacles': "from casex import Obstacles",
+    'everything': "from casex import *",
+}
+
+# Code run in the child process. It prints the import time and which of the heavy packages were imported.
+template = """
+import sys, time
+t = time.perf_counter()
+{statement}
+t = time.perf_counter() - t
+heavy = [m for m in ('matplotlib', 'scipy', 'shapely', 'descartes') if m in sys.modules]
+print(t, ','.join(heavy))
+"""
+
+repeats = 7
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get('PYTHONPATH', ''))
+
+print("{:12s} {:>10s}   {}".format("Case", "Time [ms]", "Heavy packages imported"))
+for name, statement in cases.items():
+    times = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', template.format(statement=statement)], env=env,
+                                capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(output[0]))
+    heavy = output[1] if len(output) > 1 else '-'
+    print("{:12s} {:10.1f}   {}".format(name, statistics.median(times) * 1000, heavy))
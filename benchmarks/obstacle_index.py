@@ -0,0 +1,62 @@
+"""
+Benchmark of the spatial indices for obstacles in the Obstacles class.
+
+For a range of obstacle densities, the obstacles and CAs are generated as in the simulations, and the indices are
+built and queried with the bounding boxes of all CAs. The table shows the build time, the query throughput, and
+the number of candidate obstacles found per CA (which is the same for both indices).
+
+Run from the root of the repository with
+
+    python benchmarks/obstacle_index.py
+"""
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from casex import Obstacles
+from casex.obstacle_index import GridIndex, STRtreeIndex
+
+# Shapely 1.8 warns about the changes in Shapely 2.
+warnings.simplefilter("ignore")
+
+densities = [100, 500, 1000, 2000, 5000]
+trials_count = 10000
+trial_area_sidelength = 1000
+
+np.random.seed(12345)
+
+print("{:>9s} {:>8s}   {:>10s} {:>14s}   {:>10s} {:>14s}   {:>10s}".format(
+    "Obstacles", "CAs", "Tree [ms]", "Tree [CA/s]", "Grid [ms]", "Grid [CA/s]", "Cand./CA"))
+for density in densities:
+    OS = Obstacles(3, 200 / 3, density, trial_area_sidelength)
+    OS.generate_rectangular_obstacles_normal_distributed_rotated(17, 3, 8, 2)
+    OS.generate_CAs(trials_count)
+
+    obstacle_bounds = np.array([o.bounds for o in OS.obstacles])
+    CA_bounds = np.array([CA.bounds for CA in OS.CAs])
+
+    t = time.perf_counter()
+    tree = STRtreeIndex(OS.obstacles)
+    tree_build = time.perf_counter() - t
+    t = time.perf_counter()
+    tree_pairs = tree.query_bounds(CA_bounds)
+    tree_query = time.perf_counter() - t
+
+    t = time.perf_counter()
+    grid = GridIndex(obstacle_bounds)
+    grid_build = time.perf_counter() - t
+    t = time.perf_counter()
+    grid_pairs = grid.query_bounds(CA_bounds)
+    grid_query = time.perf_counter() - t
+
+    if not (np.array_equal(tree_pairs[0], grid_pairs[0]) and np.array_equal(tree_pairs[1], grid_pairs[1])):
+        print("The indices do not find the same candidates.")
+
+    print("{:9d} {:8d}   {:10.1f} {:14.0f}   {:10.1f} {:14.0f}   {:10.1f}".format(
+        density, trials_count, tree_build * 1000, trials_count / tree_query, grid_build * 1000,
+        trials_count / grid_query, len(grid_pairs[0]) / trials_count))
@@ -1,18 +1,59 @@
 """
-MISSING DOC
+Casualty expectation toolbox.
+
+The submodules are loaded when one of their names is first accessed (PEP 562), so ``import casex`` is fast, and
+plotting packages such as matplotlib are only imported when the classes that use them are.
 """
-from .friction_coefficient import *
-from .constants import *
-from .enums import *
-from .enums import *
-from .conversion import *
-from .aircraft_specs import *
-from .ballistic_descent_models import *
-from .annex_f_parms import *
-from .critical_area_models import *
-from .explosion_models import *
-from .ground_risk_buffer import *
-from .obstacles import *
-from .annex_f_tables import *
-from .exceptions import *
-from .figures import *
+import importlib
+
+# Public names and the submodule they are defined in.
+_submodule_of = {
+    'FrictionCoefficients': 'friction_coefficient',
+    'GRAVITY': 'constants',
+    'AIR_DENSITY': 'constants',
+    'FuelType': 'enums',
+    'Wrapping': 'enums',
+    'AircraftType': 'enums',
+    'AircraftMaterial': 'enums',
+    'GroundMaterial': 'enums',
+    'Conversion': 'conversion',
+    'AircraftSpecs': 'aircraft_specs',
+    'BallisticDescent2ndOrderDragApproximation': 'ballistic_descent_models',
+    'AnnexFParms': 'annex_f_parms',
+    'CoRModel': 'annex_f_parms',
+    'CriticalAreaModels': 'critical_area_models',
+    'CriticalAreaRaster': 'critical_area_raster',
+    'ExplosionModels': 'explosion_models',
+    'GroundRiskBuffer': 'ground_risk_buffer',
+    'Obstacles': 'obstacles',
+    'GridIndex': 'obstacle_index',
+    'STRtreeIndex': 'obstacle_index',
+    'AnnexFTables': 'annex_f_tables',
+    'NegativeHorizontalVelocityError': 'exceptions',
+    'HorizontalSmallerThanVerticalVelocityError': 'exceptions',
+    'InvalidAircraftError': 'exceptions',
+    'OnlyOneVetorInputError': 'exceptions',
+    'Figures': 'figures',
+    'FigureRenderer': 'figure_renderer',
+}
+
+_submodules = sorted(set(_submodule_of.values()))
+
+__all__ = list(_submodule_of)
+
+
+def __getattr__(name):
+    if name in _submodule_of:
+        value = getattr(importlib.import_module('.' + _submodule_of[name], __name__), name)
+    elif name in _submodules:
+        value = importlib.import_module('.' + name, __name__)
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    # Cache the value, so this is only called once for each name.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_submodules))
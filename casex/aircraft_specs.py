@@ -37,7 +37,7 @@ class AircraftSpecs:
         [kg] Mass of the aircraft in kg. This is the total mass at the time of crash, including fuel.
     aircraft_type : :class:`enums.AircraftType`
         The type of aircraft.
-    fuel_type : :class:`enums.FuelType`
+    fuel_type : :class:`enums.FuelType` or array of :class:`enums.FuelType`
         Fuel type, such as fossil fuels or batteries (the default is `FuelType.GASOLINE`).
     fuel_quantity : float
         [L] The quantity of fuel in liters. For batteries the quantity is also given in L,
@@ -181,14 +181,20 @@ class AircraftSpecs:
         
         Parameters
         ----------       
-        fuel_type : :class:`enums.FuelType`
-            Type of fuel.
+        fuel_type : :class:`enums.FuelType` or array of :class:`enums.FuelType`
+            Type of fuel. An array gives one fuel type for each element in the other array inputs.
             
         Returns
         -------
         None
         """
-        if not isinstance(fuel_type, enums.FuelType):
+        if isinstance(fuel_type, np.ndarray):
+            if not all(isinstance(f, enums.FuelType) for f in fuel_type.flat):
+                warnings.warn("Fuel type not recognized. Type set to gasoline.")
+                self.fuel_type = enums.FuelType.GASOLINE
+            else:
+                self.fuel_type = fuel_type
+        elif not isinstance(fuel_type, enums.FuelType):
             warnings.warn("Fuel type not recognized. Type set to gasoline.")
             self.fuel_type = enums.FuelType.GASOLINE
         else:
@@ -1,22 +1,148 @@
 """
 This class provides support for redoing some of the computations found in Annex F :cite:`a-JARUS_AnnexF`.
 """
+import functools
 import math
 import warnings
-from dataclasses import dataclass
+from dataclasses import dataclass, make_dataclass, fields
 
 import numpy as np
 
 from casex import AircraftSpecs, enums, BallisticDescent2ndOrderDragApproximation, constants
 
 
+class CoRModel:
+    """This class holds a model for the coefficient of restitution (CoR) as a function of impact angle.
+
+    The model is fitted once when the class is instantiated, and can then be evaluated for scalar or array impact
+    angles without any further fitting. Two types of models are supported:
+
+    * An affine model, which is the least squares line through the given points. For two points this is the line
+      through both points. This is the model used in Annex F :cite:`a-JARUS_AnnexF`.
+    * A piecewise linear model, which interpolates linearly between the given points (knots), and extrapolates
+      linearly beyond the first and last knot. This supports non-linear CoR curves with any number of knots.
+
+    Use :meth:`get` to get a shared instance for a given set of points.
+
+    Parameters
+    ----------
+    angles : float array
+        [deg] Impact angles for the points defining the model (at least two).
+    CoRs : float array
+        [-] The CoR values corresponding to the angles.
+    piecewise_linear : bool, optional
+        If True, use the piecewise linear model. Otherwise use the affine model (the default is False).
+
+    Attributes
+    ----------
+    angles : float array
+        [deg] The impact angles of the knots, sorted in increasing order.
+    CoRs : float array
+        [-] The CoR values of the knots.
+    slopes : float array
+        [1/deg] The slope of each linear segment (one segment for the affine model).
+    intercepts : float array
+        [-] The intercept of each linear segment (one segment for the affine model).
+    """
+
+    def __init__(self, angles, CoRs, piecewise_linear=False):
+        angles = np.asarray(angles, dtype=float)
+        CoRs = np.asarray(CoRs, dtype=float)
+
+        if angles.ndim != 1 or angles.shape != CoRs.shape or len(angles) < 2:
+            raise ValueError("angles and CoRs must be one dimensional arrays of the same length with at least two values.")
+
+        self.piecewise_linear = piecewise_linear
+
+        order = np.argsort(angles)
+        self.angles = angles[order]
+        self.CoRs = CoRs[order]
+
+        if piecewise_linear:
+            if np.any(np.diff(self.angles) == 0):
+                raise ValueError("The angles for a piecewise linear CoR model must be distinct.")
+            self.slopes = np.diff(self.CoRs) / np.diff(self.angles)
+            self.intercepts = self.CoRs[:-1] - self.slopes * self.angles[:-1]
+        else:
+            param = np.polyfit(angles, CoRs, 1)
+            self.slopes = param[0:1]
+            self.intercepts = param[1:2]
+
+        # Scalar coefficients for the affine model to keep its evaluation to a single expression.
+        self.__slope = self.slopes[0]
+        self.__intercept = self.intercepts[0]
+
+    def __call__(self, impact_angle):
+        """Compute the coefficient of restitution for a given impact angle.
+
+        Parameters
+        ----------
+        impact_angle : float or float array
+            [deg] The impact angle between 0 and 90.
+
+        Returns
+        -------
+        coefficient of restitution : float or float array
+            [-] The coefficient of restitution for the given impact angle.
+        """
+        if np.any(impact_angle < 0):
+            warnings.warn("Impact angle must be positive. Output is not valid.")
+        if np.any(impact_angle > 90):
+            warnings.warn("Impact angle must be less than 90 degrees. Output is not valid.")
+
+        if not self.piecewise_linear:
+            return self.__slope * impact_angle + self.__intercept
+
+        # Find the segment for each angle. Angles outside the knots use the first or last segment.
+        segment = np.clip(np.searchsorted(self.angles, impact_angle, side='right') - 1, 0, len(self.slopes) - 1)
+
+        return self.slopes[segment] * impact_angle + self.intercepts[segment]
+
+    @staticmethod
+    def get(angles, CoRs, piecewise_linear=False):
+        """Get a shared instance of the model for the given points.
+
+        The model is only fitted the first time a given set of points is requested.
+
+        Parameters
+        ----------
+        angles : float array
+            [deg] Impact angles for the points defining the model.
+        CoRs : float array
+            [-] The CoR values corresponding to the angles.
+        piecewise_linear : bool, optional
+            If True, use the piecewise linear model. Otherwise use the affine model (the default is False).
+
+        Returns
+        -------
+        model : :class:`CoRModel`
+            The shared model.
+        """
+        return CoRModel.__get(tuple(np.asarray(angles, dtype=float).tolist()),
+                              tuple(np.asarray(CoRs, dtype=float).tolist()),
+                              piecewise_linear)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def __get(angles, CoRs, piecewise_linear):
+        return CoRModel(angles, CoRs, piecewise_linear)
+
+
 class AnnexFParms:
     """This class contains the following parameters for the 5 size classes in the iGRC table:
 
+    Constructing this class runs a ballistic descent for each of the 5 size classes. When the same parameters are
+    needed repeatedly (as in the tables and figures), use :meth:`cached` to get a shared, read-only instance instead.
+
     Parameters
     ----------
-    impact_angle : float
-        [deg] The impact angle of the descending aircraft, relative to horizontal.
+    impact_angle : float, optional
+        [deg] The impact angle of the descending aircraft, relative to horizontal (the default is the
+        35 degree scenario angle).
+    **overrides : float, optional
+        Override any of the constants `person_radius`, `person_height`, `lethal_kinetic_energy`,
+        `obstacle_reduction_factor`, `glide_reduce`, `friction_coefficient`, and `ballistic_drag_coefficient`
+        for this instance.
 
     Attributes
     ----------
@@ -42,6 +168,10 @@ class AnnexFParms:
         [J] Computed kinetic energy of aircraft just prior to impact.
     ballistic_impact_velocity : float
         [m/s] Assumed horizontal velocity for beginning of ballistic descent.
+    CoR_model : :class:`CoRModel`
+        The affine model for the coefficient of restitution used in Annex F :cite:`a-JARUS_AnnexF`.
+    columns : :class:`AnnexFParms.CAParametersColumns`
+        The parameters for all the size classes as arrays. See :meth:`compute_columns`.
     cruise_speed : float
         [m/s]Maximum cruise speed for each size class.
     friction_coefficient = 0.65 : float
@@ -76,6 +206,11 @@ class AnnexFParms:
     glide_reduce = 0.65
     friction_coefficient = 0.65
     ballistic_drag_coefficient = 0.8
+    CoR_model = CoRModel([10, 90], [0.8, 0.6])
+
+    # The class constants that can be overridden per instance.
+    overridable_constants = ('person_radius', 'person_height', 'lethal_kinetic_energy', 'obstacle_reduction_factor',
+                             'glide_reduce', 'friction_coefficient', 'ballistic_drag_coefficient')
 
     # This dataclass make the programming and plotting more smooth in allowing for looping for virtually all values.
     @dataclass
@@ -97,7 +232,35 @@ class AnnexFParms:
         glide_speed: float = 0
         aircraft: AircraftSpecs = None
 
-    def __init__(self):
+    # The same parameters as CAParameters, but with an array for each parameter holding all the classes.
+    @dataclass
+    class CAParametersColumns:
+        wingspan: np.ndarray
+        cruise_speed: np.ndarray
+        mass: np.ndarray
+        ballistic_frontal_area: np.ndarray
+        ballistic_descent_altitude: np.ndarray
+        critical_area_target: np.ndarray = None
+        KE_critical: np.ndarray = None
+        coefficient_of_restitution: np.ndarray = None
+        terminal_velocity: np.ndarray = None
+        ballistic_impact_velocity: np.ndarray = None
+        ballistic_impact_angle: np.ndarray = None
+        ballistic_distance: np.ndarray = None
+        ballistic_impact_KE: np.ndarray = None
+        ballistic_descent_time: np.ndarray = None
+        glide_speed: np.ndarray = None
+
+    # Read-only copy of CAParameters used for the shared instances returned by cached().
+    FrozenCAParameters = make_dataclass('FrozenCAParameters', [(f.name, f.type, f) for f in fields(CAParameters)],
+                                        frozen=True)
+
+    def __init__(self, impact_angle=None, **overrides):
+        for name, value in overrides.items():
+            if name not in self.overridable_constants:
+                raise ValueError("Cannot override " + str(name) + ". Must be one of " + str(self.overridable_constants))
+            setattr(self, name, value)
+
         self.population_bands = [0.5, 5, 50, 500, 5000, 50000, 500000]
 
         # Set aircraft type, the type has no effect in this example, but must be given a value.
@@ -112,15 +275,99 @@ class AnnexFParms:
         self.CA_parms.append(self.CAParameters(20,     8000,     120,     self.scenario_angles[1],         8.0,        5000,    self.lethal_kinetic_energy,        500))
         self.CA_parms.append(self.CAParameters(40,     43000,    200,     self.scenario_angles[1],         14,         10000,   self.lethal_kinetic_energy,        1000))
 
-        self.recompute_parameters(self.scenario_angles[1])
+        self.recompute_parameters(self.scenario_angles[1] if impact_angle is None else impact_angle)
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_AnnexFParms__frozen', False):
+            raise AttributeError("This AnnexFParms instance is shared through AnnexFParms.cached() and is read-only. "
+                                 "Instantiate AnnexFParms directly to get a modifiable instance.")
+        super().__setattr__(name, value)
+
+    @staticmethod
+    def cached(impact_angle=None, **overrides):
+        """Get a shared, read-only instance of this class.
+
+        The instance is computed once for each combination of impact angle and overridden constants, and the same
+        instance is returned on subsequent calls. This avoids redoing the ballistic descent computations every time
+        the Annex F parameters are needed.
+
+        The returned instance cannot be modified, and `CA_parms` is a tuple of read-only parameters. The aircraft in
+        `CA_parms` are shared as well, so they should not be changed. Instantiate this class directly to get an
+        instance that can be modified.
+
+        Parameters
+        ----------
+        impact_angle : float or float array, optional
+            [deg] The impact angle used for recomputing the parameters (the default is the 35 degree scenario angle).
+        **overrides : float, optional
+            Any of the constants listed in `overridable_constants`.
+
+        Returns
+        -------
+        AFP : :class:`AnnexFParms`
+            The shared instance.
+        """
+        if impact_angle is None:
+            impact_angle = AnnexFParms.scenario_angles[1]
+
+        # Arrays are not hashable, so they are stored as tuples in the key. A 0-d array is a scalar, so it shares the
+        # entry of the same float.
+        if np.ndim(impact_angle) > 0:
+            key = tuple(np.ravel(impact_angle).tolist())
+        else:
+            key = float(impact_angle)
+
+        return AnnexFParms.__cached(key, tuple(sorted(overrides.items())))
+
+    @staticmethod
+    def clear_cache():
+        """Remove all shared instances created by :meth:`cached`.
+
+        Returns
+        -------
+        None
+        """
+        AnnexFParms.__cached.cache_clear()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def __cached(impact_angle, overrides):
+        AFP = AnnexFParms(np.array(impact_angle) if isinstance(impact_angle, tuple) else impact_angle, **dict(overrides))
+        AFP.CA_parms = tuple(AnnexFParms.FrozenCAParameters(**vars(p)) for p in AFP.CA_parms)
+        AFP.population_bands = tuple(AFP.population_bands)
+        for value in vars(AFP.columns).values():
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+        AFP.__frozen = True
+
+        return AFP
 
     def recompute_parameters(self, impact_angle):
-        BDM = BallisticDescent2ndOrderDragApproximation()
+        """Recompute the derived parameters for the 5 size classes.
+
+        The computation is done for all size classes at once by :meth:`compute_columns`, and the results are then
+        stored in `CA_parms` and `columns`.
 
-        # Compute the parameters for each of the 5 size classes.
-        for k in range(5):
-            # Compute glide speed based on cruise speed
-            self.CA_parms[k].glide_speed = self.glide_reduce * self.CA_parms[k].cruise_speed
+        Parameters
+        ----------
+        impact_angle : float or float array
+            [deg] The impact angle used for the coefficient of restitution.
+
+        Returns
+        -------
+        None
+        """
+        self.columns = self.compute_columns(np.array([p.wingspan for p in self.CA_parms]),
+                                            np.array([p.cruise_speed for p in self.CA_parms]),
+                                            np.array([p.mass for p in self.CA_parms]),
+                                            np.array([p.ballistic_frontal_area for p in self.CA_parms]),
+                                            np.array([p.ballistic_descent_altitude for p in self.CA_parms]),
+                                            impact_angle,
+                                            critical_area_target=np.array([p.critical_area_target for p in self.CA_parms]),
+                                            KE_critical=np.array([p.KE_critical for p in self.CA_parms]))
+
+        for k in range(len(self.CA_parms)):
+            self.CA_parms[k].glide_speed = self.columns.glide_speed[k]
 
             # Define the aircraft.
             self.CA_parms[k].aircraft = AircraftSpecs(self.aircraft_type, self.CA_parms[k].wingspan, self.CA_parms[k].mass)
@@ -129,29 +376,97 @@ class AnnexFParms:
             self.CA_parms[k].aircraft.set_ballistic_frontal_area(self.CA_parms[k].ballistic_frontal_area)
             self.CA_parms[k].aircraft.set_ballistic_drag_coefficient(self.ballistic_drag_coefficient)
             self.CA_parms[k].aircraft.set_friction_coefficient(self.friction_coefficient)
+            self.CA_parms[k].aircraft.set_coefficient_of_restitution(self.columns.coefficient_of_restitution[k])
+
+            self.CA_parms[k].terminal_velocity = self.columns.terminal_velocity[k]
+            self.CA_parms[k].ballistic_impact_velocity = self.columns.ballistic_impact_velocity[k]
+            self.CA_parms[k].ballistic_impact_angle = self.columns.ballistic_impact_angle[k]
+            self.CA_parms[k].ballistic_distance = self.columns.ballistic_distance[k]
+            self.CA_parms[k].ballistic_descent_time = self.columns.ballistic_descent_time[k]
+            self.CA_parms[k].ballistic_impact_KE = self.columns.ballistic_impact_KE[k]
+
+    def compute_columns(self, wingspan, cruise_speed, mass, ballistic_frontal_area, ballistic_descent_altitude,
+                        impact_angle=None, critical_area_target=None, KE_critical=None):
+        """Compute the derived parameters for any number of size classes at once.
+
+        This is the columnar equivalent of `CA_parms`. Each input is an array with one value per size class, and all
+        size classes are computed in a single vectorized pass, including the ballistic descent. This is used for the
+        5 size classes in Annex F, but can also be used for user-defined tables with any number of classes.
+
+        The constants `glide_reduce`, `ballistic_drag_coefficient`, and `friction_coefficient` are taken from this
+        instance. As in Annex F, classes with a wingspan of 1 m or less use the coefficient of restitution for a
+        10 degree impact angle regardless of `impact_angle`.
+
+        Parameters
+        ----------
+        wingspan : float array
+            [m] Wingspan (characteristic dimension) for each class.
+        cruise_speed : float array
+            [m/s] Cruise speed for each class.
+        mass : float array
+            [kg] Mass for each class.
+        ballistic_frontal_area : float array
+            [m^2] Frontal area used for ballistic descent for each class.
+        ballistic_descent_altitude : float array
+            [m] Altitude for beginning of ballistic descent for each class.
+        impact_angle : float or float array, optional
+            [deg] The impact angle used for the coefficient of restitution (the default is the 35 degree scenario angle).
+            If this is an array, `coefficient_of_restitution` has one row per class and one column per angle.
+        critical_area_target : float array, optional
+            [m^2] Size of the largest critical area for each class. Only stored in the result (the default is None).
+        KE_critical : float array, optional
+            [J] Non-lethal energy during slide for each class. Only stored in the result (the default is None).
 
-            if k == 0:
-                # The 1 m column uses 0.8 as CoR in all cases.
-                if isinstance(impact_angle, np.ndarray):
-                    self.CA_parms[k].aircraft.set_coefficient_of_restitution(self.CoR_from_impact_angle(np.full(len(impact_angle), 10)))
-                else:
-                    self.CA_parms[k].aircraft.set_coefficient_of_restitution(self.CoR_from_impact_angle(10))
-            else:
-                # The other columns uses a CoR depending on angle.
-                self.CA_parms[k].aircraft.set_coefficient_of_restitution(self.CoR_from_impact_angle(impact_angle))
-
-            # Compute terminal velocity.
-            self.CA_parms[k].terminal_velocity = self.CA_parms[k].aircraft.terminal_velocity()
-
-            # Compute ballistic descent values.
-            BDM.set_aircraft(self.CA_parms[k].aircraft)
-            p = BDM.compute_ballistic_distance(self.CA_parms[k].ballistic_descent_altitude,
-                                               self.CA_parms[k].cruise_speed, 0)
-            self.CA_parms[k].ballistic_impact_velocity = p[1]
-            self.CA_parms[k].ballistic_impact_angle = p[2] * 180 / np.pi
-            self.CA_parms[k].ballistic_distance = p[0]
-            self.CA_parms[k].ballistic_descent_time = p[3]
-            self.CA_parms[k].ballistic_impact_KE = 0.5 * self.CA_parms[k].mass * np.power(p[1], 2)        
+        Returns
+        -------
+        columns : :class:`AnnexFParms.CAParametersColumns`
+            The input and the computed parameters as arrays with one entry per class.
+        """
+        if impact_angle is None:
+            impact_angle = self.scenario_angles[1]
+
+        wingspan = np.asarray(wingspan, dtype=float)
+        cruise_speed = np.asarray(cruise_speed, dtype=float)
+        mass = np.asarray(mass, dtype=float)
+        ballistic_frontal_area = np.asarray(ballistic_frontal_area, dtype=float)
+        ballistic_descent_altitude = np.asarray(ballistic_descent_altitude, dtype=float)
+
+        # The smallest class uses the CoR for 10 degree impact in all cases, the others use a CoR depending on angle.
+        if isinstance(impact_angle, np.ndarray):
+            small_class = (wingspan <= 1)[:, np.newaxis]
+            impact_angle = impact_angle[np.newaxis, :]
+        else:
+            small_class = wingspan <= 1
+        coefficient_of_restitution = np.where(small_class,
+                                              self.CoR_from_impact_angle(10),
+                                              self.CoR_from_impact_angle(impact_angle))
+
+        # A single aircraft holding all the classes as arrays.
+        aircraft = AircraftSpecs(self.aircraft_type, wingspan, mass)
+        aircraft.set_ballistic_frontal_area(ballistic_frontal_area)
+        aircraft.set_ballistic_drag_coefficient(self.ballistic_drag_coefficient)
+        aircraft.set_friction_coefficient(self.friction_coefficient)
+
+        # Compute ballistic descent values for all classes in one go.
+        BDM = BallisticDescent2ndOrderDragApproximation()
+        BDM.set_aircraft(aircraft)
+        p = BDM.compute_ballistic_distance(ballistic_descent_altitude, cruise_speed, 0)
+
+        return AnnexFParms.CAParametersColumns(wingspan=wingspan,
+                                               cruise_speed=cruise_speed,
+                                               mass=mass,
+                                               ballistic_frontal_area=ballistic_frontal_area,
+                                               ballistic_descent_altitude=ballistic_descent_altitude,
+                                               critical_area_target=critical_area_target,
+                                               KE_critical=KE_critical,
+                                               coefficient_of_restitution=coefficient_of_restitution,
+                                               terminal_velocity=aircraft.terminal_velocity(),
+                                               ballistic_impact_velocity=p[1],
+                                               ballistic_impact_angle=p[2] * 180 / np.pi,
+                                               ballistic_distance=p[0],
+                                               ballistic_impact_KE=0.5 * mass * np.power(p[1], 2),
+                                               ballistic_descent_time=p[3],
+                                               glide_speed=self.glide_reduce * cruise_speed)
 
     @staticmethod
     def iGRC(pop_dens, CA, TLOS=1E-6, use_conservative_compensation = False):
@@ -167,10 +482,11 @@ class AnnexFParms:
         
         Parameters
         ----------
-        pop_dens : float
+        pop_dens : float or float array
             [ppl/km^2] Population density
-        CA : float
-            [m^2] Size of the critical area.
+        CA : float or float array
+            [m^2] Size of the critical area. If either `pop_dens` or `CA` is an array, the iGRC is computed element by
+            element, and the two arrays are broadcast together (for instance a column and a row give a full table).
         TLOS : float, optional
             [fatalities per flight hour] Target level of safety (the default is 1e-6).
             This value is described in more detail in Annex F :cite:`a-JARUS_AnnexF`.
@@ -181,15 +497,27 @@ class AnnexFParms:
             
         Returns
         -------
-        iGRC : integer
+        iGRC : integer or integer array
             The intrinsic ground risk class (as an integer). This is the raw value rounded up to nearest integer.
-        raw iGRC : float
+        raw iGRC : float or float array
             The raw iGRC before rounding up.
         """
 
         # The value for this is given in Annex F.
         convervative_reduction_from_raw_iGRC = 0.5
 
+        # Array input is computed element by element (with broadcasting).
+        if isinstance(pop_dens, np.ndarray) or isinstance(CA, np.ndarray):
+            raw_iGRC_value = 1 - np.log10(TLOS / (pop_dens * 1E-6 * CA))
+
+            if use_conservative_compensation:
+                raw_iGRC_value = raw_iGRC_value - convervative_reduction_from_raw_iGRC
+
+            # Note that np.round rounds half to even, as does round.
+            raw_iGRC_value = np.round(raw_iGRC_value * 10) / 10
+
+            return np.ceil(raw_iGRC_value).astype(int), raw_iGRC_value
+
         # Note that the 1E-6 here is the conversion of pop_dens from km^2 to m^2.
         raw_iGRC_value = 1 - math.log10(TLOS / (pop_dens * 1E-6 * CA))
         
@@ -201,6 +529,80 @@ class AnnexFParms:
 
         return math.ceil(raw_iGRC_value), raw_iGRC_value
 
+    @staticmethod
+    def iGRC_map(CA, pop_dens, use_obstacle_reduction = False, use_conservative_compensation = True, TLOS=1E-6):
+        """Compute the iGRC for all combinations of critical area and population density.
+
+        This is used for the iGRC figures in Annex F :cite:`a-JARUS_AnnexF`, see
+        :meth:`Figures.figure_iGRC_CA_vs_PopDensity`. The entire map is computed in one vectorized call to
+        :meth:`iGRC`, so it can be used for any resolution.
+
+        Parameters
+        ----------
+        CA : float array
+            [m^2] The N sizes of the critical area (columns of the map).
+        pop_dens : float array
+            [ppl/km^2] The M population densities (rows of the map).
+        use_obstacle_reduction : bool, optional
+            If True, the critical area is reduced by `obstacle_reduction_factor` when it is between 8 and
+            43000 m^2 (default is False).
+        use_conservative_compensation: bool, optional
+            If True, the conservative reduction in iGRC value is applied (default is True).
+        TLOS : float, optional
+            [fatalities per flight hour] Target level of safety (the default is 1e-6).
+
+        Returns
+        -------
+        iGRC : integer array
+            (M, N) The intrinsic ground risk class for each population density (row) and critical area (column).
+        raw iGRC : float array
+            (M, N) The raw iGRC before rounding up.
+        """
+        CA = np.asarray(CA, dtype=float)
+        pop_dens = np.asarray(pop_dens, dtype=float)
+
+        if use_obstacle_reduction:
+            CA = np.where((CA > 8) & (CA < 43000), CA * AnnexFParms.obstacle_reduction_factor, CA)
+
+        return AnnexFParms.iGRC(pop_dens[:, np.newaxis], CA[np.newaxis, :], TLOS, use_conservative_compensation)
+
+    @staticmethod
+    def max_critical_area(iGRC, pop_dens, TLOS=1E-6, use_conservative_compensation = False):
+        """Compute the largest critical area that gives at most a given iGRC.
+
+        This is the inverse of :meth:`iGRC`, and it is computed in closed form. Since the raw iGRC is rounded to one
+        decimal before rounding up to the integer iGRC, the integer iGRC is at most `iGRC` when the raw iGRC is below
+        `iGRC` + 0.05. The returned critical area is this boundary, so any critical area strictly below it gives
+        the target iGRC or lower.
+
+        Parameters
+        ----------
+        iGRC : integer or integer array
+            The target intrinsic ground risk class.
+        pop_dens : float or float array
+            [ppl/km^2] Population density. The two inputs are broadcast together.
+        TLOS : float, optional
+            [fatalities per flight hour] Target level of safety (the default is 1e-6).
+        use_conservative_compensation: bool, optional
+            if True, the conservative reduction in iGRC value is applied (as in :meth:`iGRC`).
+
+        Returns
+        -------
+        max_CA : float or float array
+            [m^2] The largest allowable critical area.
+        """
+        # The value for this is given in Annex F.
+        convervative_reduction_from_raw_iGRC = 0.5
+
+        raw_iGRC_limit = np.asarray(iGRC) + 0.05
+        if use_conservative_compensation:
+            raw_iGRC_limit = raw_iGRC_limit + convervative_reduction_from_raw_iGRC
+
+        # Solve raw iGRC = 1 - log10(TLOS / (pop_dens * 1E-6 * CA)) for CA.
+        max_CA = TLOS / (np.asarray(pop_dens) * 1E-6) * np.power(10.0, raw_iGRC_limit - 1)
+
+        return max_CA if max_CA.ndim > 0 else float(max_CA)
+
     @staticmethod
     def applied_obstacle_reduction_factor(width):
         """Compute the obstacle reduction factor used in the iGRC in Annex F :cite:`a-JARUS_AnnexF`.
@@ -230,6 +632,9 @@ class AnnexFParms:
         This method assumes an affine relation between impact angle and CoR. Therefore, two angles and two CoR values
         are used to determine this relation. The default is as described in Annex F that the CoR is 0.8 at a 10 degree
         impact and 0.6 at a 90 degree (vertical) impact. This values are used as defaults, but others can be specified.
+
+        The relation is fitted only once for each set of angles and CoR values, see :class:`CoRModel`. For
+        non-linear relations, use a piecewise linear :class:`CoRModel` directly.
         
         Parameters
         ----------        
@@ -245,16 +650,13 @@ class AnnexFParms:
         coefficient of restitution : float
             [-] The coefficient of restitution for the given impact angle.
         """
+        # The Annex F model is fitted once when the class is defined.
+        if angles is None and CoRs is None:
+            return AnnexFParms.CoR_model(impact_angle)
+
         if angles is None:
             angles = [10, 90]
         if CoRs is None:
             CoRs = [0.8, 0.6]
 
-        if np.any(impact_angle < 0):
-            warnings.warn("Impact angle must be positive. Output is not valid.")
-        if np.any(impact_angle > 90):
-            warnings.warn("Impact angle must be less than 90 degrees. Output is not valid.")
-
-        param = np.polyfit(angles, CoRs, 1)
-
-        return param[0] * impact_angle + param[1]
+        return CoRModel.get(angles, CoRs)(impact_angle)
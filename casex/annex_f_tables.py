@@ -1,6 +1,7 @@
 """
 This class allows for recreating some of the tables in Annex F :cite:`a-JARUS_AnnexF`.
 """
+import copy
 import numpy as np
 import math
 import warnings
@@ -15,9 +16,155 @@ class AnnexFTables:
 
     Attributes
     ----------
-    none.
+    tradeoff_factors : float array
+        Factors on width, impact speed, and population density for the tradeoff tables T0 through T6 in Annex F.
     """
  
+    tradeoff_factors = np.array([[1,   1,    1  ],
+                                 [1,   1.4,  0.5],
+                                 [2,   1,    0.5],
+                                 [0.5, 1,    2  ],
+                                 [0.5, 1.4,  1  ],
+                                 [1,   0.75, 1.7],
+                                 [1.7, 0.75, 1  ]])
+
+    @staticmethod
+    def iGRC_table_values(show_with_obstacles = True,
+                          show_ballistic = False,
+                          show_with_conservative_compensation = True,
+                          show_glide_angle = False,
+                          show_additional_pop_density = False):
+        """Compute the values in the iGRC tables in Annex F :cite:`a-JARUS_AnnexF`.
+
+        This is the computation behind :meth:`iGRC_tables`, but the values are returned as arrays instead of being
+        formatted for console output. All five columns and all population densities are computed in a single
+        vectorized pass. The parameters are the same as for :meth:`iGRC_tables`.
+
+        Parameters
+        ----------
+        show_with_obstacles : bool, optional
+            If true, compute iGRC values when obstacles are present. Default True.
+        show_ballistic : bool, optional
+            If true, compute iGRC values for ballistic descent. This superseeds show_glide_angle. Default False.
+        show_with_conservative_compensation : bool, optional
+            If true, apply the conservative compensation. Default True.
+        show_glide_angle : bool, optional
+            If true, compute for 10 degree impact angle instead of 35 degree. Default False.
+        show_additional_pop_density : bool, optional
+            If true, include additional population density rows. Default False.
+
+        Returns
+        -------
+        values : dict
+            Dictionary with the following arrays, where P is the number of population densities.
+
+            * `pop_density` (P) [ppl/km^2] The population densities (rows).
+            * `wingspan` (5) [m] The wingspan of each column.
+            * `impact_speed` (5) [m/s] The impact speed of each column.
+            * `impact_angle` (5) [deg] The impact angle of each column.
+            * `critical_area` (5) [m^2] The critical area of each column.
+            * `slide_area` (5) [m^2] The slide area of each column.
+            * `iGRC` (P, 5) The integer iGRC values.
+            * `raw_iGRC` (P, 5) The raw iGRC values.
+        """
+        # Set impact angle.
+        impact_angle = AnnexFParms.scenario_angles[0] if show_glide_angle else AnnexFParms.scenario_angles[1]
+
+        # Instantiate necessary classes.
+        CA = CriticalAreaModels()
+        AFP = AnnexFParms.cached()
+
+        if show_ballistic:
+            impact_speed = AFP.columns.ballistic_impact_velocity
+            impact_angle = AFP.columns.ballistic_impact_angle
+        else:
+            impact_speed = AFP.columns.glide_speed if show_glide_angle else AFP.columns.cruise_speed
+
+        # A single aircraft holding all five columns as arrays.
+        aircraft = AircraftSpecs(enums.AircraftType.GENERIC, AFP.columns.wingspan, AFP.columns.mass)
+
+        # Friction coefficient from Annex F.
+        aircraft.set_friction_coefficient(AFP.friction_coefficient)
+
+        # Set parameters for fuel
+        aircraft.set_fuel_type(enums.FuelType.GASOLINE)
+        aircraft.set_fuel_quantity(0)
+
+        aircraft.set_coefficient_of_restitution(AnnexFParms.CoR_from_impact_angle(impact_angle))
+
+        # Compute the CA for all columns.
+        p = CA.critical_area(aircraft, impact_speed, impact_angle, use_obstacle_reduction = show_with_obstacles)
+
+        # Set list of population density bands in the table.
+        pop_density = np.asarray(AFP.population_bands)
+
+        if show_additional_pop_density:
+            pop_density = np.append(pop_density, [1.5, 15, 150, 1500, 15000, 150000])
+
+        pop_density = np.sort(pop_density)
+
+        # Compute the iGRC values for all rows and columns.
+        iGRC, raw_iGRC = AFP.iGRC(pop_density[:, np.newaxis], p[0][np.newaxis, :],
+                                  use_conservative_compensation = show_with_conservative_compensation)
+
+        return {'pop_density': pop_density,
+                'wingspan': AFP.columns.wingspan,
+                'impact_speed': np.broadcast_to(impact_speed, (5,)),
+                'impact_angle': np.broadcast_to(np.asarray(impact_angle, dtype=float), (5,)),
+                'critical_area': p[0],
+                'slide_area': np.broadcast_to(p[2], (5,)),
+                'iGRC': iGRC,
+                'raw_iGRC': raw_iGRC}
+
+    @staticmethod
+    def iGRC_table_records(show_with_obstacles = True,
+                           show_ballistic = False,
+                           show_with_conservative_compensation = True,
+                           show_glide_angle = False,
+                           show_additional_pop_density = False):
+        """Compute the iGRC tables in Annex F :cite:`a-JARUS_AnnexF` as a record array.
+
+        There is one record for each cell in the table, i.e. for each combination of population density and column.
+        The records are ordered row by row. The parameters are the same as for :meth:`iGRC_tables`.
+
+        Parameters
+        ----------
+        show_with_obstacles : bool, optional
+            If true, compute iGRC values when obstacles are present. Default True.
+        show_ballistic : bool, optional
+            If true, compute iGRC values for ballistic descent. This superseeds show_glide_angle. Default False.
+        show_with_conservative_compensation : bool, optional
+            If true, apply the conservative compensation. Default True.
+        show_glide_angle : bool, optional
+            If true, compute for 10 degree impact angle instead of 35 degree. Default False.
+        show_additional_pop_density : bool, optional
+            If true, include additional population density rows. Default False.
+
+        Returns
+        -------
+        records : numpy.recarray
+            Records with the fields `pop_density`, `column`, `wingspan`, `impact_speed`, `impact_angle`,
+            `critical_area`, `slide_distance`, `iGRC`, and `raw_iGRC`.
+        """
+        values = AnnexFTables.iGRC_table_values(show_with_obstacles,
+                                                show_ballistic,
+                                                show_with_conservative_compensation,
+                                                show_glide_angle,
+                                                show_additional_pop_density)
+
+        shape = (len(values['pop_density']), 5)
+
+        return AnnexFTables.__records(shape,
+                                      pop_density = values['pop_density'][:, np.newaxis],
+                                      column = np.arange(5),
+                                      wingspan = values['wingspan'],
+                                      impact_speed = values['impact_speed'],
+                                      impact_angle = values['impact_angle'],
+                                      critical_area = values['critical_area'],
+                                      slide_distance = values['slide_area'] / values['wingspan'],
+                                      iGRC = values['iGRC'],
+                                      raw_iGRC = values['raw_iGRC'])
+
     @staticmethod
     def iGRC_tables(show_with_obstacles = True,
                     show_ballistic = False,
@@ -27,7 +174,7 @@ class AnnexFTables:
         """Compute the iGRC tables Annex F :cite:`a-JARUS_AnnexF`.
         
         Produces console output to show the iGRC tables in a variety of forms.
-        The default setup will produce the nominal iGRC table.
+        The default setup will produce the nominal iGRC table. The values are taken from :meth:`iGRC_table_records`.
         
         Parameters
         ----------
@@ -48,68 +195,18 @@ class AnnexFTables:
         console_output : list of strings
             The output to show.
         """
-        
-        
-        # Set impact angle.
+        records = AnnexFTables.iGRC_table_records(show_with_obstacles,
+                                                  show_ballistic,
+                                                  show_with_conservative_compensation,
+                                                  show_glide_angle,
+                                                  show_additional_pop_density).reshape(-1, 5)
+
+        AFP = AnnexFParms.cached()
+
+        pop_density = records.pop_density[:, 0]
+        iGRC_table = records.raw_iGRC
         impact_angle = AnnexFParms.scenario_angles[0] if show_glide_angle else AnnexFParms.scenario_angles[1]
-        
-        # Instantiate necessary classes.
-        CA = CriticalAreaModels()
-        AFP = AnnexFParms()
-        
-        # Instantiate and add data to AircraftSpecs class.
-        # Values are not relevant here, since they will be changed below.
-        aircraft = AircraftSpecs(enums.AircraftType.GENERIC, 1, 1)
-        
-        # Friction coefficient from Annex F.
-        aircraft.set_friction_coefficient(AFP.friction_coefficient)
-        
-        # Set parameters for fuel
-        aircraft.set_fuel_type(enums.FuelType.GASOLINE)
-        aircraft.set_fuel_quantity(0)
-        
-        # Set list of population density bands in the table.
-        pop_density = AFP.population_bands  # np.array([0.25, 25, 250, 2500, 25000, 250000, 2500000])
-        
-        if show_additional_pop_density:
-            pop_density = np.append(pop_density, [1.5, 15, 150, 1500, 15000, 150000])
-        
-        pop_density = np.sort(pop_density)
-        
-        # Initialize variables.,
-        iGRC_table = np.zeros((len(pop_density), 5))
-        impact_angles = np.zeros((5))
-        p = np.zeros((5, 9))
-        
-        # Loop over columns in the iGRC table.
-        for j in range(0, 5):
-            
-            # Set mass according to Annex F.
-            aircraft.set_mass(AFP.CA_parms[j].mass)
-        
-            # First, set width and speed to nominal values.
-            aircraft.set_width(AFP.CA_parms[j].wingspan)
-            
-            if show_ballistic:
-                impact_speed = AFP.CA_parms[j].ballistic_impact_velocity
-                impact_angle = AFP.CA_parms[j].ballistic_impact_angle
-            else:
-                impact_speed = AFP.CA_parms[j].glide_speed if show_glide_angle else AFP.CA_parms[j].cruise_speed
-        
-            aircraft.set_coefficient_of_restitution(AnnexFParms.CoR_from_impact_angle(impact_angle))
-        
-            # Compute the CA.
-            p[j] = CA.critical_area(aircraft, impact_speed, impact_angle, use_obstacle_reduction = show_with_obstacles)
-            
-            # Store the impact angle (only relevant for ballistic).
-            impact_angles[j] = impact_angle
-        
-        # Compute the iGRC values.
-        for i in range(len(pop_density)):
-            for j in range(0, 5):
-                iGRC_table[i][j] = AFP.iGRC(pop_density[i],
-                                            p[j][0],
-                                            use_conservative_compensation = show_with_conservative_compensation)[1]
+
         console_output = []
         
         s = "iGRC table"
@@ -135,18 +232,18 @@ class AnnexFTables:
         
         s = "     CA size [m^2]  |"
         for j in range(0, 5):
-            s = s + "{:8.0f}  ".format(p[j][0])
+            s = s + "{:8.0f}  ".format(records.critical_area[0, j])
         console_output.append(s)
         
         s = "Slide distance [m]  |"
         for j in range(0, 5):
-            s = s + "{:8.0f}  ".format(p[j][2] / AFP.CA_parms[j].wingspan)
+            s = s + "{:8.0f}  ".format(records.slide_distance[0, j])
         console_output.append(s)
         
         if show_ballistic:
             s = "Impact angle [deg]  |"
             for j in range(0, 5):
-                s = s + "{:8.0f}  ".format(impact_angles[j])
+                s = s + "{:8.0f}  ".format(records.impact_angle[0, j])
             console_output.append(s)
             
             s = "Altitude [m]        |    "
@@ -174,6 +271,136 @@ class AnnexFTables:
         return console_output
     
     
+    @staticmethod
+    def iGRC_tradeoff_values(width_factor, impact_speed_factor, Dpop_factor):
+        """Compute the values in the iGRC tradeoff tables in Annex F :cite:`a-JARUS_AnnexF`.
+
+        This is the computation behind :meth:`iGRC_tradeoff_tables`. The three factors may be scalars or arrays
+        of any broadcastable shape S, in which case all tradeoffs are computed in a single vectorized pass. The factors
+        for the tradeoff tables T0 through T6 in Annex F are found in ``AnnexFTables.tradeoff_factors``.
+
+        Parameters
+        ----------
+        width_factor : float or float array
+            [-] Factor on the wingspan of each column.
+        impact_speed_factor : float or float array
+            [-] Factor on the impact speed of each column.
+        Dpop_factor : float or float array
+            [-] Factor on the population density of each row.
+
+        Returns
+        -------
+        values : dict
+            Dictionary with the following arrays, where P is the number of population densities.
+
+            * `pop_density` (P) [ppl/km^2] The nominal population densities (rows).
+            * `wingspan` (S, 5) [m] The modified wingspan of each column.
+            * `impact_speed` (S, 5) [m/s] The modified impact speed of each column.
+            * `raw_iGRC_original` (P, 5) The raw iGRC values for the nominal table.
+            * `raw_iGRC` (S, P, 5) The raw iGRC values for the tradeoff table.
+            * `not_applicable` (P, 5) True for the cells that are not applicable in the iGRC table.
+        """
+        width_factor = np.asarray(width_factor, dtype=float)
+        impact_speed_factor = np.asarray(impact_speed_factor, dtype=float)
+        Dpop_factor = np.asarray(Dpop_factor, dtype=float)
+        shape = np.broadcast_shapes(width_factor.shape, impact_speed_factor.shape, Dpop_factor.shape)
+
+        # Data on person size.
+        person_radius = 0.3
+        person_height = 1.8
+        
+        # Instantiate necessary classes.
+        CA = CriticalAreaModels(person_radius, person_height)
+        
+        # Get the shared Annex F parameter class.
+        AFP = AnnexFParms.cached()
+        
+        # The impact angle is from scenario 2, glide impact
+        impact_angle = AnnexFParms.scenario_angles[1]
+
+        # The CA does not depend on the population density, so it is only computed for the width and speed factors.
+        # The nominal values are in the first row and the modified values in the remaining rows.
+        aircraft_shape = np.broadcast_shapes(width_factor.shape, impact_speed_factor.shape)
+        factors = np.broadcast_to(width_factor, aircraft_shape).reshape(-1, 1)
+        wingspan = AFP.columns.wingspan * np.vstack((np.ones((1, 1)), factors))
+        factors = np.broadcast_to(impact_speed_factor, aircraft_shape).reshape(-1, 1)
+        impact_speed = AFP.columns.cruise_speed * np.vstack((np.ones((1, 1)), factors))
+        mass = np.broadcast_to(AFP.columns.mass, wingspan.shape)
+
+        # Instantiate and add data to AircraftSpecs class.
+        aircraft = AircraftSpecs(enums.AircraftType.GENERIC, wingspan, mass)
+        
+        # Friction coefficient from Annex F
+        aircraft.set_friction_coefficient(AFP.friction_coefficient)
+        
+        # Set parameters for fuel.
+        aircraft.set_fuel_type(enums.FuelType.GASOLINE)
+        aircraft.set_fuel_quantity(0)
+        
+        # Get CoR using the aircraft class.
+        aircraft.set_coefficient_of_restitution(AnnexFParms.CoR_from_impact_angle(impact_angle))
+
+        # Compute the CA using the angle for scenario 2 (glide impact angle) for all tradeoffs at once.
+        p = CA.critical_area(aircraft, impact_speed, impact_angle, use_obstacle_reduction = True)[0]
+
+        pop_density = np.asarray(AFP.population_bands)
+
+        # Compute the raw iGRC according to Annex F.
+        raw_iGRC_original = AnnexFParms.iGRC(pop_density[:, np.newaxis], p[0][np.newaxis, :],
+                                             use_conservative_compensation=True)[1]
+        Dpop = pop_density[:, np.newaxis] * Dpop_factor[..., np.newaxis, np.newaxis]
+        raw_iGRC = AnnexFParms.iGRC(Dpop, p[1:].reshape(aircraft_shape + (1, 5)), use_conservative_compensation=True)[1]
+
+        not_applicable = (pop_density[:, np.newaxis] == 500000) & (np.arange(5)[np.newaxis, :] > 1)
+
+        return {'pop_density': pop_density,
+                'wingspan': np.broadcast_to(wingspan[1:].reshape(aircraft_shape + (5,)), shape + (5,)),
+                'impact_speed': np.broadcast_to(impact_speed[1:].reshape(aircraft_shape + (5,)), shape + (5,)),
+                'raw_iGRC_original': raw_iGRC_original,
+                'raw_iGRC': np.broadcast_to(raw_iGRC, shape + raw_iGRC_original.shape),
+                'not_applicable': not_applicable}
+
+    @staticmethod
+    def iGRC_tradeoff_records(tradeoff_type):
+        """Compute the iGRC tradeoff tables in Annex F :cite:`a-JARUS_AnnexF` as a record array.
+
+        There is one record for each cell in the table, i.e. for each combination of population density and column.
+        The records are ordered row by row.
+
+        Parameters
+        ----------
+        tradeoff_type : integer
+            If 0, computes the nominal iGRC table.
+            For n = 1 through 6 computes the corresponding Tn table, as described in Annex F.
+
+        Returns
+        -------
+        records : numpy.recarray
+            Records with the fields `tradeoff_type`, `pop_density`, `modified_pop_density`, `column`, `wingspan`,
+            `impact_speed`, `raw_iGRC`, `raw_iGRC_original`, `relative_iGRC`, and `not_applicable`. The wingspan,
+            impact speed, and modified population density are the values after applying the tradeoff factors.
+        """
+        if tradeoff_type not in range(len(AnnexFTables.tradeoff_factors)):
+            raise ValueError("tradeoff_type must be an integer from 0 through {:d}.".format(
+                len(AnnexFTables.tradeoff_factors) - 1))
+
+        factors = AnnexFTables.tradeoff_factors[tradeoff_type]
+        values = AnnexFTables.iGRC_tradeoff_values(*factors)
+
+        shape = (len(values['pop_density']), 5)
+
+        return AnnexFTables.__records(shape,
+                                      tradeoff_type = tradeoff_type,
+                                      pop_density = values['pop_density'][:, np.newaxis],
+                                      modified_pop_density = values['pop_density'][:, np.newaxis] * factors[2],
+                                      column = np.arange(5),
+                                      wingspan = values['wingspan'],
+                                      impact_speed = values['impact_speed'],
+                                      raw_iGRC = values['raw_iGRC'],
+                                      raw_iGRC_original = values['raw_iGRC_original'],
+                                      relative_iGRC = values['raw_iGRC'] - values['raw_iGRC_original'],
+                                      not_applicable = values['not_applicable'])
+
     @staticmethod
     def iGRC_tradeoff_tables(tradeoff_type, show_integer_iGRC, show_relative):
         """Compute the iGRC tradeoff tables Annex F :cite:`a-JARUS_AnnexF`.
@@ -207,65 +434,11 @@ class AnnexFTables:
         
         console_output = []
         
-        # Data on person size.
-        person_radius = 0.3
-        person_height = 1.8
-        
-        # Instantiate necessary classes.
-        CA = CriticalAreaModels(person_radius, person_height)
-        
-        # Instantiate the Annex F parameter class.
-        AFP = AnnexFParms()
-        
-        # The impact angle is from scenario 2, glide impact
-        impact_angle = AnnexFParms.scenario_angles[1]
-        
-        # Instantiate and add data to AircraftSpecs class.
-        # Note that the values here are not important, since they will be changed below.
-        aircraft = AircraftSpecs(enums.AircraftType.GENERIC, 1, 1, 1)
-        
-        # Friction coefficient from Annex F
-        aircraft.set_friction_coefficient(AFP.friction_coefficient)
-        
-        # Set parameters for fuel.
-        aircraft.set_fuel_type(enums.FuelType.GASOLINE)
-        aircraft.set_fuel_quantity(0)
-        
-        # Get CoR using the aircraft class.
-        aircraft.set_coefficient_of_restitution(AnnexFParms.CoR_from_impact_angle(impact_angle))
-        
-        # Set the appropriate changes for each type of trade-off.
-        if tradeoff_type == 0:
-            width_factor        = 1
-            impact_speed_factor = 1
-            Dpop_factor         = 1
-        elif tradeoff_type == 1:
-            width_factor        = 1     
-            impact_speed_factor = 1.4  
-            Dpop_factor         = 0.5                             
-        elif tradeoff_type == 2:
-            width_factor        = 2   
-            impact_speed_factor = 1        
-            Dpop_factor         = 0.5                             
-        elif tradeoff_type == 3:
-            width_factor        = 0.5 
-            impact_speed_factor = 1      
-            Dpop_factor         = 2                            
-        elif tradeoff_type == 4:
-            width_factor        = 0.5
-            impact_speed_factor = 1.4
-            Dpop_factor         = 1                               
-        elif tradeoff_type == 5:
-            width_factor        = 1      
-            impact_speed_factor = 0.75 
-            Dpop_factor         = 1.7                       
-        elif tradeoff_type == 6:
-            width_factor        = 1.7
-            impact_speed_factor = 0.75   
-            Dpop_factor         = 1                            
-        else:
+        if tradeoff_type not in range(len(AnnexFTables.tradeoff_factors)):
             return "tradeoff_type value not legal."
-            
+
+        records = AnnexFTables.iGRC_tradeoff_records(tradeoff_type).reshape(-1, 5)
+
         if tradeoff_type > 0:
             console_output.append("Modified raw iGRC table for trade-off scenario T{:1}".format(tradeoff_type))
         else:
@@ -276,61 +449,35 @@ class AnnexFTables:
         
         s = "             Max dim   |  "
         for j in range(0, 5):
-            s = s + "{:4.1f} m    ".format(AFP.CA_parms[j].wingspan * width_factor)
+            s = s + "{:4.1f} m    ".format(records.wingspan[0, j])
         console_output.append(s)                                                                    
         
         s = "Dpop         Max speed |"        
         for j in range(0, 5):
-            s = s + "{:4} m/s  ".format(int(AFP.CA_parms[j].cruise_speed * impact_speed_factor))
+            s = s + "{:4} m/s  ".format(int(records.impact_speed[0, j]))
         console_output.append(s)
         
         console_output.append("-----------------------+--------------------------------------------------")
         
-        for Dpop in AFP.population_bands: #[0.5, 5, 50, 500, 5000, 50000, 500001]:
+        for i in range(records.shape[0]):
             
-            if (Dpop > 1):
-                s = "    {:6} ppl/km^2    |   ".format(int(Dpop * Dpop_factor))
+            if (records.pop_density[i, 0] > 1):
+                s = "    {:6} ppl/km^2    |   ".format(int(records.modified_pop_density[i, 0]))
             else:
                 s = "         Controlled    |   "
         
             # Loop over columns in the iGRC table.
             for j in range(0, 5):
-                
-                # Set mass according to Annex F.
-                aircraft.set_mass(AFP.CA_parms[j].mass)
-        
-                # First, set width and speed to nominal values.
-                aircraft.set_width(AFP.CA_parms[j].wingspan)
-                impact_speed = AFP.CA_parms[j].cruise_speed
-        
-                # Compute the AC using the angle for scenario 2 (glide impact angle)
-                p_original = CA.critical_area(aircraft, impact_speed, impact_angle, use_obstacle_reduction = True)[0]
-                
-                # Then set to modified values.
-                aircraft.set_width(AFP.CA_parms[j].wingspan * width_factor)
-                impact_speed = AFP.CA_parms[j].cruise_speed * impact_speed_factor
-            
-                # And again, compute AC.
-                p_trade_off = CA.critical_area(aircraft, impact_speed, impact_angle, use_obstacle_reduction = True)[0]
-        
-                # Compute the raw iGRC according to Annex F.
-                raw_iGRC_original = AnnexFParms.iGRC(Dpop,
-                                                     p_original,
-                                                     use_conservative_compensation=True) 
-                raw_iGRC_trade_off = AnnexFParms.iGRC(Dpop * Dpop_factor,
-                                                      p_trade_off,
-                                                      use_conservative_compensation=True) 
-        
-                if Dpop == 500000 and j > 1:
+                if records.not_applicable[i, j]:
                     s = s + "  n/a     "
                 else:                
                     if show_relative:
-                        s = s + "{:4.1f}      ".format(raw_iGRC_trade_off[1] - raw_iGRC_original[1])
+                        s = s + "{:4.1f}      ".format(records.relative_iGRC[i, j])
                     else:
                         if show_integer_iGRC:
-                            s = s + "{:4.0f}      ".format(raw_iGRC_trade_off[1] - 0.1) # Subtracting 0.1 to reduce 2.1, 3.1, etc to 2, 3.
+                            s = s + "{:4.0f}      ".format(records.raw_iGRC[i, j] - 0.1) # Subtracting 0.1 to reduce 2.1, 3.1, etc to 2, 3.
                         else:
-                            s = s + "{:4.1f}      ".format(raw_iGRC_trade_off[1])
+                            s = s + "{:4.1f}      ".format(records.raw_iGRC[i, j])
                 
             console_output.append(s)
             
@@ -340,11 +487,131 @@ class AnnexFTables:
         return console_output
     
     
+    @staticmethod
+    def iGRC_tradeoff_explorer(width_factor, impact_speed_factor, Dpop_factor, iGRC_reduction = 1):
+        """Search a grid of tradeoffs for the ones that lower the iGRC in Annex F :cite:`a-JARUS_AnnexF`.
+
+        This generalizes the tradeoff tables T1 through T6 from :meth:`iGRC_tradeoff_tables` to a full grid of factors
+        on width, impact speed, and population density. All combinations of the factors are evaluated in a single
+        batch with :meth:`iGRC_tradeoff_values`. For each cell in the iGRC table, a tradeoff is feasible if it lowers
+        the integer iGRC by at least `iGRC_reduction` compared to the nominal table.
+
+        Larger factors mean less change to the operation. Therefore, for each combination of width and speed factor,
+        only the largest feasible population density factor is of interest. A feasible tradeoff is on the Pareto
+        frontier if no other feasible tradeoff in the grid has factors that are all at least as large and one that
+        is larger.
+
+        Parameters
+        ----------
+        width_factor : float array
+            [-] The W factors on the wingspan to search over.
+        impact_speed_factor : float array
+            [-] The S factors on the impact speed to search over.
+        Dpop_factor : float array
+            [-] The D factors on the population density to search over.
+        iGRC_reduction : int, optional
+            The required reduction in integer iGRC (default is 1).
+
+        Returns
+        -------
+        result : dict
+            Dictionary with the following arrays, where P is the number of population densities. The factors are
+            sorted in increasing order, and duplicates are removed.
+
+            * `width_factor` (W) [-] The width factors.
+            * `impact_speed_factor` (S) [-] The impact speed factors.
+            * `Dpop_factor` (D) [-] The population density factors.
+            * `pop_density` (P) [ppl/km^2] The nominal population densities (rows).
+            * `reduction` (W, S, D, P, 5) The reduction in integer iGRC for each tradeoff and cell.
+            * `max_Dpop_factor` (W, S, P, 5) [-] The largest feasible population density factor, NaN if none.
+            * `pareto` (W, S, P, 5) True for the width and speed factors on the Pareto frontier.
+            * `frontier` Record array with the fields `pop_density`, `column`, `width_factor`,
+              `impact_speed_factor`, and `Dpop_factor` for all tradeoffs on the Pareto frontier in all applicable cells.
+        """
+        width_factor = np.unique(np.asarray(width_factor, dtype=float))
+        impact_speed_factor = np.unique(np.asarray(impact_speed_factor, dtype=float))
+        Dpop_factor = np.unique(np.asarray(Dpop_factor, dtype=float))
+
+        values = AnnexFTables.iGRC_tradeoff_values(width_factor[:, np.newaxis, np.newaxis],
+                                                   impact_speed_factor[np.newaxis, :, np.newaxis],
+                                                   Dpop_factor[np.newaxis, np.newaxis, :])
+
+        reduction = (np.ceil(values['raw_iGRC_original']) - np.ceil(values['raw_iGRC'])).astype(int)
+        feasible = reduction >= iGRC_reduction
+
+        # Largest feasible population density factor for each width and speed factor.
+        D = len(Dpop_factor)
+        any_feasible = np.any(feasible, axis=2)
+        last = D - 1 - np.argmax(feasible[:, :, ::-1], axis=2)
+        max_Dpop_factor = np.where(any_feasible, Dpop_factor[last], np.nan)
+
+        # A point is dominated if a point with larger width or speed factor allows at least the same density factor.
+        # This is found from the maximum over all points with at least the same width and speed factor.
+        best = np.where(any_feasible, last, -1)
+        suffix = np.maximum.accumulate(np.maximum.accumulate(best[::-1, ::-1], axis=0), axis=1)[::-1, ::-1]
+        padded = np.pad(suffix, ((0, 1), (0, 1), (0, 0), (0, 0)), constant_values=-1)
+        dominated = np.maximum(padded[1:, :-1], padded[:-1, 1:]) >= best
+        pareto = any_feasible & ~dominated & ~values['not_applicable']
+
+        w, v, i, j = np.nonzero(pareto)
+        frontier = AnnexFTables.__records((len(w),),
+                                          pop_density = values['pop_density'][i],
+                                          column = j,
+                                          width_factor = width_factor[w],
+                                          impact_speed_factor = impact_speed_factor[v],
+                                          Dpop_factor = Dpop_factor[last[w, v, i, j]])
+
+        return {'width_factor': width_factor,
+                'impact_speed_factor': impact_speed_factor,
+                'Dpop_factor': Dpop_factor,
+                'pop_density': values['pop_density'],
+                'reduction': reduction,
+                'max_Dpop_factor': max_Dpop_factor,
+                'pareto': pareto,
+                'frontier': frontier}
+
+    @staticmethod
+    def ballistic_descent_records():
+        """Compute the ballistic descent table in Annex F :cite:`a-JARUS_AnnexF` as a record array.
+
+        There is one record for each of the five columns in the iGRC table.
+
+        Parameters
+        ----------
+        none.
+
+        Returns
+        -------
+        records : numpy.recarray
+            Records with the fields `wingspan`, `ballistic_frontal_area`, `mass`, `ballistic_descent_altitude`,
+            `cruise_speed`, `terminal_velocity`, `cruise_KE`, `ballistic_impact_velocity`, `ballistic_impact_angle`,
+            `coefficient_of_restitution`, `ballistic_distance`, `ballistic_descent_time`, and `ballistic_impact_KE`.
+        """
+        # Impact angle is not used, so just set to 0.
+        AFP = AnnexFParms.cached(0)
+
+        return AnnexFTables.__records((5,),
+                                      wingspan = [c.wingspan for c in AFP.CA_parms],
+                                      ballistic_frontal_area = AFP.columns.ballistic_frontal_area,
+                                      mass = [c.mass for c in AFP.CA_parms],
+                                      ballistic_descent_altitude = AFP.columns.ballistic_descent_altitude,
+                                      cruise_speed = AFP.columns.cruise_speed,
+                                      terminal_velocity = AFP.columns.terminal_velocity,
+                                      cruise_KE = 0.5 * AFP.columns.mass * AFP.columns.cruise_speed**2,
+                                      ballistic_impact_velocity = AFP.columns.ballistic_impact_velocity,
+                                      ballistic_impact_angle = AFP.columns.ballistic_impact_angle,
+                                      coefficient_of_restitution = AnnexFParms.CoR_from_impact_angle(
+                                          AFP.columns.ballistic_impact_angle),
+                                      ballistic_distance = AFP.columns.ballistic_distance,
+                                      ballistic_descent_time = AFP.columns.ballistic_descent_time,
+                                      ballistic_impact_KE = AFP.columns.ballistic_impact_KE)
+
     @staticmethod
     def ballistic_descent_table():
         """Compute the ballistic descent table in Annex F :cite:`a-JARUS_AnnexF`.
         
-        Produces console output to show the ballistic descent table.
+        Produces console output to show the ballistic descent table. The values are taken from
+        :meth:`ballistic_descent_records`.
         
         Parameters
         ----------
@@ -358,86 +625,105 @@ class AnnexFTables:
         
         console_output = []
 
-        # Impact angle is not used, so just set to 0.
-        AFP = AnnexFParms(0)
+        records = AnnexFTables.ballistic_descent_records()
 
         console_output.append("Ballistic descent computations")
         console_output.append("---------------------------------------------------------------")
 
-        s = "Class                  "
-        for c in range(5):
-            s = s + "{:2d} m     ".format(AFP.CA_parms[c].wingspan)
-        console_output.append(s)
-
-        s = "Frontal area [m2]      "
-        for c in range(5):
-            s = s + "{:4.1f}     ".format(AFP.CA_parms[c].ballistic_frontal_area)
-        console_output.append(s)
-
-        s = "Mass [kg]             "
-        for c in range(5):
-            s = s + "{:5d}    ".format(AFP.CA_parms[c].mass)
-        console_output.append(s)
-
-        s = "Init alt [m]           "
-        for c in range(5):
-            s = s + "{:4.0f}     ".format(AFP.CA_parms[c].ballistic_descent_altitude)
-        console_output.append(s)
-
-        s = "Velocity [m/s]         "
-        for c in range(5):
-            s = s + "{:4.0f}     ".format(AFP.CA_parms[c].cruise_speed)
-        console_output.append(s)
-
-        console_output.append("---------------------------------------------------------------")
-
-        s = "Terminal vel [m/s]     "
-        for c in range(5):
-            s = s + "{:4.0f}     ".format(AFP.CA_parms[c].terminal_velocity)
-        console_output.append(s)
-
-        s = "Cruise KE [kJ]       "
-        for c in range(5):
-            s = s + "{:6.0f}   ".format(0.5*AFP.CA_parms[c].mass*AFP.CA_parms[c].cruise_speed*AFP.CA_parms[c].cruise_speed / 1000)
-        console_output.append(s)
+        rows = [("Class                  ", "{:2d} m     ", records.wingspan),
+                ("Frontal area [m2]      ", "{:4.1f}     ", records.ballistic_frontal_area),
+                ("Mass [kg]             ", "{:5d}    ", records.mass),
+                ("Init alt [m]           ", "{:4.0f}     ", records.ballistic_descent_altitude),
+                ("Velocity [m/s]         ", "{:4.0f}     ", records.cruise_speed),
+                None,
+                ("Terminal vel [m/s]     ", "{:4.0f}     ", records.terminal_velocity),
+                ("Cruise KE [kJ]       ", "{:6.0f}   ", records.cruise_KE / 1000),
+                ("Impact velocity [m/s]  ", "{:4.0f}     ", records.ballistic_impact_velocity),
+                ("Impact angle [deg]     ", "{:4.0f}     ", records.ballistic_impact_angle),
+                ("Cof of restitution [-] ", "{:4.2f}     ", records.coefficient_of_restitution),
+                ("Hor distance [m]       ", "{:4.0f}     ", records.ballistic_distance),
+                ("Descent time [s]       ", "{:4.1f}     ", records.ballistic_descent_time),
+                ("Impact KE [kJ]        ", "{:5.0f}    ", records.ballistic_impact_KE / 1000)]
+
+        for row in rows:
+            if row is None:
+                console_output.append("---------------------------------------------------------------")
+            else:
+                console_output.append(row[0] + "".join(row[1].format(v) for v in row[2]))
 
-        s = "Impact velocity [m/s]  "
-        for c in range(5):
-            s = s + "{:4.0f}     ".format(AFP.CA_parms[c].ballistic_impact_velocity)
-        console_output.append(s)
+        return console_output
+    
+    @staticmethod
+    def scenario_computation_records(scenario):
+        """Compute the intermediate values for the three descent scenarios in Annex F :cite:`a-JARUS_AnnexF`.
 
-        s = "Impact angle [deg]     "
-        for c in range(5):
-            s = s + "{:4.0f}     ".format(AFP.CA_parms[c].ballistic_impact_angle)
-        console_output.append(s)
+        There is one record for each of the five columns in the iGRC table.
 
-        s = "Cof of restitution [-] "
-        for c in range(5):
-            s = s + "{:4.2f}     ".format(AnnexFParms.CoR_from_impact_angle(AFP.CA_parms[c].ballistic_impact_angle))
-        console_output.append(s)
+        Parameters
+        ----------
+        scenario : integer
+            Number of scenario, must be either 1, 2, or 3.
 
-        s = "Hor distance [m]       "
-        for c in range(5):
-            s = s + "{:4.0f}     ".format(AFP.CA_parms[c].ballistic_distance)
-        console_output.append(s)
+        Returns
+        -------
+        records : numpy.recarray
+            Records with the fields `wingspan`, `mass`, `cruise_speed`, `impact_angle`, `impact_speed`,
+            `width_with_buffer`, `glide_distance`, `velocity_min_kill`, `horizontal_impact_speed`,
+            `coefficient_of_restitution`, `horizontal_speed_after_impact`, `slide_distance`, `time_safe`,
+            `critical_area`, and `critical_area_reduced`. None if the scenario is not legal.
+        """
+        if scenario != 1 and scenario != 2 and scenario != 3:
+            warnings.warn("Scenario must be either 1,  2, or 3.")
+            return
+        
+        # This setup cannot use a single impact angle, so it will be adjusted below.
+        AFP = AnnexFParms.cached()
+        
+        if scenario == 1:
+            impact_angle = np.full(5, 10.0)
+            impact_speed = AFP.columns.glide_speed
+        elif scenario == 2:
+            impact_angle = np.full(5, 35.0)
+            impact_speed = AFP.columns.cruise_speed
+        else:
+            impact_angle = AFP.columns.ballistic_impact_angle
+            impact_speed = AFP.columns.ballistic_impact_velocity
 
-        s = "Descent time [s]       "
-        for c in range(5):
-            s = s + "{:4.1f}     ".format(AFP.CA_parms[c].ballistic_descent_time)
-        console_output.append(s)
+        CoR = AnnexFParms.CoR_from_impact_angle(impact_angle)
 
-        s = "Impact KE [kJ]        "
+        CA = CriticalAreaModels(AFP.person_radius, AFP.person_height)
+        p = []
         for c in range(5):
-            s = s + "{:5.0f}    ".format(AFP.CA_parms[c].ballistic_impact_KE / 1000)
-        console_output.append(s)
+            # Set CoR since it needs to be set manually in this setup. The aircraft in AFP is shared, so use a copy.
+            aircraft = copy.copy(AFP.CA_parms[c].aircraft)
+            aircraft.set_coefficient_of_restitution(CoR[c])
+            p.append(CA.critical_area(aircraft, impact_speed[c], impact_angle[c]))
+        p = np.array(p)
+
+        horizontal_impact_speed = CA.horizontal_speed_from_angle(impact_angle, impact_speed)
+
+        return AnnexFTables.__records((5,),
+                                      wingspan = [c.wingspan for c in AFP.CA_parms],
+                                      mass = [c.mass for c in AFP.CA_parms],
+                                      cruise_speed = AFP.columns.cruise_speed,
+                                      impact_angle = impact_angle,
+                                      impact_speed = impact_speed,
+                                      width_with_buffer = AFP.columns.wingspan + 0.6,
+                                      glide_distance = p[:, 5],
+                                      velocity_min_kill = p[:, 7],
+                                      horizontal_impact_speed = horizontal_impact_speed,
+                                      coefficient_of_restitution = CoR,
+                                      horizontal_speed_after_impact = horizontal_impact_speed * CoR,
+                                      slide_distance = p[:, 6],
+                                      time_safe = p[:, 8],
+                                      critical_area = p[:, 0],
+                                      critical_area_reduced = p[:, 0] * AnnexFParms.obstacle_reduction_factor)
 
-        return console_output
-    
     @staticmethod
     def scenario_computation_table(scenario):
         """Compute table of intermediate values for the three descent scenarios in Annex F :cite:`a-JARUS_AnnexF`.
         
-        Produces console output.
+        Produces console output. The values are taken from :meth:`scenario_computation_records`.
         
         Parameters
         ----------
@@ -452,115 +738,57 @@ class AnnexFTables:
         
         console_output = []
         
-        if scenario != 1 and scenario != 2 and scenario != 3:
-            warnings.warn("Scenario must be either 1,  2, or 3.")
+        records = AnnexFTables.scenario_computation_records(scenario)
+        if records is None:
             return
-        
-        # This setup cannot use a single impact angle, so it will be adjusted below.
-        AFP = AnnexFParms()
-        
-        impact_speed = [0, 0, 0, 0, 0]
-        impact_angle = [0, 0, 0, 0, 0]
-        for c in range(5):
-            if scenario == 1:
-                impact_angle[c] = 10# if c > 0 else 35
-                impact_speed[c] = AFP.CA_parms[c].glide_speed
-            elif scenario == 2:
-                impact_angle[c] = 35
-                impact_speed[c] = AFP.CA_parms[c].cruise_speed
-            elif scenario == 3:
-                impact_angle[c] = AFP.CA_parms[c].ballistic_impact_angle
-                impact_speed[c] = AFP.CA_parms[c].ballistic_impact_velocity
-
-        CA = CriticalAreaModels(AFP.person_radius, AFP.person_height)
-        p = []
-        for c in range(5):
-            # Set CoR since it needs to be set manually in this setup.
-            AFP.CA_parms[c].aircraft.set_coefficient_of_restitution(AnnexFParms.CoR_from_impact_angle(impact_angle[c]))
-            p.append(CA.critical_area(AFP.CA_parms[c].aircraft, impact_speed[c], impact_angle[c]))
-
 
         console_output.append("Scenario " + str(scenario) + " critical area calculations")
         console_output.append("Row  Variable                                            Values")
         console_output.append("--------------------------------------------------------------------------------")
-        
-        s = " 1    Class                         "
-        for c in range(5):
-            s = s + "{:2d} m      ".format(AFP.CA_parms[c].wingspan)
-        console_output.append(s)
-
-        s = " 2    Mass [kg]                    "
-        for c in range(5):
-            s = s + "{:5d}     ".format(AFP.CA_parms[c].mass)
-        console_output.append(s)
-
-        s = " 3    Cruise speed [m/s]            "
-        for c in range(5):
-            s = s + "{:4.0f}      ".format(AFP.CA_parms[c].cruise_speed)
-        console_output.append(s)
-
-        s = " 4    Impact angle [deg]           "
-        for c in range(5):
-            s = s + "{:5.0f}     ".format(impact_angle[c])
-        console_output.append(s)
-
-        s = " 5    Impact velocity [m/s]        "
-        for c in range(5):
-            s = s + "{:5.0f}     ".format(impact_speed[c])
-        console_output.append(s)
-
-        s = " 6    Aircraft width + buffer [m]   "
-        rD2 = []
-        for c in range(5):
-            rD2.append(AFP.CA_parms[c].wingspan + 0.6)
-            s = s + "{:4.1f}      ".format(rD2[c])
-        console_output.append(s)
-
-        s = " 7    Glide distance [m]            "
-        for c in range(5):
-            s = s + "{:4.0f}      ".format(p[c][5])
-        console_output.append(s)
-
-        s = " 8    Non-lethal speed [m/s]        "
-        for c in range(5):
-            s = s + "{:4.1f}      ".format(p[c][7])
-        console_output.append(s)
-
-        s = " 9    Horz speed at impact [m/s]    "
-        for c in range(5):
-            s = s + "{:4.0f}      ".format(CA.horizontal_speed_from_angle(impact_angle[c], impact_speed[c])) 
-        console_output.append(s)
-
-        s = "10    Coef of resitution [-]        "
-        for c in range(5):
-            s = s + "{:4.2f}      ".format(AnnexFParms.CoR_from_impact_angle(impact_angle[c])) 
-        console_output.append(s)
 
-        s = "11    Horz speed after impact [m/s] "
-        for c in range(5):
-            s = s + "{:4.0f}      ".format(CA.horizontal_speed_from_angle(impact_angle[c], impact_speed[c]) * AnnexFParms.CoR_from_impact_angle(impact_angle[c]))
-        console_output.append(s)
+        rows = [(" 1    Class                         ", "{:2d} m      ", records.wingspan),
+                (" 2    Mass [kg]                    ", "{:5d}     ", records.mass),
+                (" 3    Cruise speed [m/s]            ", "{:4.0f}      ", records.cruise_speed),
+                (" 4    Impact angle [deg]           ", "{:5.0f}     ", records.impact_angle),
+                (" 5    Impact velocity [m/s]        ", "{:5.0f}     ", records.impact_speed),
+                (" 6    Aircraft width + buffer [m]   ", "{:4.1f}      ", records.width_with_buffer),
+                (" 7    Glide distance [m]            ", "{:4.0f}      ", records.glide_distance),
+                (" 8    Non-lethal speed [m/s]        ", "{:4.1f}      ", records.velocity_min_kill),
+                (" 9    Horz speed at impact [m/s]    ", "{:4.0f}      ", records.horizontal_impact_speed),
+                ("10    Coef of resitution [-]        ", "{:4.2f}      ", records.coefficient_of_restitution),
+                ("11    Horz speed after impact [m/s] ", "{:4.0f}      ", records.horizontal_speed_after_impact),
+                ("12    Reduced slide distance [m]    ", "{:4.0f}      ", records.slide_distance),
+                ("13    Time to safe speed [s]        ", "{:4.1f}      ", records.time_safe),
+                ("14    Raw critical area [m2]       ", "{:5.0f}     ", records.critical_area),
+                ("15    CA reduced by 40%  [m2]      ", "{:5.0f}     ", records.critical_area_reduced)]
+
+        for row in rows:
+            console_output.append(row[0] + "".join(row[1].format(v) for v in row[2]))
+        
+        return console_output
 
-        s = "12    Reduced slide distance [m]    "
-        for c in range(5):
-            s = s + "{:4.0f}      ".format(p[c][6])
-        console_output.append(s)
+    @staticmethod
+    def save_records(file, **records):
+        """Save record arrays from this class to a NumPy ``.npz`` file.
 
-        s = "13    Time to safe speed [s]        "
-        for c in range(5):
-            s = s + "{:4.1f}      ".format(p[c][8])
-        console_output.append(s)
+        The records are saved with :func:`numpy.savez`, with each record array stored under its keyword. They can be
+        read again with :func:`numpy.load`, which returns them as structured arrays.
 
-        s = "14    Raw critical area [m2]       "
-        for c in range(5):
-            s = s + "{:5.0f}     ".format(p[c][0])
-        console_output.append(s)
-        
-        s = "15    CA reduced by 40%  [m2]      "
-        for c in range(5):
-            s = s + "{:5.0f}     ".format(p[c][0] * AnnexFParms.obstacle_reduction_factor)
-        console_output.append(s)
-        
-        return console_output
+        Parameters
+        ----------
+        file : str or file
+            File name or file object to save to. The ``.npz`` extension is appended if not present.
+        **records : numpy.recarray
+            The record arrays to save, for instance ``iGRC=AnnexFTables.iGRC_table_records()``.
 
+        Returns
+        -------
+        none.
+        """
+        np.savez(file, **{name: np.asarray(r) for name, r in records.items()})
 
+    @staticmethod
+    def __records(shape, **fields):
+        # Broadcast all fields to the table shape and flatten them into a record array.
+        return np.rec.fromarrays([np.broadcast_to(np.asarray(v), shape).ravel() for v in fields.values()],
+                                 names=list(fields.keys()))
@@ -1,9 +1,9 @@
 """
 This class provide methods for computing critical area for a variety of models.
 """
+import copy
 import math
 import warnings
-from collections.abc import Iterable
 
 import numpy as np
 
@@ -52,7 +52,8 @@ class CriticalAreaModels:
         * `aircraft.width`
         * `aircraft.fuel_quantity`
         
-        This vector is given as ``numpy.array``, and only one of the parameters can be a vector for each call.
+        This vector is given as ``numpy.array``. If more than one of the parameters is a vector, they are combined
+        element by element, so they must have the same length (or shapes that can be broadcast together).
         The return values are then also ``numpy.array`` IF the input parameter that is a ``numpy.array`` is used in the
         computation.
 
@@ -149,9 +150,7 @@ class CriticalAreaModels:
         
         # Special concession on impact angle for below 1 m.
         if isinstance(aircraft.width, np.ndarray):
-            if isinstance(impact_angle, np.ndarray):
-                raise Exception("impact_angle and aircraft.width cannot both be vectors.")
-            impact_angle = np.where(aircraft.width <= 1, max(default_impact_angle, impact_angle), impact_angle)
+            impact_angle = np.where(aircraft.width <= 1, np.maximum(default_impact_angle, impact_angle), impact_angle)
         else:
             if aircraft.width <= 1:
                 if not isinstance(impact_angle, np.ndarray):
@@ -186,8 +185,8 @@ class CriticalAreaModels:
                 else:
                     slide_area = np.full(len(slide_area), 0)
         else:
-            slide_distance_non_lethal[aircraft.width <= 1] = 0
-            slide_area[aircraft.width <= 1] = 0
+            slide_distance_non_lethal = np.where(aircraft.width <= 1, 0, slide_distance_non_lethal)
+            slide_area = np.where(aircraft.width <= 1, 0, slide_area)
 
         # Obstacle reduction is applied to the right variables
         if use_obstacle_reduction:
@@ -220,6 +219,116 @@ class CriticalAreaModels:
                 velocity_min_kill, \
                 t_safe
 
+    def max_impact_speed(self, aircraft, impact_angle, max_critical_area, speed_range = (0, 300), tolerance = 1E-3,
+                         **kwargs):
+        """Compute the largest impact speed that keeps the critical area within a given size.
+
+        This is the inverse of :meth:`critical_area` with respect to the impact speed. Since the critical area increases
+        with the impact speed, it is found by bisection, which is run for all inputs at once. The inputs
+        `impact_angle` and `max_critical_area` may be arrays that can be broadcast together (as can
+        ``aircraft.width``).
+
+        To find the largest impact speed for a target iGRC and population density, use
+        :meth:`AnnexFParms.max_critical_area` for computing `max_critical_area`.
+
+        Parameters
+        ----------
+        aircraft : :class:`casex.AircraftSpecs`
+            Class with information about the aircraft.
+        impact_angle : float or float array
+            [deg] Impact angle relative to ground (90 is vertical, straight down).
+        max_critical_area : float or float array
+            [m^2] The largest allowable critical area.
+        speed_range : tuple of two floats, optional
+            [m/s] The range of impact speeds to search (the default is 0 to 300 m/s).
+        tolerance : float, optional
+            [m/s] The accuracy of the resulting speed (the default is 1E-3 m/s).
+        **kwargs
+            Additional arguments for :meth:`critical_area`, such as `use_obstacle_reduction`.
+
+        Returns
+        -------
+        impact_speed : float or float array
+            [m/s] The largest allowable impact speed. It is the upper end of `speed_range` if the critical area is
+            within the limit in the entire range and NaN if it is not within the limit anywhere in the range.
+        """
+        def CA_from_speed(impact_speed):
+            return self.critical_area(aircraft, impact_speed, impact_angle, **kwargs)[0]
+
+        shape = np.broadcast_shapes(np.shape(impact_angle), np.shape(max_critical_area), np.shape(aircraft.width))
+
+        return CriticalAreaModels.__bisect(CA_from_speed, max_critical_area, speed_range, tolerance, shape)
+
+    def max_width(self, aircraft, impact_speed, impact_angle, max_critical_area, width_range = (0.1, 100),
+                  tolerance = 1E-3, **kwargs):
+        """Compute the largest aircraft width that keeps the critical area within a given size.
+
+        This is the inverse of :meth:`critical_area` with respect to the width of the aircraft. It is found by
+        bisection, which is run for all inputs at once. The inputs `impact_speed`, `impact_angle`, and
+        `max_critical_area` may be arrays that can be broadcast together. The width of `aircraft` is not used, and
+        the aircraft itself is not changed.
+
+        Note that the concessions for aircraft of 1 m or less and the obstacle reduction for aircraft between 1 m and
+        40 m make the critical area jump up just above 1 m and at 40 m. The bisection assumes that the critical area
+        increases with the width, so when a jump crosses `max_critical_area`, the result is 1 m or 40 m.
+
+        To find the largest width for a target iGRC and population density, use
+        :meth:`AnnexFParms.max_critical_area` for computing `max_critical_area`.
+
+        Parameters
+        ----------
+        aircraft : :class:`casex.AircraftSpecs`
+            Class with information about the aircraft.
+        impact_speed : float or float array
+            [m/s] Impact speed of aircraft (this is speed along the velocity vector).
+        impact_angle : float or float array
+            [deg] Impact angle relative to ground (90 is vertical, straight down).
+        max_critical_area : float or float array
+            [m^2] The largest allowable critical area.
+        width_range : tuple of two floats, optional
+            [m] The range of widths to search (the default is 0.1 to 100 m).
+        tolerance : float, optional
+            [m] The accuracy of the resulting width (the default is 1E-3 m).
+        **kwargs
+            Additional arguments for :meth:`critical_area`, such as `use_obstacle_reduction`.
+
+        Returns
+        -------
+        width : float or float array
+            [m] The largest allowable width. It is the upper end of `width_range` if the critical area is within the
+            limit in the entire range and NaN if it is not within the limit anywhere in the range.
+        """
+        # Use a copy, so the width of the aircraft given as input is not changed.
+        aircraft = copy.copy(aircraft)
+
+        def CA_from_width(width):
+            aircraft.width = width
+            return self.critical_area(aircraft, impact_speed, impact_angle, **kwargs)[0]
+
+        shape = np.broadcast_shapes(np.shape(impact_speed), np.shape(impact_angle), np.shape(max_critical_area))
+
+        return CriticalAreaModels.__bisect(CA_from_width, max_critical_area, width_range, tolerance, shape)
+
+    @staticmethod
+    def __bisect(function, target, value_range, tolerance, shape):
+        # Find the largest value in value_range where the increasing function is at most target, for all elements.
+        lower = np.full(shape, value_range[0], dtype=float)
+        upper = np.full(shape, value_range[1], dtype=float)
+
+        below_at_lower = function(lower) <= target
+        below_at_upper = function(upper) <= target
+
+        iterations = max(0, math.ceil(math.log2((value_range[1] - value_range[0]) / tolerance)))
+        for _ in range(iterations):
+            middle = (lower + upper) / 2
+            below = function(middle) <= target
+            lower = np.where(below, middle, lower)
+            upper = np.where(below, upper, middle)
+
+        result = np.where(below_at_upper, value_range[1], np.where(below_at_lower, lower, np.nan))
+
+        return result if result.ndim > 0 else float(result)
+
     @staticmethod
     def slide_distance_friction(velocity, friction_coefficient):
         """Computes slide distance based on initial velocity and friction.
@@ -288,34 +397,37 @@ class CriticalAreaModels:
 
         Parameters
         ----------
-        glide_angle : float
-            [deg] The glide angle to be checked.
+        glide_angle : float or float array
+            [deg] The glide angle to be checked. Arrays of any shape are checked element by element.
 
         Returns
         -------
-        glide_angle : float
+        glide_angle : float or float array
             [deg] The glide angle, which is either the same as the input, or flipped if needed.
         """
+        glide_angle_array = np.asarray(glide_angle, dtype=float)
+
         # glide_angle out of range.
-        if np.any(glide_angle < 0) or np.any(glide_angle > 180):
+        out_of_range = (glide_angle_array < 0) | (glide_angle_array > 180)
+        if np.any(out_of_range):
             warnings.warn("glide_angle is out of valid range (0 to 180). Subsequent computations are not valid.")
-            glide_angle = np.fromiter(map(lambda x: 90 if (x < 0 or x > 180) else x, glide_angle), dtype=np.float)
+            glide_angle_array = np.where(out_of_range, 90, glide_angle_array)
 
         # Flip glide angle.
-        if isinstance(glide_angle, Iterable):
-            glide_angle = np.fromiter(map(lambda x: 180 - x if x > 90 else x, glide_angle), dtype=np.float)
-        else:
-            if glide_angle > 90:
-                glide_angle = 180 - glide_angle
+        glide_angle_array = np.where(glide_angle_array > 90, 180 - glide_angle_array, glide_angle_array)
 
         # If glide_angle is close to zero, we get a division by close to zero, so warn the user.
         # Also avoids an division by zero error.
-        if np.any(glide_angle < 1):
+        if np.any(glide_angle_array < 1):
             warnings.warn("glide_angle is very small, and may produce numerically unstable results."
                           " Glide angle has been set to 1 degree.")
-            glide_angle = np.fromiter(map(lambda x: 1 if x < 1 else x, glide_angle), dtype=np.float)
+            glide_angle_array = np.maximum(glide_angle_array, 1)
+
+        # Keep scalar input scalar.
+        if glide_angle_array.ndim == 0 and not isinstance(glide_angle, np.ndarray):
+            return float(glide_angle_array)
 
-        return glide_angle
+        return glide_angle_array
 
     @staticmethod
     def horizontal_speed_from_angle(impact_angle, impact_speed):
@@ -0,0 +1,271 @@
+"""
+Class for computing the critical area over a map, where each cell has its own ground material and obstacle density.
+"""
+import copy
+import math
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from casex import AnnexFParms, CriticalAreaModels, FrictionCoefficients
+
+
+class CriticalAreaRaster:
+    """This class computes a raster of critical areas for an aircraft over a map.
+
+    The map is given as two co-registered rasters (arrays of the same shape), one with the ground material of each cell
+    as values of :class:`enums.GroundMaterial` and one with the obstacle density in each cell. The ground material
+    gives the friction coefficient of the cell through :meth:`FrictionCoefficients.get_coefficients`, and thereby the
+    slide distance. The critical area is computed with :meth:`CriticalAreaModels.critical_area` without the Annex F
+    obstacle reduction. Instead, the length of the inert part of the critical area is reduced to the expected length
+    when obstacles are present, as found from :meth:`Obstacles.cdf`.
+
+    The CDF for the length of the critical area depends on the obstacle density only through the factor
+    :math:`e^{-\\rho A(x)}`, where :math:`\\rho` is the density. Therefore, the CDF is computed only once at a low
+    reference density, and then rescaled exactly to the density of each cell. The expected reduced length is the
+    integral of one minus the CDF from 0 to the nominal length.
+
+    The raster is processed in square tiles, which are distributed over multiple processes.
+
+    Parameters
+    ----------
+    aircraft : :class:`AircraftSpecs`
+        The aircraft. The friction coefficient of the aircraft is not used, since it is given by the ground material.
+    aircraft_material : :class:`enums.AircraftMaterial`
+        The material of the aircraft, used for the friction coefficient.
+    obstacles : :class:`Obstacles`, optional
+        Obstacles class where the obstacle size distribution is set, for instance by
+        :meth:`Obstacles.generate_rectangular_obstacles_normal_distributed_rotated` (the number of obstacles can be 0).
+        The width of the CA and the number of obstacles in the class are not used. If None, no obstacle reduction
+        is applied (the default is None).
+    buffer : float, optional
+        [m] Radius of a standard person as seen from above (the default is 0.3 m).
+    height : float, optional
+        [m] The altitude above the ground at which the aircraft can first impact a person (the default is 1.8 m).
+    length_resolution : int, optional
+        Number of lengths at which the CDF for the length of the CA is computed (the default is 15).
+    tile_size : int, optional
+        Number of cells along each side of the tiles (the default is 256).
+    max_workers : int, optional
+        Number of processes for the tiles. If 1, all tiles are computed in the calling process. If None, the number of
+        processors is used (the default is None).
+    cdf_parameters : dict, optional
+        Additional arguments for :meth:`Obstacles.cdf`, such as the resolution of the integrals.
+
+    Attributes
+    ----------
+    aircraft : :class:`AircraftSpecs`
+        The aircraft.
+    aircraft_material : :class:`enums.AircraftMaterial`
+        The material of the aircraft.
+    obstacles : :class:`Obstacles`
+        Obstacles class with the obstacle size distribution.
+    CA_model : :class:`CriticalAreaModels`
+        The critical area model.
+    length_resolution : int
+        Number of lengths at which the CDF for the length of the CA is computed.
+    tile_size : int
+        Number of cells along each side of the tiles.
+    max_workers : int
+        Number of processes for the tiles.
+    cdf_parameters : dict
+        Additional arguments for :meth:`Obstacles.cdf`.
+    """
+
+    # The CDF is computed for this density [1/m^2]. It is kept low to preserve precision when rescaling.
+    reference_density = 1E-6
+
+    def __init__(self, aircraft, aircraft_material, obstacles = None, buffer = AnnexFParms.person_radius,
+                 height = AnnexFParms.person_height, length_resolution = 15, tile_size = 256, max_workers = None,
+                 cdf_parameters = None):
+        self.aircraft = aircraft
+        self.aircraft_material = aircraft_material
+        self.obstacles = obstacles
+        self.CA_model = CriticalAreaModels(buffer, height)
+        self.length_resolution = length_resolution
+        self.tile_size = tile_size
+        self.max_workers = max_workers
+        self.cdf_parameters = {} if cdf_parameters is None else cdf_parameters
+
+    def critical_area(self, ground_material, obstacle_density, impact_speed, impact_angle, lethal_kinetic_energy = -1,
+                      critical_areas_overlap = 0):
+        """Compute the critical area for each cell in the map.
+
+        Parameters
+        ----------
+        ground_material : integer array
+            The ground material in each cell as values of :class:`enums.GroundMaterial`. Cells with values that
+            are not a ground material (for instance 0 for no data) give NaN.
+        obstacle_density : float array
+            [1/m^2] The number of obstacles per square meter in each cell. Must have the same shape as
+            `ground_material`.
+        impact_speed : float
+            [m/s] Impact speed of aircraft (this is speed along the velocity vector).
+        impact_angle : float
+            [deg] Impact angle relative to ground (90 is vertical, straight down).
+        lethal_kinetic_energy : float, optional
+            The lethal kinetic energy threshold in J, see :meth:`CriticalAreaModels.critical_area` (the default is -1).
+        critical_areas_overlap : float, optional
+            [0 to 1] Fraction of overlap between the lethal area from glide/slide (after obstacle reduction) and from
+            explosion/deflagration, see :meth:`CriticalAreaModels.critical_area` (the default is 0).
+
+        Returns
+        -------
+        critical_area : float array
+            [m^2] The critical area in each cell. NaN where the friction coefficient is not available for the ground
+            material.
+        """
+        ground_material = np.asarray(ground_material)
+        obstacle_density = np.asarray(obstacle_density, dtype=float)
+        if ground_material.shape != obstacle_density.shape:
+            raise ValueError("ground_material and obstacle_density must have the same shape.")
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            friction = FrictionCoefficients().get_coefficients(self.aircraft_material, ground_material)
+        friction = np.where(friction > 0, friction, np.nan)
+        if np.any(np.isnan(friction)):
+            warnings.warn("Friction coefficient not available for some cells. The critical area is NaN there.")
+
+        # The CDF for the length is computed up to the longest nominal CA, which has the lowest friction.
+        length_range, exposure = None, None
+        if self.obstacles is not None and not np.all(np.isnan(friction)):
+            length_range, exposure = self.__length_exposure(np.nanmin(friction), impact_speed, impact_angle,
+                                                            lethal_kinetic_energy)
+
+        tiles = [(slice(i, i + self.tile_size), slice(j, j + self.tile_size))
+                 for i in range(0, ground_material.shape[0], self.tile_size)
+                 for j in range(0, ground_material.shape[1], self.tile_size)]
+        jobs = [(self.aircraft, self.CA_model, friction[tile], obstacle_density[tile], impact_speed, impact_angle,
+                 lethal_kinetic_energy, critical_areas_overlap, length_range, exposure) for tile in tiles]
+
+        critical_area = np.empty(ground_material.shape)
+        if self.max_workers == 1 or len(jobs) == 1:
+            results = list(map(_critical_area_tile, jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(_critical_area_tile, jobs))
+        for tile, result in zip(tiles, results):
+            critical_area[tile] = result
+
+        return critical_area
+
+    @staticmethod
+    def reduced_length(nominal_length, obstacle_density, length_range, exposure):
+        """Compute the expected length of the CA when obstacles are present.
+
+        This is the expected value of the minimum of the nominal length and the distance to the first obstacle,
+        computed as the integral of one minus the CDF for the length from 0 to the nominal length.
+
+        Parameters
+        ----------
+        nominal_length : float array
+            [m] The nominal length of the CA.
+        obstacle_density : float array
+            [1/m^2] The obstacle density. Must have the same shape as `nominal_length`.
+        length_range : float array
+            [m] The lengths at which the CDF is computed, starting at 0.
+        exposure : float array
+            [m^2] The area :math:`A(x)` at each length, such that the CDF is :math:`1 - e^{-\\rho A(x)}`.
+
+        Returns
+        -------
+        length : float array
+            [m] The expected reduced length.
+        """
+        nominal_length = np.asarray(nominal_length, dtype=float)
+        obstacle_density = np.asarray(obstacle_density, dtype=float)
+
+        # Probability that the CA is longer than each length in length_range.
+        survival = np.exp(-obstacle_density[..., np.newaxis] * exposure)
+        integral = np.concatenate((np.zeros(survival.shape[:-1] + (1,)),
+                                   np.cumsum((survival[..., 1:] + survival[..., :-1]) / 2 * np.diff(length_range),
+                                             axis=-1)), axis=-1)
+
+        # Add the partial trapezoid up to the nominal length.
+        k = np.clip(np.searchsorted(length_range, nominal_length, side='right') - 1, 0, len(length_range) - 2)
+        step = nominal_length - length_range[k]
+        fraction = step / (length_range[k + 1] - length_range[k])
+        survival_k = np.take_along_axis(survival, k[..., np.newaxis], axis=-1)[..., 0]
+        survival_k1 = np.take_along_axis(survival, k[..., np.newaxis] + 1, axis=-1)[..., 0]
+        survival_at_length = survival_k + fraction * (survival_k1 - survival_k)
+
+        return np.take_along_axis(integral, k[..., np.newaxis], axis=-1)[..., 0] + \
+            step * (survival_k + survival_at_length) / 2
+
+    @staticmethod
+    def iGRC(critical_area, pop_density, TLOS=1E-6, use_conservative_compensation = False):
+        """Compute the iGRC for each cell in a critical area raster.
+
+        This uses :meth:`AnnexFParms.iGRC`, but handles cells with no valid critical area or no population.
+
+        Parameters
+        ----------
+        critical_area : float array
+            [m^2] The critical area in each cell, as computed by :meth:`critical_area`.
+        pop_density : float or float array
+            [ppl/km^2] Population density in each cell.
+        TLOS : float, optional
+            [fatalities per flight hour] Target level of safety (the default is 1e-6).
+        use_conservative_compensation: bool, optional
+            if True, the conservative reduction in iGRC value is applied.
+
+        Returns
+        -------
+        iGRC : float array
+            The iGRC in each cell. NaN where the critical area is NaN, and -inf where the population density is 0.
+        raw iGRC : float array
+            The raw iGRC before rounding up.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            raw_iGRC = AnnexFParms.iGRC(np.asarray(pop_density, dtype=float), np.asarray(critical_area, dtype=float),
+                                        TLOS, use_conservative_compensation)[1]
+
+        return np.ceil(raw_iGRC), raw_iGRC
+
+    def __length_exposure(self, friction, impact_speed, impact_angle, lethal_kinetic_energy):
+        # Compute A(x) for the CDF of the length of the CA up to the longest nominal length.
+        aircraft = copy.copy(self.aircraft)
+        aircraft.friction_coefficient = friction
+        CA_inert = self.CA_model.critical_area(aircraft, impact_speed, impact_angle,
+                                               lethal_kinetic_energy=lethal_kinetic_energy,
+                                               use_obstacle_reduction=False)[3]
+        CA_width = aircraft.width + 2 * self.CA_model.buffer
+
+        length_range = np.linspace(0, CA_inert / CA_width, self.length_resolution)
+
+        # A single obstacle in an area of 1 km^2 gives the reference density.
+        obstacles = copy.copy(self.obstacles)
+        obstacles.CA_width = CA_width
+        obstacles.num_of_obstacles = 1
+        obstacles.trial_area_sidelength = 1 / math.sqrt(self.reference_density)
+        p_x = obstacles.cdf(length_range, **self.cdf_parameters)[0]
+
+        return length_range, -np.log1p(-p_x) / self.reference_density
+
+
+def _critical_area_tile(job):
+    # Compute the critical area for one tile. This is a module function, so it can be sent to other processes.
+    aircraft, CA_model, friction, obstacle_density, impact_speed, impact_angle, lethal_kinetic_energy, \
+        critical_areas_overlap, length_range, exposure = job
+
+    aircraft = copy.copy(aircraft)
+    aircraft.friction_coefficient = friction
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        p = CA_model.critical_area(aircraft, impact_speed, impact_angle, lethal_kinetic_energy=lethal_kinetic_energy,
+                                   use_obstacle_reduction=False)
+    CA_inert = np.broadcast_to(p[3], friction.shape)
+
+    if length_range is not None:
+        CA_width = aircraft.width + 2 * CA_model.buffer
+        length = CriticalAreaRaster.reduced_length(CA_inert / CA_width, obstacle_density, length_range, exposure)
+        CA_inert_reduced = length * CA_width
+    else:
+        CA_inert_reduced = CA_inert
+
+    # The overlap is applied to the reduced inert area as in CriticalAreaModels.critical_area.
+    overlapping_area = np.minimum(CA_inert_reduced, p[4]) * critical_areas_overlap
+
+    return CA_inert_reduced + p[4] - overlapping_area
@@ -18,7 +18,23 @@ class ExplosionModels:
     
     The models are all based on TNT equivalent mass, since this is how the literature does it. This means that for any
     of the models it is necessary to convert the fuel amount to a given TNT mass which has the same energy density.
+
+    Attributes
+    ----------
+    TNT_energy_density : float
+        [MJ/kg] The energy density of TNT.
+    fuel_energy_density : float array
+        [MJ/L] The energy density of each fuel type, indexed by the value of :class:`enums.FuelType`. NaN for values
+        that are not a fuel type.
+    fuel_mass_density : float array
+        [kg/L] The mass density of each fuel type, indexed as `fuel_energy_density`.
     """
+    TNT_energy_density = 4.184
+
+    # Indexed by the value of enums.FuelType: -, GASOLINE, DIESEL, JETA1, -, AVGAS, METHANOL, LIFE, LION,
+    # LIQUID_HYDROGEN, LIQUID_BUTANE. The energy density of batteries, hydrogen and butane is per liter.
+    fuel_energy_density = np.array([np.nan, 46.4, 45.6, 43, np.nan, 44.7, 19, 1.8, 0.8, 142, 27.8])
+    fuel_mass_density = np.array([np.nan, 0.75, 0.83, 0.80, np.nan, 0.69, 0.79, 1, 1, 1, 1])
 
     @staticmethod
     def lethal_area_explosion(TNT_mass, K=7.14):
@@ -53,7 +69,7 @@ class ExplosionModels:
                 
         Parameters
         ----------      
-        TNT_mass : float
+        TNT_mass : float or float array
             [kg] Equivalent TNT mass to the explosive material.
             Use :class:`TNT_equivalent_mass` to determine this value.
         K : float, optional
@@ -102,52 +118,68 @@ class ExplosionModels:
         .. note:: The above values are drawn from a variety of sources of unconfirmed reliability. As such,
                   these are the authors' best guesses at appropriate values.
     
+        The values are looked up in `fuel_energy_density` and `fuel_mass_density`, so `type_of_fuel` and
+        `fuel_quantity` can be arrays, which are broadcast together.
+
         Parameters
         ----------
-        type_of_fuel : :class:`enums.FuelType`
-            The type of fuel.
-        fuel_quantity : float
+        type_of_fuel : :class:`enums.FuelType`, integer, or array of these
+            The type of fuel, either as the enum or as the integer value of the enum.
+        fuel_quantity : float or float array
             [L] The amount of fuel.
         
         Returns
         -------
-        TNT_mass : float
+        TNT_mass : float or float array
             [kg] TNT equivalent mass.
+
+        Raises
+        ------
+        ValueError
+            If any of the fuel types is not a valid fuel type.
         """
-        # Energy density in MJ/kg.
-        TNT_energy_density = 4.184
-
-        if type_of_fuel == enums.FuelType.GASOLINE:  # This includes petrol.
-            relative_density = 46.4 / TNT_energy_density
-            kg_per_liter = 0.75
-        elif type_of_fuel == enums.FuelType.DIESEL:
-            relative_density = 45.6 / TNT_energy_density
-            kg_per_liter = 0.83
-        elif type_of_fuel == enums.FuelType.JETA1:
-            relative_density = 43 / TNT_energy_density
-            kg_per_liter = 0.80
-        elif type_of_fuel == enums.FuelType.AVGAS:
-            relative_density = 44.7 / TNT_energy_density
-            kg_per_liter = 0.69
-        elif type_of_fuel == enums.FuelType.METHANOL:
-            relative_density = 19 / TNT_energy_density
-            kg_per_liter = 0.79
-        elif type_of_fuel == enums.FuelType.LIQUID_HYDROGEN:
-            relative_density = 142 / TNT_energy_density  # NOTE: The energy density is per liter.
-            kg_per_liter = 1
-        elif type_of_fuel == enums.FuelType.LIQUID_BUTANE:
-            relative_density = 27.8 / TNT_energy_density  # NOTE: The energy density is per liter.
-            kg_per_liter = 1
-        elif type_of_fuel == enums.FuelType.LIFE:
-            relative_density = 1.8 / TNT_energy_density  # NOTE: The energy density is per liter.
-            kg_per_liter = 1
-        elif type_of_fuel == enums.FuelType.LION:
-            relative_density = 0.8 / TNT_energy_density  # NOTE: The energy density is per liter.
-            kg_per_liter = 1
-        else:
+        index = ExplosionModels.fuel_type_index(type_of_fuel)
+
+        relative_density = ExplosionModels.fuel_energy_density[index] / ExplosionModels.TNT_energy_density
+
+        return relative_density * ExplosionModels.fuel_mass_density[index] * fuel_quantity
+
+    @staticmethod
+    def fuel_type_index(type_of_fuel):
+        """Convert fuel types to indices into the fuel lookup tables.
+
+        The index of a fuel type is the value of its :class:`enums.FuelType`.
+
+        Parameters
+        ----------
+        type_of_fuel : :class:`enums.FuelType`, integer, or array of these
+            The type of fuel, either as the enum or as the integer value of the enum.
+
+        Returns
+        -------
+        index : integer or integer array
+            Index into `fuel_energy_density` and `fuel_mass_density`.
+
+        Raises
+        ------
+        ValueError
+            If any of the fuel types is not a valid fuel type.
+        """
+        if isinstance(type_of_fuel, enums.FuelType):
+            return type_of_fuel.value
+
+        index = np.asarray(type_of_fuel)
+        if index.dtype == object:
+            index = np.vectorize(lambda f: f.value if isinstance(f, enums.FuelType) else -1, otypes=[int])(index)
+
+        if not np.issubdtype(index.dtype, np.integer) or index.dtype == bool:
+            raise ValueError("Invalid fuel type " + str(type_of_fuel))
+
+        valid = (index >= 0) & (index < len(ExplosionModels.fuel_energy_density))
+        if not np.all(valid) or np.any(np.isnan(ExplosionModels.fuel_energy_density[index])):
             raise ValueError("Invalid fuel type " + str(type_of_fuel))
 
-        return relative_density * kg_per_liter * fuel_quantity
+        return index
 
     @staticmethod
     def lethal_area_thermal(TNT_mass, p_lethal):
@@ -160,7 +192,7 @@ class ExplosionModels:
         
         Parameters
         ----------
-        TNT_mass : float
+        TNT_mass : float or float array
             [kg] The equivalent TNT mass for the propellant.
         p_lethal : float
             [-] A number between 0 and 1 indicating the target lethality.
@@ -187,7 +219,7 @@ class ExplosionModels:
         
         Parameters
         ----------
-        TNT_mass : float
+        TNT_mass : float or float array
             [kg] The equivalent TNT mass for the propellant.
 
         Returns
@@ -0,0 +1,215 @@
+"""
+Class for rendering figures headless and in parallel, for instance for regenerating all the Annex F figures.
+"""
+import os
+import sys
+import glob
+import runpy
+import warnings
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+
+
+class FigureRenderer:
+    """This class renders a manifest of figure jobs without showing them, and saves the figures to files.
+
+    A figure job is either a static method of :class:`Figures` or a Python script, such as the examples or
+    `obstacle_paper_figs.py`. Each job is run with the non-interactive Agg backend of matplotlib, so calls to
+    `plt.show()` do nothing. When the job is done, all the figures it left open are saved to the output directory in
+    the requested formats and then closed. Each job runs in its own `matplotlib.rc_context`, so changes to the rcParams
+    (for instance by `plt.style.use`) do not leak into other jobs.
+
+    The jobs are always run in other processes than the calling one, so the backend and the open figures of the
+    caller are not affected. Jobs with the same group are run in order in the same process.
+    By default, the group is the target of the job, so jobs that call the same figure method with different
+    options share the computed arrays that :class:`Figures` caches (such as the CA matrices and the iGRC map).
+
+    Parameters
+    ----------
+    output_dir : str, optional
+        Directory where the figures are saved. It is created if it does not exist (the default is 'figures').
+    max_workers : int, optional
+        Number of processes. If 1, all jobs are run in order in a single process. If None, the number of processors
+        is used (the default is None).
+
+    Attributes
+    ----------
+    output_dir : str
+        Directory where the figures are saved.
+    max_workers : int
+        Number of processes.
+    """
+
+    @dataclass
+    class FigureJob():
+        """A figure job for :class:`FigureRenderer`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the job, which is used for the file names. If the job leaves more than one figure open, the
+            figures are numbered as `name_1`, `name_2`, and so on.
+        target : str
+            Either the name of a static method of :class:`Figures`, such as `'figure_angle_vs_speed'`, or the path
+            to a Python script. Scripts are run with their own directory on the path and with the output directory
+            as working directory, so files they save themselves also end up there.
+        kwargs : dict, optional
+            Keyword arguments for the figure method (not used for scripts).
+        formats : tuple of str, optional
+            The file formats to save, such as `'png'` and `'pdf'` (the default is `('png',)`).
+        rc_params : dict, optional
+            rcParams used for this job only.
+        dpi : int, optional
+            Resolution of raster formats (the default is 300).
+        group : str, optional
+            Jobs with the same group are run in the same process. If None, the target is used (the default is None).
+        """
+        name : str
+        target : str
+        kwargs : dict = field(default_factory=dict)
+        formats : tuple = ('png',)
+        rc_params : dict = field(default_factory=dict)
+        dpi : int = 300
+        group : str = None
+
+    def __init__(self, output_dir = 'figures', max_workers = None):
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+
+    def render(self, jobs):
+        """Render a manifest of figure jobs.
+
+        A job that fails does not stop the other jobs. Instead, a warning is issued with the error.
+
+        Parameters
+        ----------
+        jobs : list of :class:`FigureRenderer.FigureJob`
+            The figure jobs.
+
+        Returns
+        -------
+        files : dict
+            The saved files (list of str) for each job name. Jobs that failed have an empty list.
+        """
+        names = [job.name for job in jobs]
+        if len(set(names)) != len(names):
+            raise ValueError("The names of the figure jobs must be unique.")
+
+        output_dir = os.path.abspath(self.output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Jobs in the same group are run in order by the same process.
+        groups = {}
+        for job in jobs:
+            groups.setdefault(job.target if job.group is None else job.group, []).append(job)
+        batches = [(output_dir, batch) for batch in groups.values()]
+
+        # Switching to the Agg backend closes all figures, so even a single batch is not run in the calling process.
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(_render_batch, batches))
+
+        files = {}
+        for result in results:
+            for name, job_files, error in result:
+                if error is not None:
+                    warnings.warn("Figure job {} failed: {}".format(name, error))
+                files[name] = job_files
+
+        return {name: files[name] for name in names}
+
+    @staticmethod
+    def annex_f_jobs(formats = ('png',)):
+        """Get figure jobs for the Annex F figures in :class:`Figures`, using the settings from example 9.
+
+        Parameters
+        ----------
+        formats : tuple of str, optional
+            The file formats to save (the default is `('png',)`).
+
+        Returns
+        -------
+        jobs : list of :class:`FigureRenderer.FigureJob`
+            The figure jobs.
+        """
+        common = dict(show_x_wingspan = True, show_x_CA_above = True)
+        img1 = dict(show_reduced_CA_axis = False, show_old_quantization = False, show_x_velocity = True,
+                    show_x_CA = True, show_with_obstacles = True, show_additional_grid = False)
+        img2 = dict(show_reduced_CA_axis = True, show_old_quantization = True, show_x_velocity = False,
+                    show_x_CA = False, show_with_obstacles = False, show_descriptors = True)
+
+        return [
+            FigureRenderer.FigureJob('angle_vs_speed', 'figure_angle_vs_speed', formats=formats),
+            FigureRenderer.FigureJob('iGRC_CA_vs_pop_density_img1', 'figure_iGRC_CA_vs_PopDensity',
+                                     dict(filename = '_img1', **common, **img1), formats=formats),
+            FigureRenderer.FigureJob('iGRC_CA_vs_pop_density_img2', 'figure_iGRC_CA_vs_PopDensity',
+                                     dict(filename = '_img2', **common, **img2), formats=formats),
+        ]
+
+    @staticmethod
+    def script_jobs(pattern, formats = ('png',)):
+        """Get a figure job for each script that matches a pattern.
+
+        The name of each job is the file name of the script without extension.
+
+        Parameters
+        ----------
+        pattern : str
+            Glob pattern for the scripts, for instance `'casex/examples/example*.py'`.
+        formats : tuple of str, optional
+            The file formats to save (the default is `('png',)`).
+
+        Returns
+        -------
+        jobs : list of :class:`FigureRenderer.FigureJob`
+            The figure jobs, sorted by name.
+        """
+        return [FigureRenderer.FigureJob(os.path.splitext(os.path.basename(script))[0], script, formats=formats)
+                for script in sorted(glob.glob(pattern))]
+
+
+def _render_batch(batch):
+    # Render a list of figure jobs in order in a worker process. This is a module function, so it can be sent to
+    # other processes.
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    output_dir, jobs = batch
+
+    results = []
+    for job in jobs:
+        plt.close('all')
+        cwd = os.getcwd()
+        try:
+            with matplotlib.rc_context(job.rc_params), warnings.catch_warnings():
+                # Agg is non-interactive, so plt.show() warns and does nothing.
+                warnings.filterwarnings("ignore", message=".*non-interactive.*")
+                os.chdir(output_dir)
+                if job.target.endswith('.py'):
+                    script = os.path.abspath(os.path.join(cwd, job.target))
+                    sys.path.insert(0, os.path.dirname(script))
+                    try:
+                        runpy.run_path(script, run_name='__main__')
+                    finally:
+                        sys.path.remove(os.path.dirname(script))
+                else:
+                    from casex import Figures
+                    getattr(Figures, job.target)(**job.kwargs)
+
+                numbers = plt.get_fignums()
+                files = []
+                for k, number in enumerate(numbers):
+                    name = job.name if len(numbers) == 1 else '{}_{:d}'.format(job.name, k + 1)
+                    for file_format in job.formats:
+                        file = os.path.join(output_dir, '{}.{}'.format(name, file_format))
+                        plt.figure(number).savefig(file, format=file_format, dpi=job.dpi)
+                        files.append(file)
+            results.append((job.name, files, None))
+        except (Exception, SystemExit) as error:
+            # A script may call sys.exit(), which should not stop the other jobs either.
+            results.append((job.name, [], '{}: {}'.format(type(error).__name__, error)))
+        finally:
+            os.chdir(cwd)
+            plt.close('all')
+
+    return results
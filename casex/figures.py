@@ -1,6 +1,7 @@
 """
 Recreates some of the figures in Annex F :cite:`e-JARUS_AnnexF`.
 """
+import functools
 import matplotlib.pyplot as plt
 import numpy as np
 import math
@@ -8,7 +9,7 @@ import math
 # This is used for the colorbar.
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 
-from casex import CriticalAreaModels, AnnexFParms, enums, Obstacles
+from casex import CriticalAreaModels, AnnexFParms, AircraftSpecs, enums, Obstacles
 
 
 class Figures:
@@ -121,7 +122,8 @@ class Figures:
             fig.savefig('Obstacles_critical_area_reduction.png', format='png', dpi=300)
 
     @staticmethod
-    def figure_angle_vs_speed(show_matrix=False, show_contours=False, save_fig=False):
+    def figure_angle_vs_speed(show_matrix=False, show_contours=False, save_fig=False, angle_samples=100,
+                              speed_samples=100):
         """Recreates the figure in Annex F relating impact angles and impact speed for the different size classes.
 
         This method also outputs a variety of computations for the ballistic descent as listed in Annex F Appendix A
@@ -135,26 +137,20 @@ class Figures:
             Set to True to see the CA matrix (the default is False).
         save_fig : bool, optional
             If True save the figure to a PNG (default is False).
+        angle_samples : int, optional
+            Number of impact angles in the CA matrices (default is 100).
+        speed_samples : int, optional
+            Number of impact speeds in the CA matrices (default is 100).
             
         Returns
         -------
         None
         """
-        # Instantiate necessary class.
-        CA = CriticalAreaModels()
-
-        # Sampling density.
-        angle_samples = 100
-        speed_samples = 100
-
         # Plotting range for the impact angle.
         impact_angle = np.linspace(1, 80, angle_samples)
 
-        # Plotting range for the speed for each of the five graphs.
-        speed_plot_range = np.array([50, 70, 120, 250, 300])
-
         # Get the four scenario.
-        AFP = AnnexFParms()
+        AFP = AnnexFParms.cached()
 
         # Contour levels for each plot.
         # Note that the CA target is not included, since it is already listed above (and is plotted in different color).
@@ -183,7 +179,8 @@ class Figures:
             main_color = 'black'
             side_color = 'grey'
 
-        overlap = 0
+        # Speed range and CA matrix for each plot.
+        impact_speeds, CA_matrices = Figures.__angle_vs_speed_CA_matrices(angle_samples, speed_samples)
 
         c = 0
         for j in range(2):
@@ -193,21 +190,10 @@ class Figures:
                 if c > 4:
                     break
 
-                # Speed range for the plot.
-                impact_speed = np.linspace(0, speed_plot_range[c], speed_samples)
-
-                # Initialize CA matrix.
-                CA_matrix = np.zeros((speed_samples, angle_samples))
+                # Speed range and CA matrix for the plot.
+                impact_speed = impact_speeds[c]
+                CA_matrix = CA_matrices[c]
 
-                #obstacle_reduction_factor = AFP.obstacle_reduction_factor if AFP.CA_parms[c].aircraft.width < 40 else 1
-
-                # Compute the CA matrix.
-                for i in range(speed_samples):
-                    impact_speed_i = impact_speed[i]
-
-                    CA_matrix[i, :] = CA.critical_area(AFP.CA_parms[c].aircraft, impact_speed_i, impact_angle,
-                                                       overlap)[0]
-                    
                 # Show the CA matrix.
                 if show_matrix:
                     im = ax[j, k].imshow(np.log(CA_matrix),
@@ -332,22 +318,13 @@ class Figures:
 
         show_old_quantization = show_old_quantization and show_reduced_CA_axis
 
-        # Instantiate the Annex F class. The impact angle is not relevant for this example, so the value is random.
-        #impact_angle = 35
-        AFP = AnnexFParms()
-
         # Let CA span from 1 to 66k (we need to add a bit to the upper limit, so the numerics of the log10 does not
         # exclude the value from the axis).
         CA = np.logspace(math.log10(1), math.log10(66e3 + 100), 500)
         # Let pop_density span from 0.01 to 500k.
         pop_density = np.logspace(math.log10(0.01), math.log10(5e5 + 3000), 500)
 
-        M = np.zeros((len(CA), len(pop_density)))
-
-        for pop_density_i in range(len(pop_density)):
-            for CA_i in range(len(CA)):
-                ORF = AnnexFParms.obstacle_reduction_factor if CA[CA_i] > 8 and CA[CA_i] < 43000 and show_with_obstacles else 1
-                M[pop_density_i][CA_i] = AFP.iGRC(pop_density[pop_density_i], CA[CA_i] * ORF, use_conservative_compensation = True)[0]
+        M = Figures.__iGRC_matrix(CA, pop_density, show_with_obstacles)
 
         fig = plt.figure(figsize=(16, 9))
         ax = plt.axes()
@@ -594,3 +571,42 @@ class Figures:
             return fig
         else:
             plt.show()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def __angle_vs_speed_CA_matrices(angle_samples, speed_samples):
+        # The CA matrices are cached, so figures with the same sampling (for instance with and without the matrix
+        # shown) only compute them once per process.
+        CA = CriticalAreaModels()
+        AFP = AnnexFParms.cached()
+
+        # Plotting range for the impact angle and for the speed for each of the five graphs.
+        impact_angle = np.linspace(1, 80, angle_samples)
+        speed_plot_range = np.array([50, 70, 120, 250, 300])
+        impact_speeds = np.linspace(0, speed_plot_range, speed_samples, axis=1)
+
+        # An aircraft holding all five size classes, so the CA matrices for all classes are computed in one call.
+        # The index order is class, speed, and angle.
+        aircraft = AircraftSpecs(AFP.aircraft_type, AFP.columns.wingspan[:, np.newaxis, np.newaxis],
+                                 AFP.columns.mass[:, np.newaxis, np.newaxis])
+        aircraft.set_friction_coefficient(AFP.friction_coefficient)
+        aircraft.set_coefficient_of_restitution(AFP.columns.coefficient_of_restitution[:, np.newaxis, np.newaxis])
+
+        overlap = 0
+        CA_matrices = CA.critical_area(aircraft, impact_speeds[:, :, np.newaxis], impact_angle[np.newaxis, np.newaxis, :],
+                                       overlap)[0]
+
+        impact_speeds.flags.writeable = False
+        CA_matrices.flags.writeable = False
+        return impact_speeds, CA_matrices
+
+    @staticmethod
+    def __iGRC_matrix(CA, pop_density, use_obstacle_reduction):
+        return Figures.__cached_iGRC_matrix(tuple(CA.tolist()), tuple(pop_density.tolist()), use_obstacle_reduction)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def __cached_iGRC_matrix(CA, pop_density, use_obstacle_reduction):
+        M = AnnexFParms.iGRC_map(np.array(CA), np.array(pop_density), use_obstacle_reduction=use_obstacle_reduction)[0]
+        M.flags.writeable = False
+        return M
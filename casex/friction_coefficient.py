@@ -3,6 +3,8 @@ Friction coefficients between a variety of aircraft materials and ground types.
 """
 import warnings
 
+import numpy as np
+
 from casex.enums import AircraftMaterial, GroundMaterial
 
 
@@ -45,7 +47,23 @@ class FrictionCoefficients:
     
     .. warning:: The friction coefficients provided are guidance only!
                  Ultimate responsibility for correct choice and use of friction coefficient rests with the user!
+
+    Attributes
+    ----------
+    coefficients : float array
+        [-] The table above as a matrix, indexed by the value of :class:`enums.AircraftMaterial` (rows) and the
+        value of :class:`enums.GroundMaterial` (columns). The value is -1 if the coefficient is not available, and
+        row and column 0 are -2, since they are not a material.
     """
+    # Columns are CONCRETE, ASPHALT, GRASS, SAND, SOIL. A value of -1 is to be updated when a coefficient is known.
+    coefficients = np.array([[-2, -2,   -2,   -2,   -2,  -2 ],
+                             [-2, 0.2,  -1,   0.15, -1,  -1 ],  # GLASSFIBER
+                             [-2, -1,   -1,   -1,   -1,  -1 ],  # CARBONFIBER
+                             [-2, 0.4,  -1,   -1,   -1,  -1 ],  # ALUMINUM
+                             [-2, 0.45, -1,   -1,   0.2, 0.4],  # STEEL
+                             [-2, 0.6,  -1,   -1,   -1,  -1 ],  # WOOD
+                             [-2, -1,   -1,   -1,   -1,  -1 ],  # STYROFOAM
+                             [-2, 0.7,  0.9,  0.35, 0.5, -1 ]]) # RUBBER
 
     def get_coefficient(self, aircraft_material, ground_material):
         """Provide friction coefficient for aircraft sliding over ground.
@@ -72,75 +90,58 @@ class FrictionCoefficients:
             return -2
 
         # This returns the appropriate coefficient. It returns -1 if there is no appropriate coefficient.
-        return {
-            GroundMaterial.CONCRETE: self.__on_concrete(aircraft_material),
-            GroundMaterial.ASPHALT: self.__on_asphalt(aircraft_material),
-            GroundMaterial.GRASS: self.__on_grass(aircraft_material),
-            GroundMaterial.SAND: self.__on_sand(aircraft_material),
-            GroundMaterial.SOIL: self.__on_soil(aircraft_material)
-        }.get(ground_material, -2)
+        return float(self.coefficients[aircraft_material.value, ground_material.value])
 
-    @staticmethod
-    def __on_concrete(aircraft_material):
-        # Friction coefficients for various materials against concrete.
-        return {
-            AircraftMaterial.GLASSFIBER: 0.2,
-            AircraftMaterial.CARBONFIBER: -1,        # TODO: To be updated
-            AircraftMaterial.ALUMINUM: 0.4,
-            AircraftMaterial.STEEL: 0.45,
-            AircraftMaterial.WOOD: 0.6,
-            AircraftMaterial.STYROFOAM: -1,          # TODO: To be updated
-            AircraftMaterial.RUBBER: 0.7
-        }.get(aircraft_material, -2)
+    def get_coefficients(self, aircraft_material, ground_material):
+        """Provide friction coefficients for arrays of aircraft and ground materials.
 
-    @staticmethod
-    def __on_asphalt(aircraft_material):
-        # Friction coefficients for various materials against asphalt.
-        return {
-            AircraftMaterial.GLASSFIBER: -1,        # TODO: To be updated
-            AircraftMaterial.CARBONFIBER: -1,       # TODO: To be updated
-            AircraftMaterial.ALUMINUM: -1,          # TODO: To be updated
-            AircraftMaterial.STEEL: -1,             # TODO: To be updated
-            AircraftMaterial.WOOD: -1,              # TODO: To be updated
-            AircraftMaterial.STYROFOAM: -1,         # TODO: To be updated
-            AircraftMaterial.RUBBER: 0.9
-        }.get(aircraft_material, -2)
+        This is the array version of :meth:`get_coefficient`. The materials can be given as enums or as the integer
+        values of the enums (for instance a raster of ground materials), and the two inputs are broadcast together.
 
-    @staticmethod
-    def __on_grass(aircraft_material):
-        # Friction coefficients for various materials against grass.
-        return {
-            AircraftMaterial.GLASSFIBER: 0.15,
-            AircraftMaterial.CARBONFIBER: -1,       # TODO: To be updated
-            AircraftMaterial.ALUMINUM: -1,          # TODO: To be updated
-            AircraftMaterial.STEEL: -1,             # TODO: To be updated
-            AircraftMaterial.WOOD: -1,              # TODO: To be updated
-            AircraftMaterial.STYROFOAM: -1,         # TODO: To be updated
-            AircraftMaterial.RUBBER: 0.35
-        }.get(aircraft_material, -2)
+        Parameters
+        ----------
+        aircraft_material : :class:`enums.AircraftMaterial`, integer, or array of these
+            Type of the aircraft material. Float arrays (as from raster readers) are accepted if all finite values are
+            whole numbers. Non-finite values, such as NaN for no data, are not recognized.
+        ground_material : :class:`enums.GroundMaterial`, integer, or array of these
+            Type of the ground material. Float arrays are accepted as for `aircraft_material`.
 
-    @staticmethod
-    def __on_sand(aircraft_material):
-        # Friction coefficients for various materials against sand.
-        return {
-            AircraftMaterial.GLASSFIBER: -1,        # TODO: To be updated
-            AircraftMaterial.CARBONFIBER: -1,       # TODO: To be updated
-            AircraftMaterial.ALUMINUM: -1,          # TODO: To be updated
-            AircraftMaterial.STEEL: 0.2,
-            AircraftMaterial.WOOD: -1,              # TODO: To be updated
-            AircraftMaterial.STYROFOAM: -1,         # TODO: To be updated
-            AircraftMaterial.RUBBER: 0.5
-        }.get(aircraft_material, -2)
+        Returns
+        -------
+        friction_coefficient : float array
+            The friction coefficient between the aircraft and ground material for each element.
+            The value is -1 where the coefficient is not available (see table above).
+            The value is -2 where either material is not recognized.
+
+        Raises
+        ------
+        ValueError
+            If a material is given as a finite float that is not a whole number.
+        """
+        aircraft_index = FrictionCoefficients.__index(aircraft_material, AircraftMaterial, self.coefficients.shape[0])
+        ground_index = FrictionCoefficients.__index(ground_material, GroundMaterial, self.coefficients.shape[1])
+
+        if np.any(aircraft_index == 0):
+            warnings.warn("aircraft_material is not recognized. Use a material from enums.AircraftMaterial.")
+        if np.any(ground_index == 0):
+            warnings.warn("ground_material is not recognized. Use a material from enums.GroundMaterial.")
+
+        return self.coefficients[aircraft_index, ground_index]
 
     @staticmethod
-    def __on_soil(aircraft_material):
-        # Friction coefficients for various materials against soil.
-        return {
-            AircraftMaterial.GLASSFIBER: -1,        # TODO: To be updated
-            AircraftMaterial.CARBONFIBER: -1,       # TODO: To be updated
-            AircraftMaterial.ALUMINUM: -1,          # TODO: To be updated
-            AircraftMaterial.STEEL: 0.4,
-            AircraftMaterial.WOOD: -1,              # TODO: To be updated
-            AircraftMaterial.STYROFOAM: -1,         # TODO: To be updated
-            AircraftMaterial.RUBBER: -1             # TODO: To be updated
-        }.get(aircraft_material, -2)
+    def __index(material, material_type, size):
+        # Convert materials to indices into the coefficient matrix, where 0 means not recognized.
+        index = np.asarray(material)
+        if index.dtype == object:
+            index = np.vectorize(lambda m: m.value if isinstance(m, material_type) else 0, otypes=[int])(index)
+        elif np.issubdtype(index.dtype, np.floating):
+            # Raster readers usually give floats, which are fine as long as they are whole numbers. Non-finite codes
+            # (such as NaN for no data) are not recognized.
+            finite = np.isfinite(index)
+            if not np.all(np.equal(np.mod(index[finite], 1), 0)):
+                raise ValueError("{} codes must be whole numbers.".format(material_type.__name__))
+            index = np.where(finite, index, 0).astype(int)
+        elif not np.issubdtype(index.dtype, np.integer):
+            return np.zeros(index.shape, dtype=int)
+
+        return np.where((index > 0) & (index < size), index, 0)
@@ -0,0 +1,164 @@
+"""
+Spatial indices for finding the obstacles that may intersect a critical area.
+"""
+import numpy as np
+from shapely.geometry import box
+from shapely.strtree import STRtree
+
+
+class GridIndex:
+    """This class is a uniform grid spatial hash over the bounding boxes of a set of polygons.
+
+    Each polygon is registered in every grid cell that its bounding box overlaps. The cell lists are stored in
+    compressed sparse row (CSR) form, i.e. as one array of polygon indices sorted by cell and an array with the start
+    of each cell in it. When the cell size is near the largest polygon diagonal, as for obstacles of similar size, each
+    polygon is in at most four cells, and a query is a few array lookups. Building and querying is done with NumPy for
+    all polygons and queries at once.
+
+    Parameters
+    ----------
+    bounds : float array
+        [m] The bounding box (xmin, ymin, xmax, ymax) of each polygon as an N x 4 array.
+    cell_size : float, optional
+        [m] The side length of the grid cells. If None, the largest diagonal of the bounding boxes is used (the default
+        is None).
+
+    Attributes
+    ----------
+    bounds : float array
+        [m] The bounding boxes of the polygons.
+    cell_size : float
+        [m] The side length of the grid cells.
+    origin : float array
+        [m] The lower left corner of the grid.
+    shape : tuple of int
+        The number of cells in the x and y direction.
+    cell_start : int array
+        The start of the list for each cell in `cell_items`, with the total number of items appended.
+    cell_items : int array
+        The polygon indices in each cell, sorted by cell.
+    """
+
+    def __init__(self, bounds, cell_size = None):
+        self.bounds = np.asarray(bounds, dtype=float).reshape(-1, 4)
+
+        if cell_size is None:
+            diagonals = np.hypot(self.bounds[:, 2] - self.bounds[:, 0], self.bounds[:, 3] - self.bounds[:, 1])
+            cell_size = np.max(diagonals) if len(diagonals) > 0 else 1
+        if not cell_size > 0:
+            raise ValueError("The cell size must be positive.")
+        self.cell_size = float(cell_size)
+
+        if len(self.bounds) > 0:
+            self.origin = np.min(self.bounds[:, :2], axis=0)
+            self.shape = tuple(int(n) for n in np.floor((np.max(self.bounds[:, 2:], axis=0) - self.origin) /
+                                                        self.cell_size) + 1)
+        else:
+            self.origin = np.zeros(2)
+            self.shape = (1, 1)
+
+        # Register each polygon in all the cells overlapped by its bounding box.
+        polygon, cell = self.__cells(self.bounds)
+        counts = np.bincount(cell, minlength=self.shape[0] * self.shape[1])
+        self.cell_start = np.concatenate(([0], np.cumsum(counts)))
+        self.cell_items = polygon[np.argsort(cell, kind='stable')]
+
+    def query_bounds(self, bounds):
+        """Find the polygons with a bounding box that overlaps each of a number of query boxes.
+
+        Parameters
+        ----------
+        bounds : float array
+            [m] The query boxes (xmin, ymin, xmax, ymax) as a Q x 4 array.
+
+        Returns
+        -------
+        query indices : int array
+            The index of the query box for each overlapping pair, in increasing order.
+        polygon indices : int array
+            The index of the polygon for each overlapping pair (in increasing order for each query box).
+        """
+        bounds = np.asarray(bounds, dtype=float).reshape(-1, 4)
+
+        # Find the cells overlapped by each query box, and then the polygons registered in them.
+        query, cell = self.__cells(bounds)
+        counts = self.cell_start[cell + 1] - self.cell_start[cell]
+        query = np.repeat(query, counts)
+        polygon = self.cell_items[np.arange(np.sum(counts)) -
+                                  np.repeat(np.cumsum(counts) - counts - self.cell_start[cell], counts)]
+
+        # A polygon in multiple cells can be found more than once for the same query.
+        pair = np.unique(query * len(self.bounds) + polygon)
+        query, polygon = pair // max(len(self.bounds), 1), pair % max(len(self.bounds), 1)
+
+        overlap = _boxes_overlap(bounds[query], self.bounds[polygon])
+
+        return query[overlap], polygon[overlap]
+
+    def __cells(self, bounds):
+        # Get the (box index, cell index) pairs for all the grid cells overlapped by each box. Boxes outside the grid
+        # have no cells.
+        low = np.floor((bounds[:, :2] - self.origin) / self.cell_size)
+        high = np.floor((bounds[:, 2:] - self.origin) / self.cell_size)
+        inside = np.all((high >= 0) & (low < self.shape), axis=1)
+        low = np.clip(low, 0, np.array(self.shape) - 1).astype(int)
+        high = np.clip(high, 0, np.array(self.shape) - 1).astype(int)
+
+        size = np.where(inside[:, np.newaxis], high - low + 1, 0)
+        counts = size[:, 0] * size[:, 1]
+        index = np.repeat(np.arange(len(bounds)), counts)
+        k = np.arange(np.sum(counts)) - np.repeat(np.cumsum(counts) - counts, counts)
+        x = low[index, 0] + k // np.maximum(size[index, 1], 1)
+        y = low[index, 1] + k % np.maximum(size[index, 1], 1)
+
+        return index, x * self.shape[1] + y
+
+
+class STRtreeIndex:
+    """This class gives a shapely `STRtree` the same query interface as :class:`GridIndex`.
+
+    Parameters
+    ----------
+    polygons : list of Polygon
+        The polygons in the index.
+
+    Attributes
+    ----------
+    tree : STRtree
+        The tree of the polygons.
+    """
+
+    def __init__(self, polygons):
+        self.tree = STRtree(polygons)
+        self.__index = {id(polygon): k for k, polygon in enumerate(polygons)}
+
+    def query_bounds(self, bounds):
+        """Find the polygons with a bounding box that overlaps each of a number of query boxes.
+
+        The tree is queried for one box at a time.
+
+        Parameters
+        ----------
+        bounds : float array
+            [m] The query boxes (xmin, ymin, xmax, ymax) as a Q x 4 array.
+
+        Returns
+        -------
+        query indices : int array
+            The index of the query box for each overlapping pair, in increasing order.
+        polygon indices : int array
+            The index of the polygon for each overlapping pair (in increasing order for each query box).
+        """
+        # Shapely 1.x returns the polygons and Shapely 2 their indices.
+        pairs = [(q, found if isinstance(found, (int, np.integer)) else self.__index[id(found)])
+                 for q, b in enumerate(np.asarray(bounds, dtype=float).reshape(-1, 4))
+                 for found in self.tree.query(box(*b))]
+        pairs = np.array(sorted(pairs), dtype=int).reshape(-1, 2)
+
+        return pairs[:, 0], pairs[:, 1]
+
+
+def _boxes_overlap(bounds_A, bounds_B):
+    # Test if pairs of boxes overlap (or touch).
+    return (bounds_A[:, 0] <= bounds_B[:, 2]) & (bounds_B[:, 0] <= bounds_A[:, 2]) & \
+           (bounds_A[:, 1] <= bounds_B[:, 3]) & (bounds_B[:, 1] <= bounds_A[:, 3])
@@ -43,6 +43,11 @@ def obstacle_simulation(CA_width,
                         show_legends = True,
                         show_pdf_density_functions = False,
                         hide_title_axis_names = False,
+                        use_collections = True,
+                        cull_to_viewport = False,
+                        periodic_boundary = False,
+                        CA_sampling = None,
+                        CDF_quadrature = None,
                         force_fixed_obstacle_orientation_in_CDF = False,
                         do_houses_along_roads = False,
                         viz_obstacle_zoom = None,
@@ -83,7 +88,8 @@ def obstacle_simulation(CA_width,
     if force_fixed_obstacle_orientation_in_CDF:
         OS.set_obstacle_orientation(Obstacles.DistributionType.FIXED, loc = 0, scale = 1)
 
-    OS.generate_CAs(trials_count)
+    OS.set_periodic_boundary(periodic_boundary)
+    OS.generate_CAs(trials_count, CA_sampling)
     print('{:1.1f} sec'.format(time.time() - gen_polygons_time), flush=True)
 
     # Run trials.
@@ -114,7 +120,6 @@ def obstacle_simulation(CA_width,
         print('Not computed')
 
     # Compute the probability based on theory.
-    print('Theory time:              ', end='\r', flush=True)
     if do_model_CDF:
         theory_time = time.time()
         x = np.linspace(0, CA_length, CDF_x_resolution)
@@ -135,13 +140,13 @@ def obstacle_simulation(CA_width,
                                                                  CA_orientation_resolution = CA_orientation_resolution, 
                                                                  obstacle_orientation_resolution = obstacle_orientation_resolution,
                                                                  ignore_obstacle_orientation = force_fixed_obstacle_orientation_in_CDF,
-                                                                 show_progress = True)
+                                                                 quadrature = CDF_quadrature)
         print('Theory time:              {:1.1f} sec'.format(time.time() - theory_time), flush=True)
 
         if compute_coverage:
             beta_numerical = OS.total_coverage / OS.trial_area_sidelength / OS.trial_area_sidelength
     else:
-        print('Not computed')
+        print('Theory time:              Not computed')
 
     # Create figure for visual output.
     print('Visualization time:       ', end='', flush=True)
@@ -166,6 +171,14 @@ def obstacle_simulation(CA_width,
             ax2 = fig.add_subplot(111)
 
         if visualize_obstacles:
+            # Only draw the obstacles and CAs that are visible in the zoomed view.
+            viewport = None
+            if cull_to_viewport:
+                if set_obstacles_viewport is not None:
+                    viewport = set_obstacles_viewport
+                elif viz_obstacle_zoom is not None:
+                    viewport = list(viz_obstacle_zoom[0]) + list(viz_obstacle_zoom[1])
+
             OS.show_simulation(ax1, 
                                problematic_obstacles = problematic_obstacles,
                                problematic_CAs = problematic_CAs,
@@ -174,7 +187,9 @@ def obstacle_simulation(CA_width,
                                show_obstacles = show_obstacles,
                                show_obstacles_intersected = show_obstacles_intersected, 
                                show_CA_first_point = show_CA_first_point,
-                               show_legends = show_legends)
+                               show_legends = show_legends,
+                               use_collections = use_collections,
+                               viewport = viewport)
 
             # If there is request for zoom in this axis.
             if viz_obstacle_zoom is not None:
@@ -199,6 +214,7 @@ def obstacle_simulation(CA_width,
     print('Original CA:              {:1.0f} m^2'.format(OS.CA_length * OS.CA_width))
     print('Average reduced CA:       {:1.1f} m^2 ({:d}%)'.format(np.mean(OS.CA_lengths) * OS.CA_width, int(
         round(100 * np.mean(OS.CA_lengths) / OS.CA_length))))
+    print('Standard error:           {:1.2f} m^2'.format(OS.CA_length_standard_error()[1] * OS.CA_width))
     if do_model_CDF:
         print('Analytical reduced CA     {:1.1f} m^2'.format(EX * OS.CA_width))
     else:
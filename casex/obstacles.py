@@ -1,21 +1,32 @@
 """
 Support both computation and simulation of the reduction of critical area.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, astuple
 import math
 #from os import waitid_result
 import warnings
 
-import matplotlib.pyplot as plt
 import numpy as np
 import scipy.stats as stats
-from scipy import interpolate
-from descartes.patch import PolygonPatch
 from shapely import affinity
 from shapely.geometry import Polygon, Point, MultiPoint, LineString
-from shapely.strtree import STRtree
 from enum import Enum
 
+from casex.obstacle_index import GridIndex, STRtreeIndex
+
+# Quasi-Monte Carlo sampling is only in SciPy 1.7 and newer.
+try:
+    from scipy.stats import qmc
+except ImportError:
+    qmc = None
+
+# A shared WKB writer is much faster than the wkb property in Shapely 1.x, which makes a new writer for each geometry.
+try:
+    from shapely.geos import WKBWriter, lgeos
+    _wkb_writer = WKBWriter(lgeos)
+except ImportError:
+    _wkb_writer = None
+
 
 class Obstacles:
     """This class has methods for computing the theoretical reduction in the size of the
@@ -43,9 +54,27 @@ class Obstacles:
     CA_cut_off_coords : List of Point
         Coordinates of CAs where they are cut off as a result of impact with an obstacle.
     obstacles_rtree : STRtree
-        Intermediate variables for increasing computations speed. 
+        Intermediate variables for increasing computations speed. Only set when the index type is STRTREE.
+    index_type : IndexType
+        The type of spatial index used for finding obstacles that may intersect a CA, see :meth:`set_index_type`.
+    periodic_boundary : bool
+        If True, the trial area wraps around at the edges, see :meth:`set_periodic_boundary`.
+    indexed_obstacles : List of Polygon
+        The obstacles in the spatial index. This is the same as `obstacles`, except in periodic mode, where the copies
+        of the obstacles near the edges that wrap around are appended.
+    CA_centers : float array
+        [m] The center of every CA as an N x 2 array.
+    CA_headings : float array
+        [deg] The heading of every CA.
+    CA_sampling : SamplingType
+        The sampling used for the most recent call to :meth:`generate_CAs`.
+    CA_sample_groups : int array
+        The sample group of every CA, which is used by the standard error estimators, see :meth:`generate_CAs`.
     CA_lengths : Array of floats
         List of the length of every CA after reduction
+    CA_contact_distances : float array
+        [m] The distance from the beginning of every CA to the first obstacle it hits, or infinity if it does not hit
+        any obstacle within its length, see :meth:`reduced_CA_lengths`.
     total_obstacle_area : float
         [m^2] The total area of all obstacles not considering any overlap (sum of the area of every obstacle).
     total_coverage : float
@@ -76,6 +105,21 @@ class Obstacles:
         UNIFORM = 2
         NORM = 3
 
+    class IndexType(Enum):
+        STRTREE = 1
+        GRID = 2
+
+    class QuadratureType(Enum):
+        RECTANGLE = 1
+        GAUSS = 2
+
+    class SamplingType(Enum):
+        IID = 1
+        STRATIFIED = 2
+        ANTITHETIC = 3
+        LATIN_HYPERCUBE = 4
+        SOBOL = 5
+
     @dataclass
     class DistributionParameters():
         distribution_type : "DistributionType"
@@ -106,10 +150,26 @@ class Obstacles:
         self.CA_cut_off_coords = None
         self.obstacles_rtree = None
         self.CA_lengths = None
+        self.CA_contact_distances = None
+        self.__reduced_CA_mask = np.zeros(0, dtype=bool)
         self.total_obstacle_area = None
         self.total_coverage = None
         self.ObstacleSizes = None
         self.obstacle_orientation_parameters = Obstacles.DistributionParameters(Obstacles.DistributionType.FIXED)
+        self.index_type = Obstacles.IndexType.GRID
+        self.index_cell_size = None
+        self.periodic_boundary = False
+        self.indexed_obstacles = None
+        self.CA_centers = np.zeros((0, 2))
+        self.CA_headings = np.zeros(0)
+        self.CA_sampling = Obstacles.SamplingType.IID
+        self.CA_sample_groups = np.zeros(0, dtype=int)
+        self.__index = None
+        self.__indexed_obstacles = None
+        self.__indexed_count = 0
+        self.__indexed_settings = None
+        self.__indexed_margin = 0
+        self.__cdf_accumulator_cache = None
 
 
         self.obstacles = []
@@ -178,6 +238,23 @@ class Obstacles:
             obs = [(0, 0), (length[k], 0), (length[k], width[k]), (0, width[k]), (0, 0)]
             self.obstacles.append(affinity.translate(affinity.rotate(Polygon(obs), angle[k], 'center'), trans_x[k], trans_y[k]))
 
+    def __ghost_obstacles(self, bounds, margin):
+        # Copies of the obstacles that are within reach (margin) of a CA across an edge of the trial area, shifted by
+        # the side length in x, y, or both.
+        side = self.trial_area_sidelength
+
+        ghosts = []
+        ghost_bounds = []
+        for dx, near_x in ((-side, bounds[:, 2] > side - margin), (0, True), (side, bounds[:, 0] < margin)):
+            for dy, near_y in ((-side, bounds[:, 3] > side - margin), (0, True), (side, bounds[:, 1] < margin)):
+                if dx == 0 and dy == 0:
+                    continue
+                for k in np.flatnonzero(near_x & near_y):
+                    ghosts.append(affinity.translate(self.obstacles[k], dx, dy))
+                    ghost_bounds.append(bounds[k] + np.array([dx, dy, dx, dy]))
+
+        return ghosts, np.array(ghost_bounds).reshape(-1, 4)
+
     def set_obstacle_orientation(self, orientation_distribution_type, loc = 0, scale = 1):
         if not isinstance(orientation_distribution_type, Obstacles.DistributionType):
             warnings.warn("orientation_distribution_type not recognized. Set to FIXED.")
@@ -185,6 +262,99 @@ class Obstacles:
 
         self.obstacle_orientation_parameters = Obstacles.DistributionParameters(orientation_distribution_type, loc, scale)
 
+    def set_index_type(self, index_type, cell_size = None):
+        """Set the type of spatial index used for finding the obstacles that may intersect a CA.
+
+        The index is built when first needed, and is then reused until the obstacles are generated again.
+
+        Parameters
+        ----------
+        index_type : IndexType
+            GRID for a uniform grid hash (:class:`GridIndex`), which is fast for obstacles of similar size, or STRTREE
+            for a shapely STRtree (:class:`STRtreeIndex`).
+        cell_size : float, optional
+            [m] The cell size for the GRID index. If None, the largest obstacle diagonal is used (the default is None).
+
+        Returns
+        -------
+        None
+        """
+        self.index_type = index_type
+        self.index_cell_size = cell_size
+        self.__index = None
+
+    def set_periodic_boundary(self, periodic_boundary = True):
+        """Set whether the trial area wraps around at the edges.
+
+        Without periodic boundary, the CAs are kept away from the edges of the trial area, so they do not stick out
+        of it, where there are no obstacles. This means that obstacles near the edges are hit by fewer CAs.
+
+        With periodic boundary, the trial area is a torus. The obstacles near an edge are also placed just outside
+        the opposite edge (see `indexed_obstacles`), so a CA that sticks out of the trial area hits them, and the CAs
+        can be anywhere in the trial area. Every obstacle then contributes equally to the simulation, which makes a
+        smaller trial area give the same accuracy.
+
+        This must be set before calling :meth:`generate_CAs`.
+
+        Parameters
+        ----------
+        periodic_boundary : bool, optional
+            If True, the trial area wraps around at the edges (the default is True).
+
+        Returns
+        -------
+        None
+        """
+        self.periodic_boundary = periodic_boundary
+
+    def get_obstacles_index(self):
+        """Get the spatial index of the obstacles.
+
+        The index is cached, and only rebuilt if the obstacles or the index type have changed. In periodic mode, it is
+        also rebuilt if the CA size has grown, so more obstacles are within reach across the edges.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        index : :class:`GridIndex` or :class:`STRtreeIndex`
+            The index of `indexed_obstacles`. Its `query_bounds` method finds the obstacles that may intersect a
+            number of bounding boxes.
+        """
+        settings = (self.index_type, self.index_cell_size, self.periodic_boundary, self.trial_area_sidelength)
+
+        # The reach of a CA across the edges is its half diagonal, since the center of a CA is in the trial area.
+        margin = math.hypot(self.CA_width, self.CA_length) / 2 if self.periodic_boundary else 0
+
+        if self.__index is None or self.__indexed_obstacles is not self.obstacles or \
+                self.__indexed_count != len(self.obstacles) or self.__indexed_settings != settings or \
+                margin > self.__indexed_margin:
+            obstacles = self.obstacles
+            bounds = Obstacles.__vertex_bounds([Obstacles.__exterior_vertices(o) for o in self.obstacles])
+            if self.periodic_boundary:
+                ghosts, ghost_bounds = self.__ghost_obstacles(bounds, margin)
+                obstacles = obstacles + ghosts
+                bounds = np.concatenate((bounds, ghost_bounds))
+
+            if self.index_type == Obstacles.IndexType.GRID:
+                self.__index = GridIndex(bounds, self.index_cell_size)
+                self.obstacles_rtree = None
+            elif self.index_type == Obstacles.IndexType.STRTREE:
+                self.__index = STRtreeIndex(obstacles)
+                self.obstacles_rtree = self.__index.tree
+            else:
+                raise ValueError("Invalid index type {}".format(self.index_type))
+            self.indexed_obstacles = obstacles
+
+            # Keep a reference to the list of obstacles, so a new list (or a changed length) is detected.
+            self.__indexed_obstacles = self.obstacles
+            self.__indexed_count = len(self.obstacles)
+            self.__indexed_settings = settings
+            self.__indexed_margin = margin
+
+        return self.__index
+
     def generate_rectangular_obstacles_along_curves(self, width_mu, width_sigma, length_mu, length_sigma,
                                                     houses_along_street, rows_of_houses, distance_between_two_houses):
         """Generate a set of obstacles that follows a curve.
@@ -217,6 +387,8 @@ class Obstacles:
         -------
         None
         """
+        from scipy import interpolate
+
         self.ObstacleSizes = Obstacles.ObstaclesSizeProperties(width_mu, width_sigma, length_mu, length_sigma)
 
         # Number of rows of houses per side length. This is expanded to cover the entire area
@@ -263,46 +435,146 @@ class Obstacles:
 
         self.num_of_obstacles = len(self.obstacles)
 
-    def generate_CAs(self, trials_count):
+    def generate_CAs(self, trials_count, sampling = None, replicates = 10):
         """Generate a number of critical areas for simulation.
         
         A number of critical areas are generated with 2D uniformly distributed location and uniformly distributed
         orientation between 0 and 360 degrees. They are have the width and length as set at initialization of the class.
+        The location is the center of the CA. Unless the trial area is periodic (see :meth:`set_periodic_boundary`),
+        the CAs are kept away from the edges of the trial area.
+
+        The heading and location can be drawn with one of the following types of sampling. All of them give unbiased
+        estimates of the mean reduced CA length and of the CDF, but all except `IID` have a smaller variance for the
+        same number of trials.
+
+        * `IID`: Independent samples (as drawn by `scipy.stats.uniform.rvs`).
+        * `STRATIFIED`: The heading is stratified, so each of a number of equal heading intervals contains exactly one
+          CA. The location is independent.
+        * `ANTITHETIC`: The CAs come in pairs, where the second has the antithetic heading and location (`1 - u`
+          instead of the uniform sample `u`), i.e. it has the mirrored heading (-theta), and its center is mirrored
+          through the center of the trial area.
+        * `LATIN_HYPERCUBE`: Latin hypercube sampling of heading and location.
+        * `SOBOL`: Scrambled Sobol sequence for heading and location (requires `scipy.stats.qmc`).
+
+        To estimate the variance, the CAs are divided into sample groups, which are independent of each other (see
+        :meth:`CA_length_standard_error` and :meth:`CDF_standard_error`). For `IID` each CA is a group, and for
+        `ANTITHETIC` each pair is a group. For the other types, the trials are split into a number of replicates, which
+        are each sampled independently.
 
         Parameters
         ----------
         trials_count : int
             Number of trials to perform.
+        sampling : SamplingType, optional
+            The type of sampling. If None, `IID` is used (the default is None).
+        replicates : int, optional
+            Number of independent replicates for `STRATIFIED`, `LATIN_HYPERCUBE`, and `SOBOL`. At least two are needed
+            for estimating the variance (the default is 10).
 
         Returns
         -------
         None
         """
+        if sampling is None:
+            sampling = Obstacles.SamplingType.IID
+        if not isinstance(sampling, Obstacles.SamplingType):
+            raise ValueError("The sampling must be an Obstacles.SamplingType.")
+
         self.trials_count = trials_count
+        self.CA_sampling = sampling
 
-        # Compute reduction in the translation of the original CA. Since rotation is around the center,
-        # the compensation is half the longest length of the CA.
-        CA_compensate = np.amax([self.CA_width, self.CA_length]) / 2
+        if self.periodic_boundary:
+            # The obstacles wrap around the edges, so the CAs can be anywhere in the trial area.
+            CA_compensate = 0
+        else:
+            # Compute reduction in the translation of the original CA. Since rotation is around the center,
+            # the compensation is half the longest length of the CA.
+            CA_compensate = np.amax([self.CA_width, self.CA_length]) / 2
+
+        if sampling == Obstacles.SamplingType.IID:
+            # Uniformly distributed heading from 0 to 360 degrees.
+            heading = stats.uniform.rvs(size=self.trials_count, loc=0, scale=360)
+
+            # Uniformly distributed position of the center of the CA.
+            # We need to compensate for any CAs sticking out of the trial area, and thus cannot intersect obstacles.
+            # We do this crudely by forcing the CAs to be sufficiently far from the edge of the trial area.
+            CA_center_x = stats.uniform.rvs(size=self.trials_count, loc=CA_compensate,
+                                            scale=self.trial_area_sidelength - 2 * CA_compensate)
+            CA_center_y = stats.uniform.rvs(size=self.trials_count, loc=CA_compensate,
+                                            scale=self.trial_area_sidelength - 2 * CA_compensate)
+
+            groups = np.arange(self.trials_count)
+        else:
+            # Samples in the unit cube for heading, x and y, which are scaled as for IID.
+            u, groups = Obstacles.__unit_samples(self.trials_count, sampling, replicates)
+            heading = 360 * u[:, 0]
+            CA_center_x = CA_compensate + (self.trial_area_sidelength - 2 * CA_compensate) * u[:, 1]
+            CA_center_y = CA_compensate + (self.trial_area_sidelength - 2 * CA_compensate) * u[:, 2]
 
-        # Uniformly distributed heading from 0 to 180 degrees.
-        heading = stats.uniform.rvs(size=self.trials_count, loc=0, scale=360)
+        # The CAs are appended to any existing CAs, so the new groups are numbered after the existing ones.
+        offset = np.max(self.CA_sample_groups) + 1 if len(self.CA_sample_groups) > 0 else 0
+        self.CA_sample_groups = np.concatenate((self.CA_sample_groups, offset + groups)).astype(int)
 
-        # Uniformly distributed translation from 0 to trial_area_sidelength.
-        # We need to compensate for any CAs sticking out of the trial area, and thus cannot intersect obstacles.
-        # We do this crudely by forcing the CAs to be sufficiently far from the edge of the trial area.
-        CA_trans_x = stats.uniform.rvs(size=self.trials_count, loc=CA_compensate,
-                                       scale=self.trial_area_sidelength - 2 * CA_compensate)
-        CA_trans_y = stats.uniform.rvs(size=self.trials_count, loc=0,
-                                       scale=self.trial_area_sidelength - 2 * CA_compensate)
+        CA_centers = np.column_stack((CA_center_x, CA_center_y))
+        self.CA_centers = np.concatenate((self.CA_centers, CA_centers))
+        self.CA_headings = np.concatenate((self.CA_headings, heading))
 
-        CA_coor = [(0, 0), (self.CA_width, 0), (self.CA_width, self.CA_length), (0, self.CA_length), (0, 0)]
+        self.CAs.extend(self.__CA_polygons(CA_centers, heading, self.CA_width, self.CA_length))
+
+    @staticmethod
+    def __CA_polygons(centers, headings, CA_width, CA_length):
+        # Make the CA polygons with the given centers and headings.
+        CA_coor = [(0, 0), (CA_width, 0), (CA_width, CA_length), (0, CA_length), (0, 0)]
 
-        for j in range(0, self.trials_count):
-            # Rotate and move CA.
-            CA_polygon = affinity.translate(affinity.rotate(Polygon(CA_coor), heading[j], 'center'), CA_trans_x[j],
-                                            CA_trans_y[j])
+        CA_polygons = []
+        for (center_x, center_y), heading in zip(centers, headings):
+            # Rotate and move CA, so the center is at the drawn position.
+            CA_polygons.append(affinity.translate(affinity.rotate(Polygon(CA_coor), heading, 'center'),
+                                                  center_x - CA_width / 2, center_y - CA_length / 2))
 
-            self.CAs.append(CA_polygon)
+        return CA_polygons
+
+    def CA_width_sweep(self, CA_widths, show_progress = False):
+        """Simulate the reduction of the CAs for a number of CA widths with the same obstacles and CAs.
+
+        For each width, the CAs are made with the centers and headings drawn by :meth:`generate_CAs`, and then reduced
+        and measured as by :meth:`compute_reduced_CAs` and :meth:`compute_CA_lengths`. Since the obstacles, the spatial
+        index, and the CA locations are shared, the results for the different widths are directly comparable (common
+        random numbers), and only the reduction itself is repeated.
+
+        To keep all CAs away from the edges of a non-periodic trial area, the CAs should be generated with the widest
+        CA width. After the sweep, `CA_width` is the last width, and the CAs, reduced CAs and CA lengths are those of
+        the last width.
+
+        Parameters
+        ----------
+        CA_widths : float array
+            [m] The CA widths.
+        show_progress : bool, optional
+            If True, the progress of each reduction is shown (the default is False).
+
+        Returns
+        -------
+        reduced lengths : float array
+            [m] The reduced length of every CA (along the last axis) for each width.
+        """
+        CA_widths = np.atleast_1d(np.asarray(CA_widths, dtype=float))
+
+        # Build the index once, with room for the widest CA in periodic mode.
+        CA_width = self.CA_width
+        self.CA_width = max(np.max(CA_widths), CA_width)
+        self.get_obstacles_index()
+        self.CA_width = CA_width
+
+        CA_lengths = np.empty((len(CA_widths), len(self.CA_headings)))
+        for k, width in enumerate(CA_widths):
+            self.CA_width = width
+            self.CAs = self.__CA_polygons(self.CA_centers, self.CA_headings, self.CA_width, self.CA_length)
+            self.compute_reduced_CAs(show_progress)
+            self.compute_CA_lengths()
+            CA_lengths[k] = self.CA_lengths
+
+        return CA_lengths
 
     def compute_reduced_CAs(self, show_progress = False):
         """Compute the reduction for each CA
@@ -322,9 +594,13 @@ class Obstacles:
         self.closest = []
         self.CA_cut_off_coords = []
         self.num_of_empty_CA = 0
+        self.num_of_reduced_CA = 0
 
-        # Create STRtree for faster intersection detection.
-        self.obstacles_rtree = STRtree(self.obstacles)
+        # Find the potentially intersecting obstacles for all CAs at once. The pairs are sorted by CA, so the
+        # candidates for each CA are a contiguous range.
+        CA_candidates, obstacle_candidates = self.get_obstacles_index().query_bounds(
+            Obstacles.__vertex_bounds([Obstacles.__exterior_vertices(CA) for CA in self.CAs]))
+        candidates_start = np.searchsorted(CA_candidates, np.arange(len(self.CAs) + 1))
 
         # Keep track of reduced obstacles.
         reduced_CA_idxs = []
@@ -337,7 +613,9 @@ class Obstacles:
             CA_original_coords = MultiPoint(CA_polygon.exterior.coords)
 
             # Get a short list of potentially intersecting obstacles.
-            potentially_intersecting_obstacles = self.obstacles_rtree.query(CA_polygon)
+            potentially_intersecting_obstacles = [self.indexed_obstacles[k] for k in
+                                                  obstacle_candidates[candidates_start[CA_idx]:
+                                                                      candidates_start[CA_idx + 1]]]
 
             # Iterate over those potential obstacles.
             for idx, obstacle in enumerate(potentially_intersecting_obstacles):
@@ -398,6 +676,10 @@ class Obstacles:
             # Add the resulting CA polygon to the list of reduced CAs.
             self.CAs_reduced.append(CA_polygon)
 
+        # Remember which CAs hit an obstacle for the contact distances.
+        self.__reduced_CA_mask = np.zeros(len(self.CAs), dtype=bool)
+        self.__reduced_CA_mask[reduced_CA_idxs] = True
+
     def __cut_polygon_to_rectangle(self, CA_polygon, CA_original_coords):
         """
         Create a rectangular polygon that has the same beginning side as the original CA polygon.
@@ -504,6 +786,141 @@ class Obstacles:
         if not count_empties == self.num_of_empty_CA:
             warning("Sanity check failed for number of empty CAs.")
 
+        # CAs that did not hit anything would first hit an obstacle somewhere beyond their length.
+        self.CA_contact_distances = np.where(self.__reduced_CA_mask, self.CA_lengths, np.inf)
+
+    def reduced_CA_lengths(self, nominal_lengths):
+        """Get the reduced length of the simulated CAs for a number of shorter nominal CA lengths.
+
+        The reduced length of a CA is the distance from its beginning to the first obstacle it hits, but at most the
+        nominal length. A shorter CA with the same beginning and heading therefore hits the same first obstacle if
+        it is long enough, and otherwise is not reduced at all. So, the reduced lengths for any nominal length up to
+        `CA_length` follow from the contact distances found in one simulation with `CA_length` as the longest length,
+        without rerunning :meth:`compute_reduced_CAs`. This must be called after :meth:`compute_CA_lengths`.
+
+        The CA centers drawn by :meth:`generate_CAs` are for the longest length, so the beginnings of the shorter CAs
+        are uniformly distributed in the same way, except that they are kept slightly further from the edges of a
+        non-periodic trial area. The sample groups for the standard error are the same for all lengths.
+
+        Parameters
+        ----------
+        nominal_lengths : float or float array
+            [m] The nominal CA length(s). They cannot be longer than `CA_length`.
+
+        Returns
+        -------
+        reduced lengths : float array
+            [m] The reduced length of every CA for each nominal length, with the CAs along the last axis.
+        """
+        if self.CA_contact_distances is None:
+            raise ValueError("The CA lengths must be computed before the reduced lengths for other nominal lengths.")
+        if np.any(np.asarray(nominal_lengths) > self.CA_length):
+            raise ValueError("The nominal lengths cannot be longer than the simulated CA length.")
+
+        return np.minimum(self.CA_contact_distances, np.asarray(nominal_lengths, dtype=float)[..., np.newaxis])
+
+    def CA_length_standard_error(self):
+        """Estimate the mean reduced CA length and its standard error.
+
+        The standard error is computed from the mean of each sample group, see :meth:`generate_CAs`, so it accounts
+        for the variance reduction of the sampling type. This must be called after :meth:`compute_CA_lengths`.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        mean : float
+            [m] The mean reduced CA length.
+        standard error : float
+            [m] The standard error of the mean. It is NaN if there are less than two sample groups.
+        """
+        return Obstacles.__grouped_mean(np.asarray(self.CA_lengths, dtype=float), self.CA_sample_groups)
+
+    def CDF_standard_error(self, x):
+        """Estimate the CDF of the reduced CA length and its standard error.
+
+        The CDF is the fraction of the simulated CAs with a reduced length of at most `x`, and the standard error is
+        computed from the sample groups as in :meth:`CA_length_standard_error`. This must be called after
+        :meth:`compute_CA_lengths`.
+
+        Parameters
+        ----------
+        x : float or float array
+            [m] The length(s) at which to evaluate the CDF.
+
+        Returns
+        -------
+        CDF : float or float array
+            The CDF at `x`.
+        standard error : float or float array
+            The standard error of the CDF at `x`. It is NaN if there are less than two sample groups.
+        """
+        lengths = np.asarray(self.CA_lengths, dtype=float)
+        indicator = (lengths[:, np.newaxis] <= np.ravel(x)[np.newaxis, :]).astype(float)
+
+        mean, standard_error = Obstacles.__grouped_mean(indicator, self.CA_sample_groups)
+
+        if np.ndim(x) == 0:
+            return mean[0], standard_error[0]
+        return mean.reshape(np.shape(x)), standard_error.reshape(np.shape(x))
+
+    @staticmethod
+    def __grouped_mean(values, groups):
+        # Mean of the values (along the first axis) and its standard error, estimated from the spread of the means of
+        # the independent sample groups.
+        if len(values) != len(groups):
+            raise ValueError("The number of CA lengths does not match the number of sample groups.")
+
+        _, inverse, counts = np.unique(groups, return_inverse=True, return_counts=True)
+        sums = np.zeros((len(counts),) + values.shape[1:])
+        np.add.at(sums, inverse, values)
+        group_means = sums / counts.reshape((-1,) + (1,) * (values.ndim - 1))
+
+        mean = np.mean(values, axis=0)
+        if len(counts) < 2:
+            return mean, np.full_like(mean, np.nan)
+
+        return mean, np.std(group_means, axis=0, ddof=1) / np.sqrt(len(counts))
+
+    @staticmethod
+    def __unit_samples(count, sampling, replicates):
+        # Samples of (heading, x, y) in the unit cube and the sample group of each sample.
+        if sampling == Obstacles.SamplingType.ANTITHETIC:
+            # Each pair of samples is a group.
+            half = np.random.uniform(size=((count + 1) // 2, 3))
+            u = np.stack((half, 1 - half), axis=1).reshape(-1, 3)[:count]
+            return u, np.arange(count) // 2
+
+        if replicates < 1:
+            raise ValueError("The number of replicates must be at least one.")
+
+        u = np.empty((count, 3))
+        groups = np.empty(count, dtype=int)
+        for g, indices in enumerate(np.array_split(np.arange(count), replicates)):
+            n = len(indices)
+            if n == 0:
+                continue
+            groups[indices] = g
+
+            if sampling == Obstacles.SamplingType.STRATIFIED:
+                # One heading in each of n equal intervals, in random order.
+                u[indices, 0] = (np.random.permutation(n) + np.random.uniform(size=n)) / n
+                u[indices, 1:] = np.random.uniform(size=(n, 2))
+            elif sampling == Obstacles.SamplingType.SOBOL and qmc is not None:
+                sobol = qmc.Sobol(d=3, scramble=True, seed=np.random.randint(2**31))
+                with warnings.catch_warnings():
+                    # The balance properties are only guaranteed for powers of 2, but the samples are still uniform.
+                    warnings.simplefilter("ignore", UserWarning)
+                    u[indices] = sobol.random(n)
+            else:
+                if sampling == Obstacles.SamplingType.SOBOL:
+                    warnings.warn("scipy.stats.qmc is not available, so Latin hypercube sampling is used instead.")
+                # Latin hypercube: one sample in each of n equal intervals for each dimension.
+                u[indices] = (np.argsort(np.random.uniform(size=(3, n)), axis=1).T + np.random.uniform(size=(n, 3))) / n
+
+        return u, groups
+
     def compute_coverage(self, show_progress = False):
         """Determine total obstacle coverage.
 
@@ -540,33 +957,101 @@ class Obstacles:
         This is a rare event, and is therefore ignore. To visualize these problematic overlaps, this function
         provide a list of the affect obstacles and CAs, plus compute the area missed in the simulation.
 
+        The intersections are found by :meth:`missed_obstacle_CA_intersection_indices`.
+
         Parameters
         ----------
 
         Returns
         -------
-        intersection area : MISSING DOC
-            MISSING DOC
-        problematic obstacles : MISSING DOC
-            MISSING DOC
-        problematic CAs : MISSING DOC
-            MISSING DOC
+        intersection area : float
+            [m^2] The total area of the intersections.
+        problematic obstacles : list of Polygon
+            The obstacle in each intersection.
+        problematic CAs : list of Polygon
+            The reduced CA in each intersection.
         """
-        intersection_area = 0
+        CA_indices, obstacle_indices, areas = self.missed_obstacle_CA_intersection_indices()
 
-        # Return all found overlapping polygons.
-        problematic_obstacles = []
-        problematic_CAs = []
+        problematic_obstacles = [self.indexed_obstacles[j] for j in obstacle_indices]
+        problematic_CAs = [self.CAs_reduced[i] for i in CA_indices]
 
-        for CAr in self.CAs_reduced:
-            potentially_intersecting_obstacles = self.obstacles_rtree.query(CAr)
-            for obstacle in potentially_intersecting_obstacles:
-                if obstacle.intersects(CAr):
-                    intersection_area = intersection_area + obstacle.intersection(CAr).area
-                    problematic_obstacles.append(obstacle)
-                    problematic_CAs.append(CAr)
+        return np.sum(areas), problematic_obstacles, problematic_CAs
+
+    def missed_obstacle_CA_intersection_indices(self):
+        """Identifies missed intersections between obstacle and reduced CA for all CAs at once.
+
+        This finds the same intersections as :meth:`missed_obstacle_CA_intersections`, but returns indices instead
+        of polygons, and is fast enough to always be used as a sanity check. The candidate pairs are found for all
+        reduced CAs at once with the index from :meth:`get_obstacles_index`. For pairs where both polygons are
+        quadrilaterals (as the obstacles and CAs in the simulation), the intersection test is then done for all pairs at
+        once with the separating axis theorem. Only the area of the pairs that do intersect is computed with shapely.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        CA indices : int array
+            The index in `CAs_reduced` of the CA for each intersection.
+        obstacle indices : int array
+            The index in `indexed_obstacles` of the obstacle for each intersection.
+        areas : float array
+            [m^2] The area of each intersection.
+        """
+        index = self.get_obstacles_index()
+
+        CA_indices = np.array([k for k, CAr in enumerate(self.CAs_reduced) if not CAr.is_empty], dtype=int)
+        CA_vertices = [Obstacles.__exterior_vertices(self.CAs_reduced[k]) for k in CA_indices]
+        obstacle_vertices = [Obstacles.__exterior_vertices(obstacle) for obstacle in self.indexed_obstacles]
+
+        # Find the pairs where the bounding boxes overlap.
+        i, j = index.query_bounds(Obstacles.__vertex_bounds(CA_vertices))
+
+        # Test the pairs of quadrilaterals (closed with 5 vertices) in bulk, and the rest one by one.
+        CA_is_quad = np.array([len(v) == 5 for v in CA_vertices], dtype=bool)
+        obstacle_is_quad = np.array([len(v) == 5 for v in obstacle_vertices], dtype=bool)
+        quad = CA_is_quad[i] & obstacle_is_quad[j]
+
+        intersects = np.zeros(len(i), dtype=bool)
+        if np.any(quad):
+            CA_quads = np.array([v[:4] if q else np.zeros((4, 2)) for v, q in zip(CA_vertices, CA_is_quad)])
+            obstacle_quads = np.array([v[:4] if q else np.zeros((4, 2)) for v, q in zip(obstacle_vertices,
+                                                                                       obstacle_is_quad)])
+            intersects[quad] = Obstacles.__convex_polygons_intersect(CA_quads[i[quad]], obstacle_quads[j[quad]])
+        for k in np.flatnonzero(~quad):
+            intersects[k] = self.indexed_obstacles[j[k]].intersects(self.CAs_reduced[CA_indices[i[k]]])
+
+        CA_indices, obstacle_indices = CA_indices[i[intersects]], j[intersects]
+        areas = np.array([self.indexed_obstacles[obstacle_idx].intersection(self.CAs_reduced[CA_idx]).area
+                          for CA_idx, obstacle_idx in zip(CA_indices, obstacle_indices)], dtype=float)
+
+        return CA_indices, obstacle_indices, areas
+
+    @staticmethod
+    def __vertex_bounds(vertices):
+        # The bounding box (xmin, ymin, xmax, ymax) of each polygon given by its vertices.
+        if len(vertices) == 0:
+            return np.zeros((0, 4))
+        if all(len(v) == len(vertices[0]) for v in vertices):
+            vertices = np.array(vertices)
+            return np.concatenate((np.min(vertices, axis=1), np.max(vertices, axis=1)), axis=1)
+
+        return np.array([np.concatenate((np.min(v, axis=0), np.max(v, axis=0))) for v in vertices])
 
-        return intersection_area, problematic_obstacles, problematic_CAs
+    @staticmethod
+    def __convex_polygons_intersect(P, Q):
+        # Separating axis test for pairs of convex polygons given as K x n x 2 and K x m x 2 vertex arrays. The polygons
+        # intersect (or touch) if there is no edge normal on which their projections are separated.
+        edges = np.concatenate((np.roll(P, -1, axis=1) - P, np.roll(Q, -1, axis=1) - Q), axis=1)
+        normals = np.stack((-edges[..., 1], edges[..., 0]), axis=-1)
+
+        P_projection = np.einsum('kvd,kad->kav', P, normals)
+        Q_projection = np.einsum('kvd,kad->kav', Q, normals)
+        separated = (np.max(P_projection, axis=2) < np.min(Q_projection, axis=2)) | \
+                    (np.max(Q_projection, axis=2) < np.min(P_projection, axis=2))
+
+        return ~np.any(separated, axis=1)
 
     def cdf(self, 
             x, 
@@ -575,7 +1060,8 @@ class Obstacles:
             obstacle_orientation_resolution = 10,
             probability_threshold = stats.norm.pdf(3),
             ignore_obstacle_orientation = False,
-            show_progress = False):
+            show_progress = False,
+            quadrature = None):
         """Compute the CDF for the length of the critical area when rectangular obstacles are present.
         
         This is the CDF for the length of the critical area when there are a given obstacle density of rectangular
@@ -589,6 +1075,9 @@ class Obstacles:
         
         For a more detailed explanation of the CDF, see :cite:`f-lacour2021`.
 
+        The integrals do not depend on the obstacle density and are computed by :meth:`cdf_accumulator`, which caches
+        them. To evaluate the CDF for many obstacle densities, use :meth:`cdf_for_densities`.
+
         Parameters
         ----------
         x : float array
@@ -614,7 +1103,16 @@ class Obstacles:
             Note that this overrides the provided density function for orientation.
             Only use this option in special circumstances, and only if you know exactly what you are doing!
         show_progress : bool (default False)
-            Write the progress in percent to the prompt for the multple integral computation.
+            Not used. It is kept for compatibility, since the integrals are no longer computed for one x value at a
+            time, so there is no progress to show.
+        quadrature : QuadratureType (default None)
+            The quadrature rule for the integrals. With `RECTANGLE` (used if None), the PDFs are sampled equally spaced
+            over plus/minus 3 sigma and the samples below `probability_threshold` are ignored. With `GAUSS`, the
+            integrals over the normal distributions are done by Gauss-Hermite quadrature and over uniform obstacle
+            orientation by Gauss-Legendre quadrature. The CA orientation is integrated by Gauss-Legendre quadrature
+            over a quarter turn relative to the obstacle orientation, which is exact due to the symmetry of the
+            rectangles. The weights are then exactly normalized, and `probability_threshold` is not used. The
+            resolutions are the number of nodes, and 4 to 6 nodes are sufficient.
 
         Returns
         -------
@@ -633,131 +1131,255 @@ class Obstacles:
             The PDF for the obstacle length as used in the integral.
         pdf_CA_orientation : np.array
             The PDF for the CA orientation as used in the integral.
-        """
-        # Sample the obstacle PDF.
-        width_range = np.linspace(self.ObstacleSizes.width_mu - 3 * self.ObstacleSizes.width_sigma, 
-                                  self.ObstacleSizes.width_mu + 3 * self.ObstacleSizes.width_sigma,
-                                  obstacle_size_resolution)
-        length_range = np.linspace(self.ObstacleSizes.length_mu - 3 * self.ObstacleSizes.length_sigma,
-                                   self.ObstacleSizes.length_mu + 3 * self.ObstacleSizes.length_sigma,
-                                   obstacle_size_resolution)
-        CA_orientation_range = np.linspace(0, 360 - 360 / CA_orientation_resolution, CA_orientation_resolution)
-
-
-        pdf_width = stats.norm(self.ObstacleSizes.width_mu, self.ObstacleSizes.width_sigma).pdf(width_range)
-        pdf_length = stats.norm(self.ObstacleSizes.length_mu, self.ObstacleSizes.length_sigma).pdf(length_range)
-        pdf_CA_orientation = stats.uniform(0, 360).pdf(CA_orientation_range)
-
-        # Compute the step length for the integral computation.
-        pdf_width_step = (width_range[-1] - width_range[0]) / (obstacle_size_resolution - 1)
-        pdf_length_step = (length_range[-1] - length_range[0]) / (obstacle_size_resolution - 1)
-        pdf_CA_orientation_step = (CA_orientation_range[-1] - CA_orientation_range[0]) / (CA_orientation_resolution - 1)
-
-        # Handles the various types of obstacle orientations.
-        if self.obstacle_orientation_parameters.distribution_type == Obstacles.DistributionType.FIXED:
-            obstacle_orientation_range = np.array([0.0])   # Fixed orientation at 0 degrees.
-            pdf_obstacle_orientation_step = 1.0            # Step-size is 1.
-            pdf_obstacle_orientation = np.array([1.0])     # Probability of orientation is 1.
-        else:
-            if self.obstacle_orientation_parameters.distribution_type == Obstacles.DistributionType.UNIFORM:
-                obstacle_orientation_range = np.linspace(0, 360 - 360 / obstacle_orientation_resolution, obstacle_orientation_resolution)
-                pdf_obstacle_orientation_step = (obstacle_orientation_range[-1] - obstacle_orientation_range[0]) / (obstacle_orientation_resolution - 1)
-                pdf_obstacle_orientation = stats.uniform(loc = self.obstacle_orientation_parameters.loc, 
-                                                     scale = self.obstacle_orientation_parameters.scale).pdf(obstacle_orientation_range)
-
-                # Due to potentially very low sampling resolution, this PDF may be slightly off in terms of area. So we adjust that.
-                pdf_obstacle_orientation = pdf_obstacle_orientation / (np.sum(pdf_obstacle_orientation) * pdf_obstacle_orientation_step)
-            elif self.obstacle_orientation_parameters.distribution_type == Obstacles.DistributionType.NORM:
-                obstacle_orientation_range = np.linspace(self.obstacle_orientation_parameters.loc - 3 * self.obstacle_orientation_parameters.scale,
-                                   self.obstacle_orientation_parameters.loc + 3 * self.obstacle_orientation_parameters.scale,
-                                   obstacle_orientation_resolution)
-                pdf_obstacle_orientation_step = (obstacle_orientation_range[-1] - obstacle_orientation_range[0]) / (obstacle_orientation_resolution - 1)
-                pdf_obstacle_orientation = stats.norm(loc = self.obstacle_orientation_parameters.loc, 
-                                                  scale = self.obstacle_orientation_parameters.scale).pdf(obstacle_orientation_range)
 
+        The steps in the additional results are arrays for `GAUSS` quadrature, where the step of each node is its
+        weight divided by the PDF, so the weights are the PDFs times the steps as for `RECTANGLE`.
+        """
+        p_x, expected_value, beta, additional_results = self.cdf_for_densities(
+            x, self.obstacle_density(), obstacle_size_resolution, CA_orientation_resolution,
+            obstacle_orientation_resolution, probability_threshold, ignore_obstacle_orientation, quadrature)
+
+        return p_x, expected_value, beta, additional_results
+
+    def cdf_for_densities(self,
+                          x,
+                          obstacle_densities,
+                          obstacle_size_resolution = 10,
+                          CA_orientation_resolution = 10,
+                          obstacle_orientation_resolution = 10,
+                          probability_threshold = stats.norm.pdf(3),
+                          ignore_obstacle_orientation = False,
+                          quadrature = None):
+        """Compute the CDF for the length of the critical area for a number of obstacle densities.
+
+        This is the same as :meth:`cdf`, but for any obstacle densities instead of the density of the obstacles in the
+        simulation. The density only enters the CDF through :math:`1 - e^{-\\rho A(x)}`, where :math:`A(x)` is the
+        expected area of the Minkowski sum of CA and obstacle computed by :meth:`cdf_accumulator`. So the integrals are
+        computed once (or taken from the cache), and the cost of each additional density is negligible.
 
+        Parameters
+        ----------
+        x : float array
+            [m] The length of the critical area for which the CDF is computed. This can be a scalar or an array.
+        obstacle_densities : float or float array
+            [1/m^2] The obstacle densities.
+        obstacle_size_resolution : int (default is 10)
+            See :meth:`cdf`.
+        CA_orientation_resolution : int (default is 10)
+            See :meth:`cdf`.
+        obstacle_orientation_resolution : int (default is 10)
+            See :meth:`cdf`.
+        probability_threshold : float (default is PDF for normal distribution evaluated at 3 sigma, approx 0.0044)
+            See :meth:`cdf`.
+        ignore_obstacle_orientation : bool (default False)
+            See :meth:`cdf`.
+        quadrature : QuadratureType (default None)
+            See :meth:`cdf`.
 
+        Returns
+        -------
+        p_x : float array
+            The CDF values for each density (along the first axes, with the shape of `obstacle_densities`) and x
+            (along the last axis).
+        expected_value : float or float array
+            [m] The expected value of the length for each density.
+        beta : float or float array
+            The beta values as computed in :cite:`f-lacour2021` for each density.
+        additional_results : dict
+            The additional results as described for :meth:`cdf`.
+        """
         # The assumption is that the input is an array, so if it is scalar, change it to an array.
         if not isinstance(x, np.ndarray):
             x = np.array([x])
 
-        x_resolution = len(x)
         x_step = 1 if len(x) == 1 else (x[-1] - x[0]) / (len(x) - 1)
 
-        # Preset p_x.
-        p_x = np.zeros(x_resolution)
-
-        expected_value = 0
-        beta_acc = 0
-        acc_probability_check = 0
-        obstacle_density = self.obstacle_density()
- 
-        if show_progress:
-            print('', end='\r')
-
-        # Loop over increasing x values to get the full CDF.
-        for idx_x, x_val in enumerate(x):
-            if show_progress:
-                print('Theory time:              {:1.0f}%'.format(idx_x / len(x) * 100), end='\r')
-
-            # Reset acc for integral.
-            accumulator = 0
+        slope, intercept, beta_accumulator, additional_results = self.cdf_accumulator(
+            obstacle_size_resolution, CA_orientation_resolution, obstacle_orientation_resolution,
+            probability_threshold, ignore_obstacle_orientation, quadrature)
 
+        obstacle_densities = np.asarray(obstacle_densities, dtype=float)[..., np.newaxis]
 
-            # Loop over orientations of CA.
-            for idx_CA_orientation, CA_orientation_val in enumerate(CA_orientation_range):
-                CA_polygon = Polygon([(0, 0), (self.CA_width, 0), (self.CA_width, x_val), (0, x_val), (0, 0)])
-                CA_polygon = affinity.rotate(CA_polygon, CA_orientation_val, 'center', use_radians=False)
+        p_x = 1 - np.exp(-obstacle_densities * (slope * x + intercept))
 
-                p_CA_orientation = pdf_CA_orientation[idx_CA_orientation] * pdf_CA_orientation_step
-
-                if p_CA_orientation <= probability_threshold:
-                    continue
-
-                # Loop over orientations of obstacles.
-                for idx_obstacle_orientation, obstacle_orientation_val in enumerate(obstacle_orientation_range):
+        # Find expected value from the CDF. If x is not an array, the EX does not make sense, so set to zero.
+        if len(x) == 1:
+            expected_value = np.zeros(obstacle_densities.shape[:-1])
+        else:
+            expected_value = np.sum((1 - p_x) * x_step, axis=-1)
 
-                    p_obstacle_orientation = pdf_obstacle_orientation[idx_obstacle_orientation] * pdf_obstacle_orientation_step
+        # Beta does not depend on x.
+        beta = 1 - np.exp(-obstacle_densities[..., 0] * beta_accumulator)
 
-                    if p_obstacle_orientation <= probability_threshold:
-                        continue
+        if obstacle_densities.ndim == 1:
+            expected_value, beta = float(expected_value), float(beta)
 
-                    # Loop for obstacle probabilistic properties (called \Phi_i in the paper).
-                    for index_w, w in enumerate(width_range):
+        return p_x, expected_value, beta, additional_results
 
-                        p_width = pdf_width[index_w] * pdf_width_step
+    def cdf_accumulator(self,
+                        obstacle_size_resolution = 10,
+                        CA_orientation_resolution = 10,
+                        obstacle_orientation_resolution = 10,
+                        probability_threshold = stats.norm.pdf(3),
+                        ignore_obstacle_orientation = False,
+                        quadrature = None):
+        """Compute the density independent integrals for the CDF of the length of the critical area.
 
-                        if p_width <= probability_threshold:
-                            continue
+        The integral in the CDF is the expected area of the Minkowski sum of the CA and an obstacle, integrated over
+        the obstacle width, length and orientation and the CA orientation. The area of the Minkowski sum of two
+        rectangles is linear in the CA length :math:`x`, so the integral is :math:`A(x) = S_1 x + S_0` for all x, and
+        the CDF is :math:`1 - e^{-\\rho A(x)}` for obstacle density :math:`\\rho`.
 
-                        for index_l, l in enumerate(length_range):
-                            p_length = pdf_length[index_l] * pdf_length_step
+        The result is cached for the obstacle and CA properties, so calling :meth:`cdf` and :meth:`cdf_for_densities`
+        repeatedly with the same resolutions does not compute the integrals again.
 
-                            if p_width <= probability_threshold:
-                                continue
+        Parameters
+        ----------
+        obstacle_size_resolution : int (default is 10)
+            See :meth:`cdf`.
+        CA_orientation_resolution : int (default is 10)
+            See :meth:`cdf`.
+        obstacle_orientation_resolution : int (default is 10)
+            See :meth:`cdf`.
+        probability_threshold : float (default is PDF for normal distribution evaluated at 3 sigma, approx 0.0044)
+            See :meth:`cdf`.
+        ignore_obstacle_orientation : bool (default False)
+            See :meth:`cdf`.
+        quadrature : QuadratureType (default None)
+            See :meth:`cdf`.
 
-                            minkowski_area = self.Minkowski_sum_convex_polygons_area(self.CA_width, x_val, w, l,
-                                                                                     CA_orientation_val, obstacle_orientation_val)
-                            accumulator = accumulator + minkowski_area * p_width * p_length * p_CA_orientation * p_obstacle_orientation
-                            acc_probability_check = acc_probability_check + p_width * p_length * p_CA_orientation * p_obstacle_orientation
+        Returns
+        -------
+        slope : float
+            [m] The slope :math:`S_1` of the expected Minkowski sum area as a function of x.
+        intercept : float
+            [m^2] The expected Minkowski sum area :math:`S_0` for x equal to zero.
+        beta_accumulator : float
+            [m^2] The expected obstacle area used for computing beta.
+        additional_results : dict
+            The additional results as described for :meth:`cdf`.
+        """
+        if quadrature is None:
+            quadrature = Obstacles.QuadratureType.RECTANGLE
+
+        key = (obstacle_size_resolution, CA_orientation_resolution, obstacle_orientation_resolution,
+               probability_threshold, ignore_obstacle_orientation, quadrature, self.CA_width,
+               astuple(self.ObstacleSizes), astuple(self.obstacle_orientation_parameters))
+        if self.__cdf_accumulator_cache is not None and self.__cdf_accumulator_cache[0] == key:
+            return self.__cdf_accumulator_cache[1]
+
+        if quadrature == Obstacles.QuadratureType.GAUSS:
+            # The CA orientation is uniform over the full circle, so it can be taken relative to the obstacle
+            # orientation. The Minkowski sum area is then symmetric around 90 and 180 degrees, so a quarter turn is
+            # sufficient. Over the full circle, the area has a kink every 90 degrees, but it is smooth over a quarter
+            # turn, which makes Gauss-Legendre quadrature converge fast.
+            CA_orientation_range, pdf_CA_orientation, pdf_CA_orientation_step = Obstacles.__gauss_quadrature(
+                Obstacles.DistributionType.UNIFORM, 0, 90, CA_orientation_resolution)
+
+            width_range, pdf_width, pdf_width_step = Obstacles.__gauss_quadrature(
+                Obstacles.DistributionType.NORM, self.ObstacleSizes.width_mu, self.ObstacleSizes.width_sigma,
+                obstacle_size_resolution)
+            length_range, pdf_length, pdf_length_step = Obstacles.__gauss_quadrature(
+                Obstacles.DistributionType.NORM, self.ObstacleSizes.length_mu, self.ObstacleSizes.length_sigma,
+                obstacle_size_resolution)
+
+            if self.obstacle_orientation_parameters.distribution_type == Obstacles.DistributionType.FIXED:
+                obstacle_orientation_range = np.array([0.0])
+                pdf_obstacle_orientation_step = 1.0
+                pdf_obstacle_orientation = np.array([1.0])
+            else:
+                obstacle_orientation_range, pdf_obstacle_orientation, pdf_obstacle_orientation_step = \
+                    Obstacles.__gauss_quadrature(self.obstacle_orientation_parameters.distribution_type,
+                                                 self.obstacle_orientation_parameters.loc,
+                                                 self.obstacle_orientation_parameters.scale,
+                                                 obstacle_orientation_resolution)
+
+            # The weights are exactly normalized, so all nodes are used.
+            probability_threshold = 0
+        else:
+            # Sample the obstacle PDF.
+            width_range = np.linspace(self.ObstacleSizes.width_mu - 3 * self.ObstacleSizes.width_sigma, 
+                                      self.ObstacleSizes.width_mu + 3 * self.ObstacleSizes.width_sigma,
+                                      obstacle_size_resolution)
+            length_range = np.linspace(self.ObstacleSizes.length_mu - 3 * self.ObstacleSizes.length_sigma,
+                                       self.ObstacleSizes.length_mu + 3 * self.ObstacleSizes.length_sigma,
+                                       obstacle_size_resolution)
+            CA_orientation_range = np.linspace(0, 360 - 360 / CA_orientation_resolution, CA_orientation_resolution)
+
+
+            pdf_width = stats.norm(self.ObstacleSizes.width_mu, self.ObstacleSizes.width_sigma).pdf(width_range)
+            pdf_length = stats.norm(self.ObstacleSizes.length_mu, self.ObstacleSizes.length_sigma).pdf(length_range)
+            pdf_CA_orientation = stats.uniform(0, 360).pdf(CA_orientation_range)
+
+            # Compute the step length for the integral computation.
+            pdf_width_step = (width_range[-1] - width_range[0]) / (obstacle_size_resolution - 1)
+            pdf_length_step = (length_range[-1] - length_range[0]) / (obstacle_size_resolution - 1)
+            pdf_CA_orientation_step = (CA_orientation_range[-1] - CA_orientation_range[0]) / (CA_orientation_resolution - 1)
+
+            # Handles the various types of obstacle orientations.
+            if self.obstacle_orientation_parameters.distribution_type == Obstacles.DistributionType.FIXED:
+                obstacle_orientation_range = np.array([0.0])   # Fixed orientation at 0 degrees.
+                pdf_obstacle_orientation_step = 1.0            # Step-size is 1.
+                pdf_obstacle_orientation = np.array([1.0])     # Probability of orientation is 1.
+            else:
+                if self.obstacle_orientation_parameters.distribution_type == Obstacles.DistributionType.UNIFORM:
+                    obstacle_orientation_range = np.linspace(0, 360 - 360 / obstacle_orientation_resolution, obstacle_orientation_resolution)
+                    pdf_obstacle_orientation_step = (obstacle_orientation_range[-1] - obstacle_orientation_range[0]) / (obstacle_orientation_resolution - 1)
+                    pdf_obstacle_orientation = stats.uniform(loc = self.obstacle_orientation_parameters.loc, 
+                                                         scale = self.obstacle_orientation_parameters.scale).pdf(obstacle_orientation_range)
+
+                    # Due to potentially very low sampling resolution, this PDF may be slightly off in terms of area. So we adjust that.
+                    pdf_obstacle_orientation = pdf_obstacle_orientation / (np.sum(pdf_obstacle_orientation) * pdf_obstacle_orientation_step)
+                elif self.obstacle_orientation_parameters.distribution_type == Obstacles.DistributionType.NORM:
+                    obstacle_orientation_range = np.linspace(self.obstacle_orientation_parameters.loc - 3 * self.obstacle_orientation_parameters.scale,
+                                       self.obstacle_orientation_parameters.loc + 3 * self.obstacle_orientation_parameters.scale,
+                                       obstacle_orientation_resolution)
+                    pdf_obstacle_orientation_step = (obstacle_orientation_range[-1] - obstacle_orientation_range[0]) / (obstacle_orientation_resolution - 1)
+                    pdf_obstacle_orientation = stats.norm(loc = self.obstacle_orientation_parameters.loc, 
+                                                      scale = self.obstacle_orientation_parameters.scale).pdf(obstacle_orientation_range)
+
+        beta_accumulator = 0
+
+        # The probabilities of the samples in each integral. Orientations and widths with a probability below the
+        # threshold are ignored, while all lengths are used.
+        p_CA_orientation = pdf_CA_orientation * pdf_CA_orientation_step
+        p_obstacle_orientation = pdf_obstacle_orientation * pdf_obstacle_orientation_step
+        p_width = pdf_width * pdf_width_step
+        p_length = pdf_length * pdf_length_step
+
+        use_CA_orientation = p_CA_orientation > probability_threshold
+        use_obstacle_orientation = p_obstacle_orientation > probability_threshold
+        use_width = p_width > probability_threshold
+
+        # The integrals are sums over a grid with the index order CA orientation, obstacle orientation, width, and
+        # length.
+        CA_orientation_grid = CA_orientation_range[use_CA_orientation][:, np.newaxis, np.newaxis, np.newaxis]
+        obstacle_orientation_grid = obstacle_orientation_range[use_obstacle_orientation][:, np.newaxis, np.newaxis]
+        width_grid = width_range[use_width][:, np.newaxis]
+        probability = p_CA_orientation[use_CA_orientation][:, np.newaxis, np.newaxis, np.newaxis] * \
+            p_obstacle_orientation[use_obstacle_orientation][:, np.newaxis, np.newaxis] * \
+            p_width[use_width][:, np.newaxis] * p_length
+
+        # The angles are the same for both evaluations. For Gauss quadrature, the CA orientation is relative to the
+        # obstacle orientation.
+        if quadrature == Obstacles.QuadratureType.GAUSS:
+            sin_cos_table = self.Minkowski_sum_sin_cos_table(CA_orientation_grid, 0 * obstacle_orientation_grid)
+        else:
+            sin_cos_table = self.Minkowski_sum_sin_cos_table(CA_orientation_grid, obstacle_orientation_grid)
 
-                            # Compute beta (does not depend on x and orient, so only need to compute once).
-                            if idx_x == 0 and idx_CA_orientation == 0 and idx_obstacle_orientation == 0:
-                                beta_acc = beta_acc + w * l * p_width * p_length
+        # The Minkowski sum area is linear in x, so it is integrated for x equal to 0 and 1.
+        intercept, slope = (np.sum(self.Minkowski_sum_convex_polygons_area(self.CA_width, x_val, width_grid,
+                                                                             length_range, None, None,
+                                                                             sin_cos_table=sin_cos_table) *
+                                   probability) for x_val in (0, 1))
+        slope = slope - intercept
 
-            p_x[idx_x] = 1 - np.exp(-obstacle_density * accumulator)
-            
-            # Find expected value from the CDF
-            expected_value = expected_value + (1 - p_x[idx_x]) * x_step
+        acc_probability_check = np.sum(probability)
 
-        beta = 1 - np.exp(-obstacle_density * beta_acc)
-        
-        # If x is not an array, the EX does not make sense, so set to zero.
-        if len(x) == 1:
-            expected_value = 0
-                
-        # Divide to account for the accumulator is not reset in the above outer loop.
-        acc_probability_check = acc_probability_check / x_resolution
+        # Compute beta (does not depend on x and orient, so it is only computed for the first orientations, and only
+        # if these are not ignored).
+        if use_CA_orientation[0] and use_obstacle_orientation[0]:
+            beta_accumulator = np.sum(width_grid * length_range * p_width[use_width][:, np.newaxis] * p_length)
 
         total_integral_ignored = np.array([np.count_nonzero(pdf_CA_orientation * pdf_CA_orientation_step <= probability_threshold) / len(CA_orientation_range),
                                            np.count_nonzero(pdf_obstacle_orientation * pdf_obstacle_orientation_step <= probability_threshold) / len(obstacle_orientation_range),
@@ -767,29 +1389,53 @@ class Obstacles:
        
         if abs(acc_probability_check - 1) > 0.05:
             warnings.warn("PDF sanity check failed.")
-            print('[DEBUG] pdf_width:                {:1.4f}'.format(np.sum(pdf_width) * pdf_width_step),flush = True)
-            print('[DEBUG] pdf_length:               {:1.4f}'.format(np.sum(pdf_length) * pdf_length_step),flush = True)
-            print('[DEBUG] pdf_CA_orientation:       {:1.4f}'.format(np.sum(pdf_CA_orientation) * pdf_CA_orientation_step),flush = True)
-            print('[DEBUG] pdf_obstacle_orientation: {:1.4f}'.format(np.sum(pdf_obstacle_orientation) * pdf_obstacle_orientation_step),flush = True)
-
-        return (p_x, 
-                expected_value, 
-                beta, 
-                {'acc_probability_check' : acc_probability_check, 
-                 'total_integral_ignored' : total_integral_ignored,
-                 'pdf_width' : pdf_width,
-                 'pdf_width_range' : width_range,
-                 'pdf_width_step' : pdf_width_step,
-                 'pdf_length' : pdf_length,
-                 'pdf_length_range' : length_range,
-                 'pdf_length_step' : pdf_length_step,
-                 'pdf_CA_orientation' : pdf_CA_orientation,
-                 'CA_orientation_range' : CA_orientation_range,
-                 'pdf_CA_orientation_step' : pdf_CA_orientation_step,
-                 'pdf_obstacle_orientation' : pdf_obstacle_orientation,
-                 'obstacle_orientation_range' : obstacle_orientation_range,
-                 'pdf_obstacle_orientation_step' : pdf_obstacle_orientation_step,
-                 })
+            print('[DEBUG] pdf_width:                {:1.4f}'.format(np.sum(pdf_width * pdf_width_step)),flush = True)
+            print('[DEBUG] pdf_length:               {:1.4f}'.format(np.sum(pdf_length * pdf_length_step)),flush = True)
+            print('[DEBUG] pdf_CA_orientation:       {:1.4f}'.format(np.sum(pdf_CA_orientation * pdf_CA_orientation_step)),flush = True)
+            print('[DEBUG] pdf_obstacle_orientation: {:1.4f}'.format(np.sum(pdf_obstacle_orientation * pdf_obstacle_orientation_step)),flush = True)
+
+        result = (slope,
+                  intercept,
+                  beta_accumulator,
+                  {'acc_probability_check' : acc_probability_check, 
+                   'total_integral_ignored' : total_integral_ignored,
+                   'pdf_width' : pdf_width,
+                   'pdf_width_range' : width_range,
+                   'pdf_width_step' : pdf_width_step,
+                   'pdf_length' : pdf_length,
+                   'pdf_length_range' : length_range,
+                   'pdf_length_step' : pdf_length_step,
+                   'pdf_CA_orientation' : pdf_CA_orientation,
+                   'CA_orientation_range' : CA_orientation_range,
+                   'pdf_CA_orientation_step' : pdf_CA_orientation_step,
+                   'pdf_obstacle_orientation' : pdf_obstacle_orientation,
+                   'obstacle_orientation_range' : obstacle_orientation_range,
+                   'pdf_obstacle_orientation_step' : pdf_obstacle_orientation_step,
+                   })
+
+        self.__cdf_accumulator_cache = (key, result)
+
+        return result
+
+    @staticmethod
+    def __gauss_quadrature(distribution_type, loc, scale, n):
+        # Nodes, PDF at the nodes, and step (weight divided by PDF) of Gauss quadrature for the expectation over a
+        # normal (Gauss-Hermite) or uniform (Gauss-Legendre) distribution.
+        if distribution_type == Obstacles.DistributionType.NORM:
+            z, weights = np.polynomial.hermite_e.hermegauss(n)
+            nodes = loc + scale * z
+            weights = weights / np.sqrt(2 * np.pi)
+            pdf = stats.norm(loc, scale).pdf(nodes)
+        elif distribution_type == Obstacles.DistributionType.UNIFORM:
+            z, weights = np.polynomial.legendre.leggauss(n)
+            nodes = loc + scale * (z + 1) / 2
+            weights = weights / 2
+            pdf = stats.uniform(loc, scale).pdf(nodes)
+        else:
+            raise ValueError("Gauss quadrature is not defined for {}".format(distribution_type))
+
+        # For many nodes, the PDF of the outermost nodes may underflow, and they are then ignored.
+        return nodes, pdf, np.divide(weights, pdf, out=np.zeros_like(weights), where=pdf > 0)
 
     def singleton_objects_CDF(self, x):
         """ CDF for singleton objects.
@@ -822,7 +1468,8 @@ class Obstacles:
 
     def show_simulation(self, ax, problematic_obstacles = None, problematic_CAs = None, show_CAs = True, 
                         show_CA_first_point = False, show_CAs_reduced = True, show_obstacles = True,
-                        show_obstacles_intersected = True, show_debug_points = False, show_legends = True):
+                        show_obstacles_intersected = True, show_debug_points = False, show_legends = True,
+                        use_collections = True, viewport = None):
         """Visualize simulation with obstacles and critical areas.
 
         This functions makes it easy to visualize the result of simulations. It will show the simulated square area with obstacles (possible
@@ -831,6 +1478,9 @@ class Obstacles:
         It can also show a list of problematic obstacles and critical areas. For more details on what that is and how to detect them, see
         the help for `sanity_check()`.
 
+        By default, each layer of polygons (CAs, reduced CAs, obstacles, etc.) is drawn as a single `PolyCollection` made directly from the
+        polygon coordinates, which is much faster than adding a patch per polygon when there are thousands of polygons.
+
         Parameters
         ----------
         ax : axis to plot in
@@ -852,63 +1502,71 @@ class Obstacles:
         show_debug_points : bool (default False)
             Show debug points on the CAs to help verify that intersections and polygonal reduction is corrected.
             Typically only used for debugging.
+        show_legends : bool (default True)
+            Show the legend.
+        use_collections : bool (default True)
+            If True, draw each layer of polygons as one `PolyCollection`. If False, draw each polygon as a `PolygonPatch` (requires descartes).
+        viewport : list of float (default None)
+            If not None, only draw the polygons that intersect the viewport given as [xmin, xmax, ymin, ymax] (as for `ax.axis()`). The
+            axis limits are not changed.
 
         Returns
         -------
         None
         """
+        if not use_collections:
+            # Only needed for plotting, so it is not imported with the module.
+            from descartes.patch import PolygonPatch
+
+        def add_polygons(polygons, label = None, **style):
+            if use_collections:
+                vertices = Obstacles.__polygon_vertices(polygons, viewport)
+                ax.add_collection(Obstacles.__polygon_collection(vertices, label = label, **style))
+            else:
+                for polygon in polygons:
+                    if not polygon.is_empty and (viewport is None or
+                                                 Obstacles.__polygon_vertices([polygon], viewport)):
+                        ax.add_patch(PolygonPatch(polygon, **style))
+                if label is not None:
+                    style.pop('zorder', None)
+                    ax.add_patch(PolygonPatch(Polygon([(0,0), (0,1), (1,0)]), label = label, **style))
+
         # Viz all the original CAs
         if show_CAs:
-            for CA in self.CAs:
-                x, y = CA.exterior.coords.xy
-                ax.plot(x, y, '-', color=self.BLACK, linewidth=0.25)
-                if show_CA_first_point:
-                    ax.plot((x[0]+x[1])/2, (y[0]+y[1])/2, 'o', color=self.BLACK)
-            ax.add_patch(PolygonPatch(Polygon([(0,0), (0,1), (1,0)]), facecolor=self.WHITE, edgecolor=self.BLACK, alpha=1, linewidth=0.25, label="Nominal CA"))
+            add_polygons(self.CAs, "Nominal CA", facecolor='none', edgecolor=self.BLACK, alpha=1, linewidth=0.25)
 
             if show_CA_first_point:
-                ax.plot(-10000, -10000, 'o', color=self.BLACK, label="Start of CA")
+                first_points = np.array([np.mean(v[:2], axis=0)
+                                         for v in Obstacles.__polygon_vertices(self.CAs, viewport)]).reshape(-1, 2)
+                ax.plot(first_points[:, 0], first_points[:, 1], 'o', color=self.BLACK, label="Start of CA")
 
         if show_CAs_reduced:
-            for CAr in self.CAs_reduced:
-                if not CAr.is_empty:
-                    ax.add_patch(PolygonPatch(CAr, facecolor=self.PURPLE, edgecolor=self.RED, alpha=1, zorder=3, linewidth=0.25))
-            ax.add_patch(PolygonPatch(Polygon([(0,0), (0,1), (1,0)]), facecolor=self.PURPLE, edgecolor=self.RED, alpha=1, label="Reduced CA"))
+            add_polygons(self.CAs_reduced, "Reduced CA", facecolor=self.PURPLE, edgecolor=self.RED, alpha=1, zorder=3,
+                         linewidth=0.25)
 
         if show_obstacles:
-            for o in self.obstacles:
-                ax.add_patch(
-                    PolygonPatch(o, facecolor=self.GREEN, edgecolor=self.BLACK, alpha=1, zorder=2, linewidth=0.25))
             if show_obstacles_intersected:
                 label_text = "Obstacles (not intersected)"
             else:
                 label_text = "Obstacles"
-            ax.add_patch(PolygonPatch(Polygon([(0,0), (0,1), (1,0)]), facecolor=self.GREEN, edgecolor=self.BLACK, alpha=1, linewidth=0.25, label=label_text))
+            add_polygons(self.obstacles, label_text, facecolor=self.GREEN, edgecolor=self.BLACK, alpha=1, zorder=2,
+                         linewidth=0.25)
 
         if show_obstacles_intersected:
-            for o in self.intersected_obstacles:
-                ax.add_patch(
-                    PolygonPatch(o, facecolor=self.ORANGE, edgecolor=self.BLACK, alpha=1, zorder=2, linewidth=0.25))
-            ax.add_patch(PolygonPatch(Polygon([(0,0), (0,1), (1,0)]), facecolor=self.ORANGE, edgecolor=self.BLACK, alpha=1, linewidth=0.25, label="Obstacles (intersected)"))
-
-        if problematic_obstacles is not None:
-            for po in problematic_obstacles:
-                ax.add_patch(PolygonPatch(po, facecolor=self.YELLOW, edgecolor=self.BLACK, alpha=1, zorder=10, linewidth=0.25))
-
-        if problematic_CAs is not None:
-            for CAr in problematic_CAs:
-                ax.add_patch(PolygonPatch(CAr, facecolor=self.YELLOW, edgecolor=self.BLACK, alpha=1, zorder=10, linewidth=0.25))
+            add_polygons(self.intersected_obstacles, "Obstacles (intersected)", facecolor=self.ORANGE,
+                         edgecolor=self.BLACK, alpha=1, zorder=2, linewidth=0.25)
 
         if problematic_obstacles is not None or problematic_CAs is not None:
-            ax.add_patch(PolygonPatch(Polygon([(0,0), (0.0001,0), (0,0.0001)]), facecolor=self.YELLOW, edgecolor=self.BLACK, 
-                                       label='Obstacles with missed area', linewidth=0.25))
+            problematic = list(problematic_obstacles or []) + list(problematic_CAs or [])
+            add_polygons(problematic, 'Obstacles with missed area', facecolor=self.YELLOW, edgecolor=self.BLACK,
+                         alpha=1, zorder=10, linewidth=0.25)
 
         if show_debug_points:
-            for p in self.closest:
-                ax.plot(p.x, p.y, 'o', color=self.YELLOW)
+            closest = np.array([(p.x, p.y) for p in self.closest]).reshape(-1, 2)
+            ax.plot(closest[:, 0], closest[:, 1], 'o', color=self.YELLOW)
 
-            for p in self.CA_cut_off_coords:
-                ax.plot(p.x, p.y, 'x', color=self.GRAY, zorder=5)
+            cut_off = np.array([(p.x, p.y) for p in self.CA_cut_off_coords]).reshape(-1, 2)
+            ax.plot(cut_off[:, 0], cut_off[:, 1], 'x', color=self.GRAY, zorder=5)
 
         self.set_limits(ax, -100, self.trial_area_sidelength + 100, -100, self.trial_area_sidelength + 100, 100)
         ax.set_xlabel('Size [m]')
@@ -917,6 +1575,49 @@ class Obstacles:
         if show_legends:
             ax.legend(loc="upper left", )
 
+    @staticmethod
+    def __polygon_vertices(polygons, viewport):
+        # Get the exterior vertices of the non-empty polygons (the polygons in the simulation have no holes), and
+        # only keep the polygons with bounds inside the viewport.
+        vertices = []
+        for polygon in polygons:
+            if polygon.is_empty:
+                continue
+            if polygon.geom_type == 'MultiPolygon':
+                vertices.extend(Obstacles.__exterior_vertices(part) for part in polygon.geoms)
+            else:
+                vertices.append(Obstacles.__exterior_vertices(polygon))
+
+        if viewport is not None:
+            vertices = [v for v in vertices if v[:, 0].min() <= viewport[1] and v[:, 0].max() >= viewport[0] and
+                        v[:, 1].min() <= viewport[3] and v[:, 1].max() >= viewport[2]]
+
+        return vertices
+
+    @staticmethod
+    def __exterior_vertices(polygon):
+        # Reading the coordinates from the WKB is much faster than through the coordinate sequence. The header of a
+        # little endian 2D polygon is the byte order, the type, the number of rings and the number of points.
+        data = polygon.wkb if _wkb_writer is None else _wkb_writer.write(polygon)
+        if data[:5] == b'\x01\x03\x00\x00\x00':
+            n = int.from_bytes(data[9:13], 'little')
+            return np.frombuffer(data, dtype='<f8', count=2 * n, offset=13).reshape(n, 2)
+
+        return np.asarray(polygon.exterior.coords)[:, :2]
+
+    @staticmethod
+    def __polygon_collection(vertices, **style):
+        # Make a single collection of polygons. The last vertex of the exterior is the first vertex repeated, so it is
+        # removed and the collection closes the polygons again. When all polygons have the same number of vertices (as
+        # for rectangles), a single array lets matplotlib make all the paths at once.
+        from matplotlib.collections import PolyCollection
+
+        vertices = [v[:-1] for v in vertices]
+        if len(vertices) > 0 and all(len(v) == len(vertices[0]) for v in vertices):
+            vertices = np.array(vertices)
+
+        return PolyCollection(vertices, **style)
+
     def show_CDF(self, ax, show_CA_as_size = True, line_label = None, line_color = 'blue', line_width = 3):
         """Plots the CDF
 
@@ -1005,11 +1706,10 @@ class Obstacles:
     def Minkowski_sum_convex_polygons(A, B):
         """Compute the polygon that is the Minkowski sum of two convex polygons A and B.
 
-        This methods is based on convex hull for computing the Minkowski sum, and it is
+        This methods is based on merging the edges of the two polygons by angle (see
+        :meth:`Minkowski_sum_convex_vertices`), and it is
         therefore required that both input polygons are convex, otherwise the result is not correct.
 
-        The result is returned as a MultiPoint type.
-
         Parameters
         ----------
         A : Polygon
@@ -1019,63 +1719,187 @@ class Obstacles:
 
         Returns
         -------
-        C : MultiPoint
-            The result of the computation as a Multipoint (collection of points) and not a polygon.
+        C : Polygon
+            The Minkowski sum.
         """
-        Av = MultiPoint(A.exterior.coords)
-        Bv = MultiPoint(B.exterior.coords)
-        Cv = []
-        for a in Av:
-            for b in Bv:
-                Cv.append(affinity.translate(a, b.x, b.y))
+        return Polygon(Obstacles.Minkowski_sum_convex_vertices(np.asarray(A.exterior.coords)[:, :2],
+                                                               np.asarray(B.exterior.coords)[:, :2]))
 
-        C = MultiPoint(Cv).convex_hull
+    @staticmethod
+    def Minkowski_sum_convex_vertices(A, B):
+        """Compute the vertices of the Minkowski sum of two convex polygons given by their vertices.
 
-        return C
+        The edges of the two polygons are merged in order of angle (the rotating calipers method), so the computation
+        is linear in the number of vertices. Both polygons must be convex, otherwise the result is not correct.
+
+        Parameters
+        ----------
+        A : float array
+            [m] The vertices of the one polygon as an n x 2 array. The vertices can be in clockwise or
+            counterclockwise order, and the first vertex may be repeated at the end (as in shapely).
+        B : float array
+            [m] The vertices of the other polygon as an m x 2 array.
+
+        Returns
+        -------
+        C : float array
+            [m] The vertices of the Minkowski sum in counterclockwise order, starting at the lowest vertex. Collinear
+            vertices are removed, and the first vertex is not repeated.
+        """
+        C = Obstacles.Minkowski_sum_convex_vertices_batch(np.asarray(A, dtype=float)[np.newaxis],
+                                                          np.asarray(B, dtype=float)[np.newaxis])[0]
+
+        # Remove the vertices between parallel edges.
+        edges = np.roll(C, -1, axis=0) - C
+        previous_edges = np.roll(edges, 1, axis=0)
+        cross = previous_edges[:, 0] * edges[:, 1] - previous_edges[:, 1] * edges[:, 0]
+        scale = np.linalg.norm(previous_edges, axis=1) * np.linalg.norm(edges, axis=1)
+
+        return C[cross > 1E-12 * scale]
 
     @staticmethod
-    def Minkowski_sum_convex_polygons_area(w, x, a, b, theta1, theta2):
+    def Minkowski_sum_convex_vertices_batch(A, B):
+        """Compute the vertices of the Minkowski sums of stacks of convex polygons.
+
+        This is the same as :meth:`Minkowski_sum_convex_vertices`, but for many pairs of polygons at once. All
+        polygons in a stack must have the same number of vertices, such as rectangles.
+
+        Parameters
+        ----------
+        A : float array
+            [m] The vertices of the one polygon in each pair as an N x n x 2 array. The vertices can be in clockwise or
+            counterclockwise order, and the first vertex may be repeated at the end (as in shapely).
+        B : float array
+            [m] The vertices of the other polygon in each pair as an N x m x 2 array. The stacks are broadcast against
+            each other, so for instance a 1 x m x 2 array gives the sum of one polygon with all the polygons in `A`.
+
+        Returns
+        -------
+        C : float array
+            [m] The vertices of the Minkowski sums as an N x (n + m) x 2 array in counterclockwise order, starting at
+            the lowest vertex. To keep the same number of vertices for all sums, vertices between parallel edges are
+            not removed.
+        """
+        A, A_angles = Obstacles.__convex_edges(A)
+        B, B_angles = Obstacles.__convex_edges(B)
+        shape = np.broadcast_shapes(A.shape[:-2], B.shape[:-2])
+        A, A_angles = np.broadcast_to(A, shape + A.shape[-2:]), np.broadcast_to(A_angles, shape + A_angles.shape[-1:])
+        B, B_angles = np.broadcast_to(B, shape + B.shape[-2:]), np.broadcast_to(B_angles, shape + B_angles.shape[-1:])
+
+        # Both sets of edges are sorted by angle, so the stable sort merges two sorted runs in linear time.
+        edges = np.concatenate((A[..., 1:, :] - A[..., :-1, :], B[..., 1:, :] - B[..., :-1, :]), axis=-2)
+        order = np.argsort(np.concatenate((A_angles, B_angles), axis=-1), axis=-1, kind='stable')
+        edges = np.take_along_axis(edges, order[..., np.newaxis], axis=-2)
+
+        start = A[..., :1, :] + B[..., :1, :]
+        return np.concatenate((start, start + np.cumsum(edges[..., :-1, :], axis=-2)), axis=-2)
+
+    @staticmethod
+    def __convex_edges(P):
+        # Order the vertices of the convex polygons counterclockwise from the lowest (and then leftmost) vertex, with the
+        # first vertex repeated at the end, and compute the angle of each edge in [0, 2 pi).
+        P = np.asarray(P, dtype=float)
+        if np.all(P[..., 0, :] == P[..., -1, :]):
+            P = P[..., :-1, :]
+
+        x, y = P[..., 0], P[..., 1]
+        area = np.sum(x * np.roll(y, -1, axis=-1) - np.roll(x, -1, axis=-1) * y, axis=-1)
+        P = np.where((area < 0)[..., np.newaxis, np.newaxis], P[..., ::-1, :], P)
+
+        y = P[..., 1]
+        lowest = np.argmin(np.where(y == np.min(y, axis=-1, keepdims=True), P[..., 0], np.inf), axis=-1)
+        index = (lowest[..., np.newaxis] + np.arange(P.shape[-2] + 1)) % P.shape[-2]
+        P = np.take_along_axis(P, index[..., np.newaxis], axis=-2)
+
+        edges = P[..., 1:, :] - P[..., :-1, :]
+        angles = np.arctan2(edges[..., 1], edges[..., 0])
+
+        return P, np.where(angles < 0, angles + 2 * np.pi, angles)
+
+    @staticmethod
+    def Minkowski_sum_convex_polygons_area(w, x, a, b, theta1, theta2, degrees = True, dtype = np.float64,
+                                           sin_cos_table = None):
         """Compute the area of the Minkowski sum of two rectangles polygons.
         
         This is a fast method for computing the Minkowski sum of two polygons that are both rectangles.
+        All inputs can be arrays, which are broadcast against each other, so the area for many pairs of rectangles can
+        be computed in one call.
         
         For details on how this is done, see :cite:`f-lacour2021`.
         
         Parameters
         ----------
-        w : float
+        w : float or float array
             Width of rectangle 1.
-        x : float
+        x : float or float array
             Length of rectangle 1.
-        a : float
+        a : float or float array
             Width of rectangle 2.
-        b : float
+        b : float or float array
             Length of rectangle 2.
-        theta1 : float
-            [deg] Angle of rectangle 1.
-        theta2 : float
-            [deg] Angle of rectangle 2.
+        theta1 : float or float array
+            [deg] Angle of rectangle 1 (in radians if `degrees` is False). Not used if `sin_cos_table` is given.
+        theta2 : float or float array
+            [deg] Angle of rectangle 2 (in radians if `degrees` is False). Not used if `sin_cos_table` is given.
+        degrees : bool, optional
+            If True, the angles are in degrees, otherwise in radians (the default is True).
+        dtype : data-type, optional
+            The float type used for the computation, such as np.float32 for speed (the default is np.float64).
+        sin_cos_table : tuple of float arrays, optional
+            The absolute sine and cosine of the angle between the rectangles as computed by
+            :meth:`Minkowski_sum_sin_cos_table`. Use this when the area is computed repeatedly on the same angles
+            (the default is None).
                 
         Returns
         -------
-        area : float
+        area : float or float array
             Area of the Minkowski sum of the two rectangles.
         """
-        Ct = abs(math.cos(np.radians(theta1 - theta2)))
-        St = abs(math.sin(np.radians(theta1 - theta2)))
+        if sin_cos_table is None:
+            St, Ct = Obstacles.Minkowski_sum_sin_cos_table(theta1, theta2, degrees, dtype)
+        else:
+            St, Ct = (np.asarray(t, dtype=dtype) for t in sin_cos_table)
+
+        w, x, a, b = (np.asarray(v, dtype=dtype) for v in (w, x, a, b))
 
-        return w * x + a * b + w * abs(a * St + b * Ct) + x * abs(a * Ct + b * St)
+        return w * x + a * b + w * np.abs(a * St + b * Ct) + x * np.abs(a * Ct + b * St)
+
+    @staticmethod
+    def Minkowski_sum_sin_cos_table(theta1, theta2, degrees = True, dtype = np.float64):
+        """Compute the table of sines and cosines for :meth:`Minkowski_sum_convex_polygons_area`.
+
+        Parameters
+        ----------
+        theta1 : float or float array
+            [deg] Angle of rectangle 1 (in radians if `degrees` is False).
+        theta2 : float or float array
+            [deg] Angle of rectangle 2 (in radians if `degrees` is False).
+        degrees : bool, optional
+            If True, the angles are in degrees, otherwise in radians (the default is True).
+        dtype : data-type, optional
+            The float type of the table (the default is np.float64).
+
+        Returns
+        -------
+        St : float or float array
+            The absolute sine of the angle between the rectangles.
+        Ct : float or float array
+            The absolute cosine of the angle between the rectangles.
+        """
+        theta = np.asarray(theta1, dtype=dtype) - np.asarray(theta2, dtype=dtype)
+        if degrees:
+            theta = np.radians(theta)
+
+        return np.abs(np.sin(theta)), np.abs(np.cos(theta))
 
     @staticmethod
     def Minkowski_difference_convex_polygons(A, B):
         """Compute the polygon that is the Minkowski difference of two convex polygons A and B.
 
         Compute the Minkowski difference of two convex polygons. This methods is based on the Minkowski sum for
-        convex polygons, and it is
+        convex polygons as A + (-B), and it is
         therefore required that both input polygons are convex, otherwise the result is not correct.
 
-        The result is returned as a MultiPoint type.
-
         Parameters
         ----------
         A : Polygon
@@ -1085,17 +1909,51 @@ class Obstacles:
 
         Returns
         -------
-        C : MultiPoint
-            The result of the computation as a Multipoint (collection of points) and not a polygon.
+        C : Polygon
+            The Minkowski difference.
+        """
+        return Polygon(Obstacles.Minkowski_difference_convex_vertices(np.asarray(A.exterior.coords)[:, :2],
+                                                                      np.asarray(B.exterior.coords)[:, :2]))
+
+    @staticmethod
+    def Minkowski_difference_convex_vertices(A, B):
+        """Compute the vertices of the Minkowski difference of two convex polygons given by their vertices.
+
+        This is the Minkowski sum of A and B mirrored in the origin, see :meth:`Minkowski_sum_convex_vertices`.
+
+        Parameters
+        ----------
+        A : float array
+            [m] The vertices of the one polygon as an n x 2 array.
+        B : float array
+            [m] The vertices of the other polygon as an m x 2 array.
+
+        Returns
+        -------
+        C : float array
+            [m] The vertices of the Minkowski difference in counterclockwise order, starting at the lowest vertex.
         """
-        Av = MultiPoint(A.exterior.coords)
-        Bv = MultiPoint(B.exterior.coords)
-        Cv = []
-        for a in Av:
-            for b in Bv:
-                Cv.append(affinity.translate(a, -b.x, -b.y))
+        return Obstacles.Minkowski_sum_convex_vertices(A, -np.asarray(B, dtype=float))
+
+    @staticmethod
+    def Minkowski_difference_convex_vertices_batch(A, B):
+        """Compute the vertices of the Minkowski differences of stacks of convex polygons.
+
+        This is the Minkowski sum of A and B mirrored in the origin, see :meth:`Minkowski_sum_convex_vertices_batch`.
 
-        return MultiPoint(Cv).convex_hull
+        Parameters
+        ----------
+        A : float array
+            [m] The vertices of the one polygon in each pair as an N x n x 2 array.
+        B : float array
+            [m] The vertices of the other polygon in each pair as an N x m x 2 array.
+
+        Returns
+        -------
+        C : float array
+            [m] The vertices of the Minkowski differences as an N x (n + m) x 2 array.
+        """
+        return Obstacles.Minkowski_sum_convex_vertices_batch(A, -np.asarray(B, dtype=float))
 
     @staticmethod
     def mirror_polygon_in_origin(polygon):
@@ -1114,6 +1972,9 @@ class Obstacles:
         return Polygon([(-c[0], -c[1]) for c in polygon.exterior.coords])
 
     def test_Minkowski_sum_diff(self):
+        import matplotlib.pyplot as plt
+        from descartes.patch import PolygonPatch
+
         # Create to random convex polygons.
         p1 = [(0, 0), (3, 0), (3, 10), (0, 0)]
         A = affinity.translate(affinity.rotate(Polygon(p1), 35, 'center'), 4, 2)
@@ -1184,6 +2045,8 @@ class Obstacles:
         plt.show()
 
     def test_fast_Minkowski_sum(self):
+        import matplotlib.pyplot as plt
+
         # Testing Minkowski sum.
         x = 8
         w = 4